@@ -0,0 +1,166 @@
+"""
+Module: Instrumentation
+
+This module records the timings that tell where stutter during playback comes from. It is off until enable is called,
+every hook returns straight away while it is disabled.
+
+Metrics:
+    - gui_frame_ms: The interval between ticks of a heartbeat timer that should fire every INSTRUMENTATION_FRAME_MS.
+    - event_loop_stall_ms: How far past its due time a heartbeat tick ran, recorded for ticks later than the stall threshold.
+    - playhead_latency_ms: The delay between TimeUpdateThread emitting time_updated and the playhead being moved to that frame.
+    - <view>_repaint_ms: One sample per paint of an instrumented plot (layer_plot, song_plot), the interval since its last paint.
+
+Arguments:
+    None
+
+Returns:
+    - enable / disable: Start and stop recording.
+    - watch_repaints: Counts the paints of a widget under a metric name.
+    - mark_emit / mark_applied: Called around the time_updated signal to measure the playhead latency.
+    - stats: Returns the rolling statistics of every metric over the last INSTRUMENTATION_WINDOW_SECONDS.
+    - export_csv: Writes every recorded sample to a CSV file.
+
+Samples are kept as (time, value) pairs in bounded deques, the window statistics are computed from them on demand.
+A single instance, instrumentation, is shared by the hooks, the InstrumentationController and the dock.
+"""
+
+import csv
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+
+import constants
+
+INSTRUMENTATION_METRICS = ("gui_frame_ms", "event_loop_stall_ms", "playhead_latency_ms")
+
+
+class Instrumentation(QObject):
+    def __init__(self):
+        super().__init__()
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self.samples = {}  # Metric name -> deque of (seconds since start, value)
+        self.watched = {}  # Watched widget -> repaint metric name
+        self.last_paint = {}  # Repaint metric name -> perf_counter of its last paint
+        self.emit_times = {}  # Frame number -> perf_counter of its first time_updated emit, written from the clock thread
+        self.emit_lock = threading.Lock()  # emit_times is shared by the clock thread and the GUI thread
+        self.heartbeat = None  # Built on first enable, the module is imported before the QApplication exists
+        self.last_heartbeat = None
+        self.reset()
+
+    def reset(self):
+        self.start_time = time.perf_counter()
+        self.samples = {metric: deque(maxlen=constants.INSTRUMENTATION_HISTORY) for metric in INSTRUMENTATION_METRICS}
+        for metric in self.watched.values():
+            self.samples[metric] = deque(maxlen=constants.INSTRUMENTATION_HISTORY)
+        self.last_paint = {}
+        with self.emit_lock:
+            self.emit_times = {}
+
+    def enable(self):
+        if self.enabled:
+            return
+        if self.heartbeat is None:
+            self.heartbeat = QTimer(self)
+            self.heartbeat.setTimerType(Qt.PreciseTimer)
+            self.heartbeat.setInterval(constants.INSTRUMENTATION_FRAME_MS)
+            self.heartbeat.timeout.connect(self.on_heartbeat)
+        self.enabled = True
+        self.last_heartbeat = time.perf_counter()
+        self.heartbeat.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.heartbeat is not None:
+            self.heartbeat.stop()
+        with self.emit_lock:
+            self.emit_times = {}
+
+    def record(self, metric, value, now=None):
+        if now is None:
+            now = time.perf_counter()
+        self.samples[metric].append((now - self.start_time, value))
+
+    def on_heartbeat(self):
+        now = time.perf_counter()
+        interval_ms = (now - self.last_heartbeat) * 1000
+        self.last_heartbeat = now
+        self.record("gui_frame_ms", interval_ms, now)
+        late_ms = interval_ms - constants.INSTRUMENTATION_FRAME_MS
+        if late_ms > constants.INSTRUMENTATION_STALL_MS:
+            self.record("event_loop_stall_ms", late_ms, now)
+
+    def watch_repaints(self, widget, metric):
+        # Paints land on a graphics view's viewport, not on the view itself
+        target = widget.viewport() if hasattr(widget, "viewport") else widget
+        if target in self.watched:
+            return
+        self.watched[target] = metric
+        self.samples[metric] = deque(maxlen=constants.INSTRUMENTATION_HISTORY)
+        target.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if self.enabled and event.type() == QEvent.Paint and watched in self.watched:
+            metric = self.watched[watched]
+            now = time.perf_counter()
+            last_paint = self.last_paint.get(metric)
+            self.last_paint[metric] = now
+            self.record(metric, (now - last_paint) * 1000 if last_paint is not None else 0.0, now)
+        return False  # Never swallow the event
+
+    def mark_emit(self, frame_number):
+        # Called on the clock thread right before time_updated is emitted
+        # The clock emits the same frame on every tick until it moves on, the latency runs from the first of them
+        if self.enabled:
+            emit_time = time.perf_counter()
+            with self.emit_lock:
+                self.emit_times.setdefault(frame_number, emit_time)
+
+    def mark_applied(self, frame_number):
+        # Called on the GUI thread once the playhead has been moved to frame_number
+        if not self.enabled:
+            return
+        with self.emit_lock:
+            emit_time = self.emit_times.pop(frame_number, None)
+            if len(self.emit_times) > constants.PROJECT_FPS:
+                self.emit_times = {}  # Emits that were never applied, e.g. when the clock is reset, would pile up here
+        if emit_time is not None:
+            now = time.perf_counter()
+            self.record("playhead_latency_ms", (now - emit_time) * 1000, now)
+
+    def stats(self):
+        # metric -> {count, rate, mean, p95, max} over the last INSTRUMENTATION_WINDOW_SECONDS
+        window_start = time.perf_counter() - self.start_time - constants.INSTRUMENTATION_WINDOW_SECONDS
+        stats = {}
+        for metric, samples in self.samples.items():
+            values = []
+            for sample_time, value in reversed(samples):
+                if sample_time < window_start:
+                    break
+                values.append(value)
+            values = np.array(values)
+            stats[metric] = {
+                "count": len(values),
+                "rate": len(values) / constants.INSTRUMENTATION_WINDOW_SECONDS,
+                "mean": float(values.mean()) if len(values) else None,
+                "p95": float(np.percentile(values, 95)) if len(values) else None,
+                "max": float(values.max()) if len(values) else None,
+            }
+        return stats
+
+    def export_csv(self, path):
+        # One row per sample, sorted by time, for offline analysis
+        rows = sorted(
+            (sample_time, metric, value) for metric, samples in self.samples.items() for sample_time, value in samples
+        )
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["time_s", "metric", "value"])
+            writer.writerows((f"{sample_time:.6f}", metric, f"{value:.3f}") for sample_time, metric, value in rows)
+        return len(rows)
+
+
+instrumentation = Instrumentation()
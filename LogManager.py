@@ -0,0 +1,107 @@
+"""
+Module: LogManager
+
+This module is the central logging facility of the application. Every subsystem logs through its own category logger
+instead of printing, so each category can be turned up or silenced on its own.
+
+Categories:
+    - project: Saving and loading projects
+    - song: Song import, decoding and selection
+    - audio: The audio cache and header probing
+    - playback: The playback engine, clock and playhead
+    - stack: Stacks and layers
+    - event: Event edits and selection, called on every click, drag and nudge
+    - plot: Plot items being added to and removed from the widgets
+    - ui: Windows, menus and dialogs
+    - plugin: Plugin loading
+    - analysis: Filters, onset and BPM tools
+
+Arguments:
+    category (str): One of the categories above, passed to get_logger.
+
+Returns:
+    - get_logger: Returns the logging.Logger of a category.
+    - set_level: Sets the level of one category, or of every category when none is given.
+    - get_level: Returns the level name of one category, or of the root logger when none is given.
+
+Messages are formatted lazily, log.debug("[EventModel][add] | Adding event at frame '%s'", frame_number) only builds the
+string if the event category is enabled for debug, so a silenced call costs one level check. Levels come from
+constants.LOG_LEVEL and constants.LOG_CATEGORY_LEVELS and can be overridden at startup with the STAGEZERO_LOG
+environment variable, either a single level ("debug") or a comma separated list of category=level pairs
+("event=debug,audio=info").
+"""
+
+import logging
+import os
+import sys
+
+import constants
+
+LOG_ROOT = "stagezero"
+LOG_CATEGORIES = ("project", "song", "audio", "playback", "stack", "event", "plot", "ui", "plugin", "analysis")
+
+
+def get_logger(category):
+    if category not in LOG_CATEGORIES:
+        raise ValueError(f"Unknown log category '{category}', expected one of {LOG_CATEGORIES}")
+    return logging.getLogger(f"{LOG_ROOT}.{category}")
+
+
+def set_level(level, category=None):
+    if category is None:
+        logging.getLogger(LOG_ROOT).setLevel(level.upper())
+    else:
+        get_logger(category).setLevel(level.upper())
+
+
+def get_level(category=None):
+    logger = logging.getLogger(LOG_ROOT) if category is None else get_logger(category)
+    return logging.getLevelName(logger.level)
+
+
+def parse_log_setting(setting):
+    # "debug" -> {None: "DEBUG"}, "event=debug,audio=info" -> {"event": "DEBUG", "audio": "INFO"}
+    levels = {}
+    for part in setting.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            category, level = part.split("=", 1)
+            levels[category.strip()] = level.strip().upper()
+        else:
+            levels[None] = part.upper()
+    return levels
+
+
+def configure():
+    root = logging.getLogger(LOG_ROOT)
+    if root.handlers:
+        return  # Already configured
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    root.addHandler(handler)
+    root.propagate = False  # Keep the application's messages out of other libraries' log handlers
+    root.setLevel(constants.LOG_LEVEL)
+    for category, level in constants.LOG_CATEGORY_LEVELS.items():
+        set_level(level, category)
+
+    overrides = parse_log_setting(os.environ.get("STAGEZERO_LOG", ""))
+    if None in overrides:
+        level = overrides.pop(None)
+        try:
+            set_level(level)
+        except ValueError as e:
+            root.warning("[LogManager][configure] | Ignoring STAGEZERO_LOG level '%s': %s", level, e)
+        else:
+            # A single level applies to every category, including the ones that are silent by default
+            for category in LOG_CATEGORIES:
+                get_logger(category).setLevel(logging.NOTSET)
+    for category, level in overrides.items():
+        try:
+            set_level(level, category)
+        except ValueError as e:
+            root.warning("[LogManager][configure] | Ignoring STAGEZERO_LOG entry '%s=%s': %s", category, level, e)
+
+
+configure()
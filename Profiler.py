@@ -0,0 +1,122 @@
+"""
+Module: Profiler
+
+This module is the opt-in profiling mode of the application. The heavy controller entry points are decorated with
+profiled, and while profiling is on every call to one of them runs under cProfile and leaves two files behind in
+constants.PROFILE_DIRECTORY:
+    - <time>-<name>.prof: The raw profile, for snakeviz, pstats or gprof2dot.
+    - <time>-<name>.txt: The wall time, arguments and outcome of the call, followed by the top constants.PROFILE_TOP_FUNCTIONS
+      functions by cumulative and by own time, so a slow call reported by an operator can be read without any tooling.
+
+Arguments:
+    name (str): The name a profiled entry point is filed under, passed to profiled.
+
+Returns:
+    - profiled: A decorator that profiles every call of a function while profiling is on.
+    - profiler: The Profiler instance, set_enabled turns profiling on and off at runtime.
+
+Profiling is off unless the STAGEZERO_PROFILE environment variable is set to anything but "", "0", "false" or "off",
+or it is turned on from View > Profiling. While it is off a decorated call costs one attribute check. A profiled entry
+point that calls another one, such as load_project refreshing the layers, is profiled once as part of the outer call.
+
+The wrapper takes *args, so Qt hands it every argument of a signal, such as clicked's checked flag. Signals are
+connected to a decorated method through a lambda that calls it without them.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+
+import constants
+from LogManager import get_logger
+
+log = get_logger("project")
+
+PROFILE_ENV = "STAGEZERO_PROFILE"
+PROFILE_DISABLED_VALUES = ("", "0", "false", "off", "no")
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = os.environ.get(PROFILE_ENV, "").strip().lower() not in PROFILE_DISABLED_VALUES
+        self.directory = constants.PROFILE_DIRECTORY
+        self.local = threading.local()  # cProfile only sees the thread it runs on, so nesting is tracked per thread
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        log.info("[Profiler][set_enabled] | Profiling %s, profiles are written to '%s'", "on" if enabled else "off", self.directory)
+
+    def run(self, name, function, *args, **kwargs):
+        if not self.enabled or getattr(self.local, "active", False):
+            return function(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:  # Another profiler or a debugger already owns the profiling hook
+            log.warning("[Profiler][run] | Could not profile '%s': %s", name, e)
+            return function(*args, **kwargs)
+        self.local.active = True
+        outcome = "returned"
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except BaseException as e:
+            outcome = f"raised {e.__class__.__name__}: {e}"
+            raise
+        finally:
+            wall_seconds = time.perf_counter() - start
+            profile.disable()
+            self.local.active = False
+            self.write(name, profile, wall_seconds, args, kwargs, outcome)
+
+    def write(self, name, profile, wall_seconds, args, kwargs, outcome):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base_path = os.path.join(self.directory, f"{stamp}-{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}")
+        profile.dump_stats(f"{base_path}.prof")
+        with open(f"{base_path}.txt", "w") as file:
+            file.write(summarize(name, profile, wall_seconds, args, kwargs, outcome))
+        log.info("[Profiler][write] | %s took %.3f s, profile written to %s.prof", name, wall_seconds, base_path)
+        return f"{base_path}.prof", f"{base_path}.txt"
+
+
+def summarize(name, profile, wall_seconds, args, kwargs, outcome):
+    stream = io.StringIO()
+    stream.write(f"{name}\n")
+    stream.write(f"started: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time() - wall_seconds))}\n")
+    stream.write(f"wall time: {wall_seconds:.3f} s\n")
+    stream.write(f"thread: {threading.current_thread().name}\n")
+    stream.write(f"arguments: {short_repr(args[1:] if args else args)} {short_repr(kwargs) if kwargs else ''}\n")  # Skip self
+    stream.write(f"outcome: {outcome}\n")
+    stats = pstats.Stats(profile, stream=stream).strip_dirs()
+    for sort_key, title in (("cumulative", "cumulative time"), ("tottime", "own time")):
+        stream.write(f"\nTop {constants.PROFILE_TOP_FUNCTIONS} functions by {title}\n")
+        stats.sort_stats(sort_key).print_stats(constants.PROFILE_TOP_FUNCTIONS)
+    return stream.getvalue()
+
+
+def short_repr(value, length=200):
+    text = repr(value)
+    return text if len(text) <= length else text[: length - 3] + "..."
+
+
+profiler = Profiler()
+
+
+def profiled(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            return profiler.run(name, function, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
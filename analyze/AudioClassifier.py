@@ -1,8 +1,11 @@
 import random
+from LogManager import get_logger
+
+log = get_logger("analysis")
 
 class Kicks:
     def detect(song_path):
-        print(f"Loading {song_path} into kick detector")
+        log.info("Loading %s into kick detector", song_path)
 
         # Just returns random array until further implemented
         num_events = random.randint(1, 50)  # Generate a random number of events
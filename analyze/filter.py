@@ -1,4 +1,7 @@
 from scipy.signal import butter, cheby1, cheby2, ellip, bessel, lfilter
+from LogManager import get_logger
+
+log = get_logger("analysis")
 
 
 def apply_filter(filter_type, cutoff, song_data, sample_rate):
@@ -13,12 +16,12 @@ def apply_filter(filter_type, cutoff, song_data, sample_rate):
             raise ValueError("Cutoff frequencies must be between 0 and half the sample rate")
     else:
         normalized_cutoff = cutoff / (0.5 * sample_rate)
-        print(f"normalized cutoff is {normalized_cutoff} the cutoff is {cutoff}, the sample rate is {sample_rate}")
+        log.debug("normalized cutoff is %s the cutoff is %s, the sample rate is %s", normalized_cutoff, cutoff, sample_rate)
         if not 0 < normalized_cutoff < 1:
             raise ValueError("Cutoff frequency must be between 0 and half the sample rate")
 
 
-    print(f"filter type {filter_type} cutoff {cutoff} sample rate {sample_rate}")
+    log.debug("filter type %s cutoff %s sample rate %s", filter_type, cutoff, sample_rate)
     N = 5  # Filter order can be changed based on requirements
 
     # Determine the filter type and set the special_parameter
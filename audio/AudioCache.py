@@ -0,0 +1,272 @@
+"""
+Module: AudioCache
+
+This module defines the AudioCache class, an on-disk cache of decoded audio. Decoding an mp3 with librosa is the slowest
+part of adding a song or opening a project, so the decoded PCM is written to the cache directory once and read back on
+every following load.
+
+Entries are handed back as read-only np.memmap arrays rather than being read into RAM, so a project with many songs only
+keeps the pages the waveform, filters or analysis actually touch resident. Derived arrays such as filtered song data are
+stored the same way through store_array. Streamed decodes are appended block by block to a raw float32 file through
+open_stream/close_stream and are read back the same way as every other entry.
+
+Cache entries are content addressed. The key is a hash of the source file's bytes plus the decode settings (sample rate,
+mono/stereo and resampler), so moving or renaming a song keeps its entry while re-exporting the file invalidates it.
+
+Songs also get a peaks sidecar, a compact npz of their PeakPyramid levels stored as float16. It records the size and
+modification time of the source file and is ignored once those change, so a project can draw its waveform overview from
+the sidecar on open without decoding, or even hashing, the audio. The playback wav copy is filed under a key derived
+from the song's cache key for the same reason, a song that knows its cache key finds it without reading the source file.
+
+A file is only ever decoded once, at its native sample rate. Any other sample rate is resampled from that native entry
+and cached in turn, so asking for the analysis and the playback rate of a song costs one decode and two resamples, once.
+
+Arguments:
+    directory (str): The folder the cache entries are written to.
+
+Returns:
+    load: Returns a (song_data, sample_rate) tuple, the same as librosa.load.
+    key: Returns the cache key for a source file and a set of decode settings.
+    wav_path: Returns the path of a wav copy of a cached array, for handing to the playback engine.
+    playback_path: Returns the path of a wav copy of a song at the playback sample rate, found through the song's cache key.
+    store_array: Returns a read-only memmap of an array after writing it to the cache, dropping any wav copy of the array it replaces.
+    read_peaks: Returns the PeakPyramid saved for a cache key, or None if there is none or its source file has changed.
+
+A module level instance, audio_cache, is shared by the song model and the analysis tools. decode_to_cache is a plain
+function so it can be handed to a process pool; worker processes fill the cache and the GUI process then reads the
+entries back as cache hits.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+import constants
+from .PeakPyramid import PeakPyramid
+from LogManager import get_logger
+
+log = get_logger("audio")
+
+
+class AudioCache:
+    CHUNK_SIZE = 1024 * 1024  # Bytes read at a time while hashing a source file
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.file_hashes = {}  # (path, size, mtime) -> content hash, so a file is only hashed once per session
+
+    def set_directory(self, directory):
+        self.directory = directory
+
+    def staging_path(self, path):
+        # A temporary file of its own for every write, decode workers, the prefetch thread and the GUI can all be
+        # writing the same entry at once and must never share or truncate each other's temporary file
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+        os.close(handle)
+        return temp_path
+
+    @contextmanager
+    def staged_file(self, path, mode="wb"):
+        # Yields a file to write, path is replaced by it in one step once it has been written completely
+        temp_path = self.staging_path(path)
+        try:
+            with open(temp_path, mode) as file:
+                yield file
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def hash_file(self, path):
+        stat = os.stat(path)
+        signature = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if signature not in self.file_hashes:
+            digest = hashlib.sha1()
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(self.CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            self.file_hashes[signature] = digest.hexdigest()
+        return self.file_hashes[signature]
+
+    def key(self, path, sample_rate=constants.AUDIO_SAMPLE_RATE, mono=True, res_type=constants.RESAMPLE_TYPE):
+        settings = f"sample_rate={sample_rate}|mono={mono}"
+        if sample_rate is not None:  # The native decode doesn't depend on the resampler
+            settings += f"|res_type={res_type}"
+        return hashlib.sha1(f"{self.hash_file(path)}|{settings}".encode()).hexdigest()
+
+    def entry_paths(self, key):
+        data_path = os.path.join(self.directory, f"{key}.npy")
+        info_path = os.path.join(self.directory, f"{key}.json")
+        return data_path, info_path
+
+    def raw_path(self, key):
+        return os.path.join(self.directory, f"{key}.raw")
+
+    def load(self, path, sample_rate=constants.AUDIO_SAMPLE_RATE, mono=True, res_type=constants.RESAMPLE_TYPE):
+        key = self.key(path, sample_rate, mono, res_type)
+        cached = self.read(key)
+        if cached is not None:
+            log.debug("[AudioCache][load] | Cache hit for '%s' at %s Hz", path, sample_rate)
+            return cached
+
+        if sample_rate is None:
+            log.info("[AudioCache][load] | Cache miss for '%s', decoding", path)
+            song_data, decoded_sample_rate = librosa.load(path, sr=None, mono=mono)
+            self.write(key, song_data, decoded_sample_rate, path)
+            return self.read(key)  # Hand back the memmap so the decoded copy can be freed
+
+        native_data, native_sample_rate = self.load(path, None, mono)
+        if native_sample_rate == sample_rate:
+            return native_data, native_sample_rate
+        log.info("[AudioCache][load] | Cache miss for '%s' at %s Hz, resampling with %s", path, sample_rate, res_type)
+        song_data = librosa.resample(
+            np.asarray(native_data), orig_sr=native_sample_rate, target_sr=sample_rate, res_type=res_type
+        )
+        self.write(key, song_data, sample_rate, path)
+        return self.read(key)
+
+    def read(self, key):
+        data_path, info_path = self.entry_paths(key)
+        if not (os.path.exists(info_path) and (os.path.exists(data_path) or os.path.exists(self.raw_path(key)))):
+            return None
+        try:
+            with open(info_path, "r") as file:
+                info = json.load(file)
+            if info.get("format") == "raw":
+                song_data = np.memmap(self.raw_path(key), dtype=np.float32, mode="r", shape=(info["sample_qty"],))
+            else:
+                song_data = np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            log.warning("[AudioCache][read] | Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+        return song_data, info["sample_rate"]
+
+    def write(self, key, song_data, sample_rate, source_path):
+        data_path, info_path = self.entry_paths(key)
+        info = {
+            "source_path": source_path,
+            "sample_rate": sample_rate,
+            "sample_qty": len(song_data),
+        }
+        # Write to a temporary file first so a crash never leaves a half written entry behind
+        with self.staged_file(data_path) as file:
+            np.save(file, song_data)
+        with self.staged_file(info_path, "w") as file:
+            json.dump(info, file)
+
+    def open_stream(self, key):
+        # Returns a file that decoded blocks are appended to, the entry only becomes visible once close_stream is called
+        return open(self.staging_path(self.raw_path(key)), "wb")
+
+    def close_stream(self, key, file, sample_rate, sample_qty, source_path):
+        file.close()
+        os.replace(file.name, self.raw_path(key))
+        _, info_path = self.entry_paths(key)
+        info = {
+            "source_path": source_path,
+            "sample_rate": sample_rate,
+            "sample_qty": sample_qty,
+            "format": "raw",
+        }
+        with self.staged_file(info_path, "w") as file:
+            json.dump(info, file)
+
+    def wav_path(self, key, data, sample_rate):
+        # The playback engine plays files, so cached arrays get a wav copy next to them that is written only once
+        wav_path = self.wav_copy_path(key)
+        if not os.path.exists(wav_path):
+            self.write_wav(wav_path, data, sample_rate)
+        return wav_path
+
+    def wav_copy_path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def write_wav(self, wav_path, data, sample_rate):
+        with self.staged_file(wav_path) as file:
+            sf.write(file, data, sample_rate, format="WAV")
+
+    def playback_key(self, cache_key, sample_rate, res_type=constants.RESAMPLE_TYPE):
+        return self.derived_key(cache_key, f"playback|sample_rate={sample_rate}|res_type={res_type}")
+
+    def playback_path(self, path, cache_key, sample_rate, res_type=constants.RESAMPLE_TYPE):
+        # cache_key is the song's analysis entry, an existing wav copy is returned without hashing or decoding path
+        wav_key = self.playback_key(cache_key, sample_rate, res_type)
+        wav_path = self.wav_copy_path(wav_key)
+        if os.path.exists(wav_path):
+            return wav_path
+        song_data, decoded_sample_rate = self.load(path, sample_rate, res_type=res_type)
+        return self.wav_path(wav_key, song_data, decoded_sample_rate)
+
+    def peaks_path(self, key):
+        return os.path.join(self.directory, f"{key}.peaks.npz")
+
+    def write_peaks(self, key, peak_pyramid, source_path):
+        stat = os.stat(source_path)
+        arrays = {
+            "info": np.array([peak_pyramid.sample_rate, peak_pyramid.sample_qty, stat.st_size, stat.st_mtime_ns], dtype=np.int64),
+            "bucket_sizes": np.array([level[0] for level in peak_pyramid.levels], dtype=np.int64),
+        }
+        for level_index, (_, mins, maxs) in enumerate(peak_pyramid.levels):
+            arrays[f"mins_{level_index}"] = mins.astype(np.float16)  # Half precision is plenty for drawing
+            arrays[f"maxs_{level_index}"] = maxs.astype(np.float16)
+        peaks_path = self.peaks_path(key)
+        with self.staged_file(peaks_path) as file:
+            np.savez(file, **arrays)
+
+    def read_peaks(self, key, source_path):
+        peaks_path = self.peaks_path(key)
+        if not os.path.exists(peaks_path):
+            return None
+        try:
+            stat = os.stat(source_path)
+            with np.load(peaks_path) as peaks:
+                sample_rate, sample_qty, source_size, source_mtime_ns = peaks["info"].tolist()
+                if (source_size, source_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                    log.info("[AudioCache][read_peaks] | '%s' has changed since its peaks were saved", source_path)
+                    return None
+                levels = [
+                    (bucket_size, peaks[f"mins_{level_index}"].astype(np.float32), peaks[f"maxs_{level_index}"].astype(np.float32))
+                    for level_index, bucket_size in enumerate(peaks["bucket_sizes"].tolist())
+                ]
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("[AudioCache][read_peaks] | Ignoring unreadable peaks for %s: %s", key, e)
+            return None
+        return PeakPyramid(sample_rate, sample_qty, levels)
+
+    def derived_key(self, key, name):
+        return hashlib.sha1(f"{key}|{name}".encode()).hexdigest()
+
+    def store_array(self, key, data):
+        data_path, _ = self.entry_paths(key)
+        with self.staged_file(data_path) as file:
+            np.save(file, np.asarray(data))
+        self.remove_wav_copy(key)  # A wav copy of the data this replaced would otherwise keep being played
+        return np.load(data_path, mmap_mode="r")
+
+    def remove_wav_copy(self, key):
+        try:
+            os.remove(self.wav_copy_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.warning("[AudioCache][remove_wav_copy] | Could not remove the stale wav copy of %s: %s", key, e)
+
+
+audio_cache = AudioCache(constants.AUDIO_CACHE_DIRECTORY)
+
+
+def decode_to_cache(path, directory, ingest_policy):
+    # Runs in a worker process, only the path goes back to the caller, the decoded data stays in the cache
+    cache = AudioCache(directory)
+    cache.load(path, ingest_policy.analysis_sample_rate, res_type=ingest_policy.resample_type)
+    cache_key = cache.key(path, ingest_policy.analysis_sample_rate, res_type=ingest_policy.resample_type)
+    cache.playback_path(path, cache_key, ingest_policy.playback_sample_rate, ingest_policy.resample_type)
+    return path
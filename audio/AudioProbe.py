@@ -0,0 +1,85 @@
+"""
+Module: AudioProbe
+
+This module reads a song's duration, channel count and native sample rate from the file header, without decoding the
+audio. It lets the song list, the stack frame range and project summaries be filled in as soon as a file is added rather
+than after a full decode.
+
+Arguments:
+    path (str): The path of the audio file to probe.
+    decode_fallback (bool): Whether to decode the file when its header can't be trusted, otherwise None is returned.
+
+Returns:
+    probe_audio: Returns an AudioInfo holding the duration, channels and native sample rate of the file.
+
+Headers are read with soundfile first and audioread (ffmpeg/gstreamer/coreaudio) second. If neither can read the file,
+or the header reports something implausible such as a zero length, the file is decoded once to measure it. The decode
+is cached at the native sample rate, so the later analysis load resamples from it instead of decoding again.
+"""
+
+import math
+
+import audioread
+import soundfile as sf
+
+import constants
+from .AudioCache import audio_cache
+from LogManager import get_logger
+
+log = get_logger("audio")
+
+
+class AudioInfo:
+    def __init__(self, duration_sec, channels, sample_rate, source):
+        self.duration_sec = duration_sec
+        self.channels = channels
+        self.sample_rate = sample_rate  # Native sample rate of the file
+        self.source = source  # "header" or "decode", where the values were read from
+
+    @property
+    def length_ms(self):
+        return self.duration_sec * 1000
+
+    @property
+    def frame_qty(self):
+        return round(self.duration_sec * constants.PROJECT_FPS)
+
+    def is_plausible(self):
+        return (
+            self.duration_sec is not None
+            and math.isfinite(self.duration_sec)
+            and self.duration_sec > 0
+            and bool(self.sample_rate)
+            and bool(self.channels)
+        )
+
+
+def probe_audio(path, decode_fallback=True):
+    for read_header in (read_soundfile_header, read_audioread_header):
+        try:
+            info = read_header(path)
+        except Exception as e:
+            log.debug("[AudioProbe][probe_audio] | %s could not read '%s': %s", read_header.__name__, path, e)
+            continue
+        if info.is_plausible():
+            return info
+        log.warning("[AudioProbe][probe_audio] | Implausible header in '%s' from %s", path, read_header.__name__)
+    if not decode_fallback:
+        return None
+    return measure_by_decoding(path)
+
+
+def read_soundfile_header(path):
+    info = sf.info(path)
+    return AudioInfo(info.duration, info.channels, info.samplerate, "header")
+
+
+def read_audioread_header(path):
+    with audioread.audio_open(path) as file:
+        return AudioInfo(file.duration, file.channels, file.samplerate, "header")
+
+
+def measure_by_decoding(path):
+    log.info("[AudioProbe][measure_by_decoding] | Decoding '%s' to measure its length", path)
+    song_data, sample_rate = audio_cache.load(path, None)  # Same entry the analysis load resamples from
+    return AudioInfo(len(song_data) / sample_rate, None, sample_rate, "decode")  # Channels are lost in the mono mixdown
@@ -0,0 +1,138 @@
+"""
+Module: AudioStream
+
+This module decodes long recordings block by block instead of loading the whole file into one array. The AudioStream
+class reads a file in fixed size blocks with librosa.stream and passes every block to a list of consumers, each of which
+keeps only a compact result. Peak memory is bounded by the block size plus those results.
+
+Arguments:
+    path (str): The path of the audio file to stream.
+    block_frames (int): The number of project frames decoded per block.
+
+Returns:
+    run: Returns the native sample rate of the file after every block has been handed to the consumers.
+
+Consumers implement consume(block, sample_rate) and finish(). The consumers defined here are:
+    - DurationConsumer: Counts samples to work out length_ms and frame_qty.
+    - WaveformSummaryConsumer: Keeps a min/max pair per bucket of samples for drawing the song overview.
+    - OnsetFeatureConsumer: Builds the onset strength envelope at one value per project frame.
+    - CacheWriterConsumer: Appends the decoded samples to the audio cache so the song can be memmapped afterwards.
+
+Blocks are aligned to whole project frames, so per frame results line up across block boundaries.
+"""
+
+import librosa
+import numpy as np
+
+import constants
+from .AudioCache import audio_cache
+
+
+class AudioStream:
+    def __init__(self, path, block_frames=constants.STREAM_BLOCK_FRAMES):
+        self.path = path
+        self.block_frames = block_frames
+        self.sample_rate = librosa.get_samplerate(path)
+        self.hop_length = int(self.sample_rate / constants.PROJECT_FPS)  # Samples per project frame
+
+    def run(self, consumers, on_block=None):
+        blocks = librosa.stream(
+            self.path,
+            block_length=self.block_frames,
+            frame_length=self.hop_length,
+            hop_length=self.hop_length,
+            mono=True,
+        )
+        for block in blocks:
+            for consumer in consumers:
+                consumer.consume(block, self.sample_rate)
+            if on_block is not None:
+                on_block()
+        for consumer in consumers:
+            consumer.finish()
+        return self.sample_rate
+
+
+class DurationConsumer:
+    def __init__(self):
+        self.sample_qty = 0
+        self.sample_rate = None
+        self.length_ms = None
+        self.frame_qty = None
+
+    def consume(self, block, sample_rate):
+        self.sample_rate = sample_rate
+        self.sample_qty += len(block)
+
+    def finish(self):
+        self.length_ms = self.sample_qty / self.sample_rate * 1000
+        self.frame_qty = round(self.length_ms / 1000 * constants.PROJECT_FPS)
+
+
+class WaveformSummaryConsumer:
+    def __init__(self, buckets_per_frame=constants.WAVEFORM_SUMMARY_BUCKETS_PER_FRAME):
+        self.buckets_per_frame = buckets_per_frame
+        self.bucket_size = None
+        self.samples_per_frame = None
+        self.mins = []
+        self.maxs = []
+        self.remainder = np.zeros(0, dtype=np.float32)  # Samples left over that don't fill a whole bucket yet
+
+    def consume(self, block, sample_rate):
+        if self.bucket_size is None:
+            self.samples_per_frame = sample_rate / constants.PROJECT_FPS
+            self.bucket_size = max(1, int(self.samples_per_frame) // self.buckets_per_frame)
+        samples = np.concatenate((self.remainder, block))
+        bucket_qty = len(samples) // self.bucket_size
+        buckets = samples[: bucket_qty * self.bucket_size].reshape(bucket_qty, self.bucket_size)
+        self.mins.append(buckets.min(axis=1))
+        self.maxs.append(buckets.max(axis=1))
+        self.remainder = samples[bucket_qty * self.bucket_size :]
+
+    def finish(self):
+        if len(self.remainder):
+            self.mins.append(np.array([self.remainder.min()]))
+            self.maxs.append(np.array([self.remainder.max()]))
+            self.remainder = np.zeros(0, dtype=np.float32)
+
+    def summary(self):
+        # Returns the x position of each bucket in frames along with its min and max sample value
+        if not self.mins:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        mins = np.concatenate(self.mins)
+        maxs = np.concatenate(self.maxs)
+        x_frames = np.arange(len(mins)) * self.bucket_size / self.samples_per_frame
+        return x_frames, mins, maxs
+
+
+class OnsetFeatureConsumer:
+    def __init__(self):
+        self.envelopes = []
+        self.onset_envelope = None
+
+    def consume(self, block, sample_rate):
+        hop_length = int(sample_rate / constants.PROJECT_FPS)
+        frame_qty = int(np.ceil(len(block) / hop_length))
+        envelope = librosa.onset.onset_strength(y=block, sr=sample_rate, hop_length=hop_length)
+        self.envelopes.append(envelope[:frame_qty])
+
+    def finish(self):
+        self.onset_envelope = np.concatenate(self.envelopes) if self.envelopes else np.zeros(0)
+        self.envelopes = []
+
+
+class CacheWriterConsumer:
+    def __init__(self, path):
+        self.path = path
+        self.key = audio_cache.key(path, sample_rate=None)  # Streams are stored at the file's native sample rate
+        self.file = audio_cache.open_stream(self.key)
+        self.sample_qty = 0
+        self.sample_rate = None
+
+    def consume(self, block, sample_rate):
+        self.sample_rate = sample_rate
+        self.file.write(np.ascontiguousarray(block, dtype=np.float32).tobytes())
+        self.sample_qty += len(block)
+
+    def finish(self):
+        audio_cache.close_stream(self.key, self.file, self.sample_rate, self.sample_qty, self.path)
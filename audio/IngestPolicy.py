@@ -0,0 +1,50 @@
+"""
+Module: IngestPolicy
+
+This module defines the IngestPolicy class, the project level settings for how songs are brought into the project.
+It holds separate target sample rates for analysis (waveforms, filters, BPM and onset tools) and for playback, plus
+the resampler used to get from a file's native rate to those targets.
+
+Arguments:
+    analysis_sample_rate (int): The sample rate song_data is resampled to for analysis.
+    playback_sample_rate (int): The sample rate of the audio handed to the playback engine.
+    resample_type (str): One of constants.RESAMPLE_TYPES, trading resampling speed against quality.
+
+Returns:
+    to_dict: Returns the policy as a dictionary for saving with the project.
+
+Every song is resampled once per target rate and the result is stored in the audio cache, so changing nothing costs
+nothing on later opens, filters or BPM runs.
+"""
+
+import constants
+
+
+class IngestPolicy:
+    def __init__(
+        self,
+        analysis_sample_rate=constants.AUDIO_SAMPLE_RATE,
+        playback_sample_rate=constants.PLAYBACK_SAMPLE_RATE,
+        resample_type=constants.RESAMPLE_TYPE,
+    ):
+        self.analysis_sample_rate = analysis_sample_rate
+        self.playback_sample_rate = playback_sample_rate
+        self.resample_type = None
+        self.set_resample_type(resample_type)
+
+    def set_resample_type(self, resample_type):
+        if resample_type not in constants.RESAMPLE_TYPES:
+            raise ValueError(f"Resample type must be one of {constants.RESAMPLE_TYPES}, not '{resample_type}'")
+        self.resample_type = resample_type
+
+    def to_dict(self):
+        return {
+            "analysis_sample_rate": self.analysis_sample_rate,
+            "playback_sample_rate": self.playback_sample_rate,
+            "resample_type": self.resample_type,
+        }
+
+    def deserialize(self, data):
+        self.analysis_sample_rate = data.get("analysis_sample_rate", constants.AUDIO_SAMPLE_RATE)
+        self.playback_sample_rate = data.get("playback_sample_rate", constants.PLAYBACK_SAMPLE_RATE)
+        self.set_resample_type(data.get("resample_type", constants.RESAMPLE_TYPE))
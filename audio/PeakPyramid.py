@@ -0,0 +1,89 @@
+"""
+Module: PeakPyramid
+
+This module defines the PeakPyramid class, a precomputed multi-resolution min/max summary of a song's samples. Level 0
+keeps one min/max pair per PEAK_BASE_BUCKET_SIZE samples and every level above merges PEAK_LEVEL_FACTOR buckets of the
+level below, until a level fits in a single bucket.
+
+Arguments:
+    sample_rate (int): The sample rate of the samples the pyramid summarises.
+    sample_qty (int): The number of samples summarised.
+    levels (list): A list of (bucket_size, mins, maxs) tuples, finest level first.
+
+Returns:
+    from_samples: Returns a pyramid built from an array of samples, read in chunks so a memmap is never fully paged in.
+    from_peaks: Returns a pyramid built on top of an existing min/max summary, such as the one a stream produces.
+    level_for: Returns the index of the level that matches a frame span drawn across a pixel width.
+    select: Returns (x_frames, mins, maxs) of one level over a frame range.
+
+Because the pyramid keeps peaks rather than interpolating, a transient shorter than a bucket still shows up at every
+zoom level, and a waveform never draws more than a couple of points per pixel however long the song is.
+"""
+
+import numpy as np
+
+import constants
+
+
+class PeakPyramid:
+    CHUNK_BUCKETS = 65536  # Level 0 buckets computed per chunk when reading samples
+
+    def __init__(self, sample_rate, sample_qty, levels):
+        self.sample_rate = sample_rate
+        self.sample_qty = sample_qty
+        self.levels = levels
+        self.samples_per_frame = sample_rate / constants.PROJECT_FPS
+
+    @classmethod
+    def from_samples(cls, song_data, sample_rate, bucket_size=constants.PEAK_BASE_BUCKET_SIZE):
+        mins = []
+        maxs = []
+        chunk_size = bucket_size * cls.CHUNK_BUCKETS
+        for start in range(0, len(song_data), chunk_size):
+            chunk = np.asarray(song_data[start : start + chunk_size], dtype=np.float32)
+            chunk_mins, chunk_maxs = reduce_peaks(chunk, chunk, bucket_size)
+            mins.append(chunk_mins)
+            maxs.append(chunk_maxs)
+        mins = np.concatenate(mins) if mins else np.zeros(0, dtype=np.float32)
+        maxs = np.concatenate(maxs) if maxs else np.zeros(0, dtype=np.float32)
+        return cls.from_peaks(mins, maxs, bucket_size, sample_rate, len(song_data))
+
+    @classmethod
+    def from_peaks(cls, mins, maxs, bucket_size, sample_rate, sample_qty, factor=constants.PEAK_LEVEL_FACTOR):
+        levels = [(bucket_size, np.asarray(mins, dtype=np.float32), np.asarray(maxs, dtype=np.float32))]
+        while len(levels[-1][1]) > 1:
+            level_bucket_size, level_mins, level_maxs = levels[-1]
+            levels.append((level_bucket_size * factor, *reduce_peaks(level_mins, level_maxs, factor)))
+        return cls(sample_rate, sample_qty, levels)
+
+    @property
+    def last_frame(self):
+        return max(self.sample_qty - 1, 0) / self.samples_per_frame
+
+    def level_for(self, frame_span, pixel_width):
+        # The coarsest level that still has PEAK_BUCKETS_PER_PIXEL buckets for every pixel of the visible span
+        wanted_bucket_qty = max(pixel_width, 1) * constants.PEAK_BUCKETS_PER_PIXEL
+        for level_index in range(len(self.levels) - 1, -1, -1):
+            bucket_size = self.levels[level_index][0]
+            if frame_span * self.samples_per_frame / bucket_size >= wanted_bucket_qty:
+                return level_index
+        return 0
+
+    def select(self, start_frame, end_frame, level_index):
+        bucket_size, mins, maxs = self.levels[level_index]
+        first = max(int(start_frame * self.samples_per_frame // bucket_size), 0)
+        last = min(int(np.ceil(end_frame * self.samples_per_frame / bucket_size)) + 1, len(mins))
+        first = min(first, last)
+        x_frames = np.arange(first, last) * bucket_size / self.samples_per_frame
+        return x_frames, mins[first:last], maxs[first:last]
+
+
+def reduce_peaks(mins, maxs, factor):
+    # Merges every factor buckets into one, a short last bucket is kept rather than dropped
+    full_qty = len(mins) // factor
+    reduced_mins = mins[: full_qty * factor].reshape(full_qty, factor).min(axis=1)
+    reduced_maxs = maxs[: full_qty * factor].reshape(full_qty, factor).max(axis=1)
+    if len(mins) % factor:
+        reduced_mins = np.append(reduced_mins, mins[full_qty * factor :].min())
+        reduced_maxs = np.append(reduced_maxs, maxs[full_qty * factor :].max())
+    return reduced_mins.astype(np.float32), reduced_maxs.astype(np.float32)
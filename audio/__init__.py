@@ -0,0 +1,4 @@
+from .AudioCache import *
+from .IngestPolicy import *
+from .AudioProbe import *
+from .PeakPyramid import *
@@ -0,0 +1,327 @@
+"""
+Module: BenchmarkRunner
+
+This module times the core paths of the application on synthetic projects and writes the timings to a JSON file, so
+the results of two commits can be compared.
+
+Benchmarks:
+    - event_model_add / event_model_delete / event_model_nudge_event: Single event edits on a layer of event_qty events.
+    - layer_model_move_event / layer_model_change_event_layer: Single event moves within a stack and between layers.
+    - main_model_save / main_model_load: Pickling a whole project of event_qty events and reading it back.
+    - waveform_update_visible_peaks: A sweep of zooms and pans over a song's waveform.
+    - analyze_filter_apply_filter: A low-pass filter over a whole song.
+    - tools_detect_onsets: Onset detection over a whole song.
+
+Arguments:
+    event_qtys (list): The project sizes to run the event, layer and project benchmarks at.
+    song_qty, song_seconds, layer_qty, audio_kind, seed: Passed on to generate_project.
+    repeat (int): How many times every benchmark is timed, the median is the headline number.
+    op_qty (int): How many single event edits are timed per repeat.
+
+Returns:
+    - run_benchmarks: Returns the results dict that is written to JSON.
+    - write_results: Returns the path the results were written to.
+    - compare_results: Returns the benchmarks whose median changed by more than a threshold against a baseline file.
+
+Setup work, building a fresh layer or project for every repeat, is done outside the timed section. The waveform
+benchmark times update_visible_peaks, which took over from adjust_resolution when the waveform moved to a peak pyramid.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+import constants
+import LogManager
+from analyze.filter import apply_filter
+from audio import audio_cache
+from model import EventModel, LayerModel, MainModel
+from PopupManager import PopupManager
+from tools import detect_onsets
+from view.WaveformPlotItem import WaveformPlotItem
+from .SyntheticProject import generate_event_frames, generate_project
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_EVENT_QTYS = (1000, 10000, 100000, 1000000)
+WAVEFORM_ZOOM_DIVISIONS = (1, 4, 16, 64, 256)  # Visible span as a fraction of the song
+WAVEFORM_PAN_STEPS = 20  # Pans per zoom level
+WAVEFORM_PIXEL_WIDTH = 1600
+
+
+def time_calls(function, repeat, setup=None):
+    # Returns the seconds each of repeat calls took, setup runs before every call and is not timed
+    timings = []
+    for _ in range(repeat):
+        arguments = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(name, params, timings, op_qty=1):
+    median = statistics.median(timings)
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(timings),
+        "op_qty": op_qty,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.mean(timings),
+        "max_s": max(timings),
+        "per_op_us": median / op_qty * 1e6,
+    }
+
+
+def free_frames(frames, qty, rng):
+    # qty frames that hold no event and whose next frame holds none either, so a nudge by one never collides
+    taken = np.zeros(frames[-1] + 3 if len(frames) else 3, dtype=bool)
+    taken[frames] = True
+    candidates = np.flatnonzero(~taken[:-1] & ~taken[1:])
+    return rng.choice(candidates, size=min(qty, len(candidates)), replace=False).tolist()
+
+
+def movable_frames(frames, qty, rng):
+    # qty frames that hold an event and whose next frame is free
+    next_free = np.ones(len(frames), dtype=bool)
+    next_free[:-1] = frames[1:] != frames[:-1] + 1
+    candidates = frames[next_free]
+    return rng.choice(candidates, size=min(qty, len(candidates)), replace=False).tolist()
+
+
+def build_layer(frames):
+    layer = EventModel()
+    layer.set_layer_name("Layer 0")
+    layer.set_layer_number(0)
+    layer.add_events(frames)
+    return layer
+
+
+def bench_event_model(event_qty, op_qty, repeat, rng):
+    frames = generate_event_frames(event_qty, event_qty * 2, rng)
+    new_frames = free_frames(frames, op_qty, rng)
+    nudged_frames = movable_frames(frames, op_qty, rng)
+    params = {"event_qty": event_qty}
+
+    def add(layer):
+        for frame_number in new_frames:
+            layer.add(frame_number)
+
+    def delete(layer):
+        for frame_number in nudged_frames:
+            layer.delete(frame_number)
+
+    def nudge(layer):
+        for frame_number in nudged_frames:
+            layer.nudge_event(frame_number, 1)
+
+    setup = lambda: (build_layer(frames),)
+    return [
+        summarize("event_model_add", params, time_calls(add, repeat, setup), len(new_frames)),
+        summarize("event_model_delete", params, time_calls(delete, repeat, setup), len(nudged_frames)),
+        summarize("event_model_nudge_event", params, time_calls(nudge, repeat, setup), len(nudged_frames)),
+    ]
+
+
+def bench_layer_model(event_qty, op_qty, repeat, rng):
+    # Two layers share event_qty events, events move within Layer 0 and from Layer 0 to Layer 1
+    layer_frames = [generate_event_frames(event_qty // 2, event_qty, rng) for _ in range(2)]
+    moved_frames = movable_frames(layer_frames[0], op_qty, rng)
+    changed_frames = [int(frame) for frame in np.setdiff1d(layer_frames[0], layer_frames[1])[:op_qty]]
+    params = {"event_qty": event_qty}
+
+    def setup():
+        stack = LayerModel()
+        for layer_number, frames in enumerate(layer_frames):
+            stack.create_layer(f"Layer {layer_number}")
+            stack.add_events_to_layer(f"Layer {layer_number}", frames)
+        return (stack,)
+
+    def move_event(stack):
+        for frame_number in moved_frames:
+            stack.move_event("Layer 0", frame_number, frame_number + 1)
+
+    def change_event_layer(stack):
+        for frame_number in changed_frames:
+            stack.change_event_layer("Layer 0", "Layer 1", frame_number)
+
+    return [
+        summarize("layer_model_move_event", params, time_calls(move_event, repeat, setup), len(moved_frames)),
+        summarize(
+            "layer_model_change_event_layer", params, time_calls(change_event_layer, repeat, setup), len(changed_frames)
+        ),
+    ]
+
+
+def bench_main_model(event_qty, repeat, directory, project_settings):
+    model = generate_project(directory, event_qty=event_qty, **project_settings)
+    model.save_path = os.path.join(directory, f"synthetic_{event_qty}.sz")
+    params = {"event_qty": event_qty, **project_settings}
+    save_timings = time_calls(model.save, repeat)
+
+    def load(fresh_model):
+        fresh_model.load(model.save_path)
+
+    load_timings = time_calls(load, repeat, lambda: (MainModel(),))
+    return [
+        summarize("main_model_save", params, save_timings),
+        summarize("main_model_load", params, load_timings),
+    ], model
+
+
+def bench_song(song_object, repeat, song_settings):
+    song_data, sample_rate = song_object.get_song_data()
+    song_data = np.asarray(song_data)
+    params = {"sample_rate": sample_rate, **song_settings}
+    last_frame = song_object.peak_pyramid.last_frame
+    views = []
+    for division in WAVEFORM_ZOOM_DIVISIONS:
+        span = last_frame / division
+        for step in range(WAVEFORM_PAN_STEPS):
+            start_frame = (last_frame - span) * step / max(WAVEFORM_PAN_STEPS - 1, 1)
+            views.append((start_frame, start_frame + span))
+
+    def setup():
+        waveform_plot_item = WaveformPlotItem()
+        waveform_plot_item.set_peak_pyramid(song_object.peak_pyramid)
+        return (waveform_plot_item,)
+
+    def sweep(waveform_plot_item):
+        for start_frame, end_frame in views:
+            waveform_plot_item.update_visible_peaks(start_frame, end_frame, WAVEFORM_PIXEL_WIDTH)
+
+    filter_timings = time_calls(lambda: apply_filter("Low-pass", 500, song_data, sample_rate), repeat)
+    onset_timings = time_calls(lambda: detect_onsets(song_data=song_data, sample_rate=sample_rate), repeat)
+    return [
+        summarize("waveform_update_visible_peaks", params, time_calls(sweep, repeat, setup), len(views)),
+        summarize("analyze_filter_apply_filter", params, filter_timings),
+        summarize("tools_detect_onsets", params, onset_timings),
+    ]
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if status else commit
+
+
+POPUP_METHODS = ("show_info", "show_error")
+
+
+def silence_popups():
+    # save shows a modal message box, which nobody can close when running headless, returns the methods it replaced
+    originals = {name: PopupManager.__dict__[name] for name in POPUP_METHODS}
+    for name in POPUP_METHODS:
+        setattr(PopupManager, name, staticmethod(lambda *args, **kwargs: None))
+    return originals
+
+
+def restore_popups(originals):
+    for name, method in originals.items():
+        setattr(PopupManager, name, method)
+
+
+def run_benchmarks(
+    event_qtys=DEFAULT_EVENT_QTYS,
+    song_qty=2,
+    song_seconds=60,
+    layer_qty=4,
+    audio_kind="sine",
+    repeat=5,
+    op_qty=100,
+    seed=0,
+    on_result=None,
+):
+    rng = np.random.default_rng(seed)
+    project_settings = {
+        "song_qty": song_qty,
+        "song_seconds": song_seconds,
+        "layer_qty": layer_qty,
+        "audio_kind": audio_kind,
+        "seed": seed,
+    }
+    results = []
+
+    def add_results(new_results):
+        results.extend(new_results)
+        for result in new_results:
+            if on_result is not None:
+                on_result(result)
+
+    # Popups, the log level and the cache directory are put back afterwards, run_benchmarks can be called in process
+    popups = silence_popups()
+    log_level = LogManager.get_level()
+    LogManager.set_level("WARNING")  # Keep the per song info messages out of the timings
+    cache_directory = audio_cache.directory
+    try:
+        with tempfile.TemporaryDirectory(prefix="stagezero_bench_") as directory:
+            audio_cache.set_directory(os.path.join(directory, "cache"))  # Keep synthetic songs out of the real cache
+            model = None
+            for event_qty in event_qtys:
+                add_results(bench_event_model(event_qty, op_qty, repeat, rng))
+                add_results(bench_layer_model(event_qty, op_qty, repeat, rng))
+                project_results, model = bench_main_model(event_qty, repeat, directory, project_settings)
+                add_results(project_results)
+            if model is None:
+                model = generate_project(directory, event_qty=0, **project_settings)
+            song_settings = {"song_seconds": song_seconds, "audio_kind": audio_kind}
+            add_results(bench_song(model.song.objects[model.song.loaded_song], repeat, song_settings))
+    finally:
+        audio_cache.set_directory(cache_directory)
+        LogManager.set_level(log_level)
+        restore_popups(popups)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "project_fps": constants.PROJECT_FPS,
+        "settings": {"event_qtys": list(event_qtys), "repeat": repeat, "op_qty": op_qty, **project_settings},
+        "results": results,
+    }
+
+
+def write_results(results, path=None):
+    if path is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIRECTORY, f"{stamp}-{results['commit'] or 'unknown'}.json")
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    return path
+
+
+def result_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare_results(baseline_path, results, threshold=0.2):
+    # Returns (name, params, baseline median, median, ratio) for every benchmark that got threshold slower or faster
+    with open(baseline_path) as file:
+        baseline = {result_key(result): result for result in json.load(file)["results"]}
+    changes = []
+    for result in results["results"]:
+        baseline_result = baseline.get(result_key(result))
+        if baseline_result is None or baseline_result["median_s"] == 0:
+            continue
+        ratio = result["median_s"] / baseline_result["median_s"]
+        if abs(ratio - 1) > threshold:
+            changes.append((result["name"], result["params"], baseline_result["median_s"], result["median_s"], ratio))
+    return changes
@@ -0,0 +1,89 @@
+"""
+Module: SyntheticProject
+
+This module builds synthetic projects for the benchmarks, so the core paths can be timed at any size without real songs.
+
+Arguments:
+    directory (str): The folder the synthetic audio files are written to.
+    song_qty (int): The number of songs in the project, each one gets its own stack.
+    song_seconds (float): The length of every song in seconds.
+    layer_qty (int): The number of layers in every stack.
+    event_qty (int): The number of events in the whole project, spread evenly over every layer of every stack.
+    audio_kind (str): "sine" for a tone with a click every half second or "noise" for white noise with bursts.
+    seed (int): Seeds the audio and the event frames so the same settings always build the same project.
+
+Returns:
+    - write_synthetic_audio: Returns the path of a wav file of synthetic audio.
+    - generate_event_frames: Returns a sorted array of unique event frames.
+    - generate_project: Returns a MainModel holding the songs, stacks, layers and events.
+
+Songs are built through SongModel.build_song_object, so their audio goes through the audio cache and gets a peak
+pyramid and a waveform plot item exactly the way an imported mp3 does. A layer can hold more events than its song
+has frames, at 1M events the frames simply run past the end of the song, which the models don't mind.
+"""
+
+import os
+
+import numpy as np
+import soundfile as sf
+
+import constants
+from model import MainModel
+
+AUDIO_KINDS = ("sine", "noise")
+CLICK_INTERVAL_SECONDS = 0.5  # Both kinds of audio get a transient this often, so onset detection has work to do
+
+
+def write_synthetic_audio(path, seconds, sample_rate=constants.AUDIO_SAMPLE_RATE, audio_kind="sine", seed=0):
+    if audio_kind not in AUDIO_KINDS:
+        raise ValueError(f"Unknown audio kind '{audio_kind}', expected one of {AUDIO_KINDS}")
+    rng = np.random.default_rng(seed)
+    sample_qty = int(seconds * sample_rate)
+    time = np.arange(sample_qty) / sample_rate
+    if audio_kind == "sine":
+        song_data = 0.3 * np.sin(2 * np.pi * 220 * time) + 0.1 * np.sin(2 * np.pi * 330 * time)
+    else:
+        song_data = 0.05 * rng.standard_normal(sample_qty)
+    # A short decaying burst of noise on every click
+    click_length = int(0.05 * sample_rate)
+    envelope = np.exp(-np.linspace(0, 8, click_length))
+    for start in range(0, sample_qty - click_length, int(CLICK_INTERVAL_SECONDS * sample_rate)):
+        song_data[start : start + click_length] += 0.6 * envelope * rng.standard_normal(click_length)
+    sf.write(path, np.clip(song_data, -1, 1).astype(np.float32), sample_rate, subtype="PCM_16")
+    return path
+
+
+def generate_event_frames(event_qty, frame_qty, rng):
+    # event_qty unique frames, spread over the song or over event_qty frames if the song is shorter than that
+    frame_range = max(frame_qty, event_qty)
+    return np.sort(rng.choice(frame_range, size=event_qty, replace=False)).astype(np.int64)
+
+
+def generate_project(directory, song_qty=2, song_seconds=60, layer_qty=4, event_qty=1000, audio_kind="sine", seed=0):
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    model = MainModel()
+    model.project_name = "Synthetic"
+    layer_event_qtys = np.full(song_qty * layer_qty, event_qty // (song_qty * layer_qty))
+    layer_event_qtys[: event_qty % (song_qty * layer_qty)] += 1  # Spread the remainder over the first layers
+    colors = [(255, 255, 255), (255, 0, 0), (0, 255, 0), (0, 128, 255)]
+    for song_number in range(song_qty):
+        song_name = f"Song {song_number}"
+        path = write_synthetic_audio(
+            os.path.join(directory, f"song_{song_number}.wav"), song_seconds, audio_kind=audio_kind, seed=seed + song_number
+        )
+        song_object = model.song.build_song_object(path, song_name)
+        model.song.add_song_object_to_model(song_object)
+        model.stack.create_stack(song_name)
+        stack = model.stack.objects[song_name]
+        stack.set_frame_qty(song_object.frame_qty)
+        for layer_number in range(layer_qty):
+            layer_name = f"Layer {layer_number}"
+            stack.create_layer(layer_name)
+            frames = generate_event_frames(
+                int(layer_event_qtys[song_number * layer_qty + layer_number]), song_object.frame_qty, rng
+            )
+            stack.add_events_to_layer(layer_name, frames, event_colors=colors[layer_number % len(colors)])
+    model.song.loaded_song = "Song 0"
+    model.stack.set_loaded_stack("Song 0")
+    return model
@@ -0,0 +1,2 @@
+from .SyntheticProject import *
+from .BenchmarkRunner import *
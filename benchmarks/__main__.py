@@ -0,0 +1,75 @@
+"""
+Module: benchmarks
+
+Runs the benchmark suite without a display and writes the timings to benchmarks/results, run it from the repository root:
+
+    python -m benchmarks
+    python -m benchmarks --events 1000,10000 --songs 1 --song-seconds 30 --compare benchmarks/results/<baseline>.json
+
+Arguments:
+    See --help.
+
+Returns:
+    None. Prints every result as it finishes, the path of the JSON file and, with --compare, the benchmarks that changed.
+"""
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Must be set before the QApplication is created
+
+from PyQt5.QtWidgets import QApplication
+
+from .BenchmarkRunner import DEFAULT_EVENT_QTYS, compare_results, run_benchmarks, write_results
+from .SyntheticProject import AUDIO_KINDS
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Time StageZero's core paths on synthetic projects.")
+    parser.add_argument("--events", default=",".join(str(qty) for qty in DEFAULT_EVENT_QTYS), help="comma separated event counts")
+    parser.add_argument("--songs", type=int, default=2, help="songs per project")
+    parser.add_argument("--song-seconds", type=float, default=60, help="length of every song")
+    parser.add_argument("--layers", type=int, default=4, help="layers per stack")
+    parser.add_argument("--audio", choices=AUDIO_KINDS, default="sine", help="kind of synthetic audio")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--ops", type=int, default=100, help="single event edits per timed run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="results file, defaults to benchmarks/results/<time>-<commit>.json")
+    parser.add_argument("--compare", default=None, help="results file of a baseline run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change reported by --compare")
+    return parser.parse_args(argv)
+
+
+def print_result(result):
+    params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+    print(f"{result['name']:<34} {result['median_s'] * 1000:>11.3f} ms  {result['per_op_us']:>12.1f} us/op  ({params})")
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # The waveform and layer plot items are Qt objects
+    results = run_benchmarks(
+        event_qtys=[int(qty) for qty in arguments.events.split(",") if qty.strip()],
+        song_qty=arguments.songs,
+        song_seconds=arguments.song_seconds,
+        layer_qty=arguments.layers,
+        audio_kind=arguments.audio,
+        repeat=arguments.repeat,
+        op_qty=arguments.ops,
+        seed=arguments.seed,
+        on_result=print_result,
+    )
+    path = write_results(results, arguments.output)
+    print(f"Results written to {path}")
+    if arguments.compare:
+        changes = compare_results(arguments.compare, results, arguments.threshold)
+        if not changes:
+            print(f"No benchmark changed by more than {arguments.threshold:.0%} against {arguments.compare}")
+        for name, params, baseline_median, median, ratio in changes:
+            change = "slower" if ratio > 1 else "faster"
+            print(f"{name} {params}: {baseline_median * 1000:.3f} ms -> {median * 1000:.3f} ms ({ratio:.2f}x, {change})")
+
+
+if __name__ == "__main__":
+    main()
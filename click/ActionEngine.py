@@ -1,6 +1,10 @@
-from PyQt5.QtCore import Qt, QPointF
+import math
+from PyQt5.QtCore import Qt
 from pyqtgraph import RectROI
-from view.LayerPlotItem import LayerPlotItem
+from view.LayerPlotItem import EventSpot
+from LogManager import get_logger
+
+log = get_logger("event")
 
 class Action:
     def __init__(self, main_controller):
@@ -17,8 +21,11 @@ class StackAction:
         self.connect_layer_signal(self.layer_widget.layer_plot)
 
     def connect_event_signal(self, plot_data_item):
+        if plot_data_item.actions_connected:  # Layer items are added back to the plot on every song load
+            return
         plot_data_item.sigEventClick.connect(self.main_controller.action.stack.event.click)
         plot_data_item.sigEventDrag.connect(self.main_controller.action.stack.event.drag)
+        plot_data_item.actions_connected = True
 
     def connect_layer_signal(self, layer_plot):
         viewbox = layer_plot.getViewBox()
@@ -44,11 +51,11 @@ class EventAction:
             ev.accept()
 
     def drag(self, ev, object):
-        if object in self.main_controller.event_controller.selected_events:
+        if object in self.main_controller.event_controller.selection:
             if ev.button() == Qt.LeftButton:
                 if ev.isStart(): # This block will only execute at the start of the drag
-                    print("Drag Start")
-                    object.dragOffset = object.points()[0].pos() - ev.buttonDownPos(Qt.LeftButton)
+                    log.debug("Drag Start")
+                    object.dragOffset = object.pos() - ev.buttonDownPos(Qt.LeftButton)
                     object.dragPoint = True
                     object.dragStart = ev.buttonDownPos()
                     self.main_controller.event_controller.start_drag()
@@ -58,7 +65,7 @@ class EventAction:
                     new_pos = ev.pos() + object.dragOffset
                     pos_delta = new_pos - object.dragStart
 
-                    print(f"New Pos {new_pos}, pos delta {pos_delta}")
+                    log.debug("New Pos %s, pos delta %s", new_pos, pos_delta)
                     self.main_controller.event_controller.drag_selected_events(pos_delta)
                     ev.accept()
                 else:
@@ -77,22 +84,22 @@ class LayerAction:
     def click(self, ev, viewbox):
         if ev.button() == Qt.LeftButton and not ev.modifiers():
             self.main_controller.event_controller.clear_selection()
-            print(f"cleared selection")
+            log.debug("cleared selection")
             # ev.accept()
         elif ev.button() == Qt.LeftButton and ev.modifiers() == Qt.ShiftModifier:
             # ev.accept()
             pass
 
     def roi_drag(self, ev, viewbox):
-        print(f"EV {ev}, vb: {viewbox}")
+        log.debug("EV %s, vb: %s", ev, viewbox)
         if ev.button() == Qt.LeftButton and ev.modifiers() == Qt.ShiftModifier:
             ev.accept()
             pos = ev.scenePos()
             if ev.isStart():
                 # Drag start
-                print(f"unmapped:{pos}")
+                log.debug("unmapped:%s", pos)
                 viewbox.dragStartPos =  viewbox.mapSceneToView(pos)
-                print(f"mapped: { viewbox.dragStartPos}")
+                log.debug("mapped: %s", viewbox.dragStartPos)
                 viewbox.roi = RectROI([viewbox.dragStartPos.x(), viewbox.dragStartPos.y()], [1, 1], pen="w")
                 viewbox.addItem(viewbox.roi)
             elif ev.isFinish():
@@ -117,22 +124,23 @@ class LayerAction:
 
     def get_items_in_roi(self, viewbox):
         # Get the bounds of the ROI
-        roi_bounds = viewbox.roi.mapRectToParent(viewbox.roi.boundingRect())
-        print(f"ROI BOUNDS: {roi_bounds}")
-        # List to hold items within the ROI
+        roi_bounds = viewbox.roi.mapRectToParent(viewbox.roi.boundingRect()).normalized()
+        log.debug("ROI BOUNDS: %s", roi_bounds)
+        # Events sit on whole frames at layer_number + 0.5, turn the rectangle into a frame interval and a band of layers
+        start_frame = math.ceil(roi_bounds.left())
+        end_frame = math.floor(roi_bounds.right()) + 1
+        first_layer_number = math.ceil(roi_bounds.top() - 0.5)
+        last_layer_number = math.floor(roi_bounds.bottom() - 0.5)
+        stack = self.main_controller.model.loaded_stack
+        events = stack.events_in_region(start_frame, end_frame, first_layer_number, last_layer_number)
+
+        # List to hold events within the ROI
         selected_items = []
+        for layer_name, frames in events.items():
+            plot_item = stack.layers[layer_name].plot_data_item
+            selected_items.extend(EventSpot(plot_item, frame) for frame in frames.tolist())
 
-        # Iterate over all items in the ViewBox
-        for item in viewbox.allChildren():
-            # Check if the item is an instance of LayerPlotItem
-            if isinstance(item, LayerPlotItem):
-                data = item.getData()
-                x_data, y_data = data
-                if roi_bounds.contains(QPointF(x_data[0], y_data[0])):
-                    # item.set_selected(True)
-                    selected_items.append(item)
-
-        print(f"Selected items: {selected_items}")
+        log.debug("Selected %s items", len(selected_items))
         self.main_controller.event_controller.select_roi_events(selected_items)
         # self.sigItemsSelected.emit(selected_items)
 
@@ -1,3 +1,23 @@
 PROJECT_FPS = 30
 SONG_PLOT_RESOLUTION = 15 # must be value of 1 - 100
-LAYER_HEIGHT = 50 # adjusts the height of each layer
\ No newline at end of file
+LAYER_HEIGHT = 50 # adjusts the height of each layer
+AUDIO_CACHE_DIRECTORY = "cache" # decoded audio is cached here, relative to the working directory
+AUDIO_SAMPLE_RATE = 22050 # default analysis sample rate, used for waveforms, filters and analysis tools (librosa default)
+PLAYBACK_SAMPLE_RATE = 44100 # default sample rate of the audio handed to the playback engine
+RESAMPLE_TYPE = "soxr_hq" # default resampler, see RESAMPLE_TYPES
+RESAMPLE_TYPES = ("soxr_qq", "soxr_lq", "soxr_mq", "soxr_hq", "soxr_vhq") # ordered fastest to highest quality
+STREAM_BLOCK_FRAMES = 1800 # project frames decoded per block when streaming a long recording (one minute at 30 fps)
+STREAMING_THRESHOLD_SECONDS = 1200 # songs longer than this are streamed instead of decoded in one go
+WAVEFORM_SUMMARY_BUCKETS_PER_FRAME = 8 # min/max pairs kept per project frame by the streamed waveform summary
+PEAK_BASE_BUCKET_SIZE = 64 # samples per min/max pair in the finest level of a song's peak pyramid
+PEAK_LEVEL_FACTOR = 4 # each coarser level of the peak pyramid merges this many buckets of the level below
+PEAK_BUCKETS_PER_PIXEL = 2 # the waveform draws the coarsest level that still has this many buckets per pixel
+EVENT_ATLAS_MAX_SYMBOLS = 1000 # the shared event symbol atlas is pruned to the styles still drawn once it holds more symbols than this
+LOG_LEVEL = "INFO" # default level of every log category, STAGEZERO_LOG="debug" or "event=debug,audio=info" overrides levels at startup
+LOG_CATEGORY_LEVELS = {"event": "WARNING", "stack": "WARNING", "plot": "WARNING"} # hot path categories are silent unless asked for
+INSTRUMENTATION_FRAME_MS = 16 # interval of the instrumentation heartbeat, the GUI frame time is measured against it
+INSTRUMENTATION_STALL_MS = 50 # a heartbeat this much later than its interval counts as an event loop stall
+INSTRUMENTATION_WINDOW_SECONDS = 5 # the instrumentation dock shows statistics over this many seconds
+INSTRUMENTATION_HISTORY = 100000 # samples kept per metric for the CSV export
+PROFILE_DIRECTORY = "profiles" # profiling mode writes a .prof and a .txt summary per profiled call here, relative to the working directory
+PROFILE_TOP_FUNCTIONS = 25 # functions listed per sort order in a profile summary
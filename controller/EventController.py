@@ -13,8 +13,12 @@ Returns:
     The methods of this class perform operations on these instances but do not return any value.
 """
 
+import numpy as np
 from view import EventEditorWidget, EventCreatorWidget
 from view.LayerSelectPopup import open_layer_selection_popup
+from LogManager import get_logger
+
+log = get_logger("event")
 
 
 class EventController:    
@@ -25,7 +29,11 @@ class EventController:
         self.view = main_controller.view
         self.layer_widget = self.view.main_window.stage_widget.stack.layer_widget
         self.layer_plot = self.view.main_window.stage_widget.stack.layer_widget.layer_plot
-        self.selected_events = []
+        self.selection = self.model.selection  # Selected events, keyed by (layer name, frame number)
+        self.selection.sigSelectionChanged.connect(self.on_selection_changed)
+        self.drag_plot_items = set()  # Layer plot items previewing a drag of their selected events
+        self.drag_offset = 0
+        self.collision_policy = "reject"  # What a nudge or drag does to events landing on occupied frames: reject, merge or overwrite
         self.connect_event_properties_widget_signals()
         self.connect_event_action_widget_signals()
 
@@ -37,8 +45,9 @@ class EventController:
 
     def connect_event_action_widget_signals(self):
         self.view.main_window.event_action_widget.delete_button.clicked.connect(self.delete_selected_events)
-        self.view.main_window.event_action_widget.nudge_minus_button.clicked.connect(self.nudge_event_minus)
-        self.view.main_window.event_action_widget.nudge_plus_button.clicked.connect(self.nudge_event_plus)
+        # clicked passes a checked flag, which would otherwise arrive as the increment
+        self.view.main_window.event_action_widget.nudge_minus_button.clicked.connect(lambda: self.nudge_event_minus())
+        self.view.main_window.event_action_widget.nudge_plus_button.clicked.connect(lambda: self.nudge_event_plus())
         self.view.main_window.event_action_widget.change_layer_button.clicked.connect(self.change_event_layer)
         self.view.main_window.event_action_widget.create_event_button.clicked.connect(self.open_new_event_dialog)
 
@@ -58,6 +67,12 @@ class EventController:
 
         self.add_new_event_to_plot(layer_name, frame_number)
 
+    def add_events(self, layer_name, frames, colors=None, names=None):
+        # Adds a batch of events with one model commit and one plot refresh, for generators and analysis tools
+        added_frames = self.model.loaded_stack.add_events_to_layer(layer_name, frames, event_names=names, event_colors=colors)
+        self.add_event_list_to_plot(layer_name, added_frames)
+        return added_frames
+
     def unpackage_data(self, event_data):
         frame_number = event_data["frame_number"]
         parent_layer_name = event_data["parent_layer_name"]
@@ -66,7 +81,7 @@ class EventController:
         color = event_data["color"]
 
     def add_new_event(self, package_data):
-        print(f"add new event")
+        log.debug("add new event")
         # popup window to ask which frame and which layer
         # check box to add multiple events spaced evenly every x frames
         frame_number = package_data["frame_number"]
@@ -77,14 +92,9 @@ class EventController:
         event_spacing = package_data["event_spacing"]
 
         if event_qty > 1:
-            print(f"[EventController][add_new_event] | Adding multiple events at frames:")
-            frame_number_start = frame_number
-            event_counter = frame_number_start
-            for _ in range(event_qty):
-                print(f"[EventController][add_new_event] | --->frame counter: {event_counter}")
-                self.model.loaded_stack.add_event_to_layer(layer_name, event_counter, event_name=name, event_color=color)
-                self.add_new_event_to_plot(layer_name, event_counter)
-                event_counter += event_spacing
+            frames = frame_number + np.arange(event_qty) * event_spacing
+            log.debug("[EventController][add_new_event] | Adding %s events from frame %s every %s frames", event_qty, frame_number, event_spacing)
+            self.add_events(layer_name, frames, colors=color, names=name)
 
         elif event_qty == 1:
             self.model.loaded_stack.add_event_to_layer(layer_name, frame_number, event_name=name, event_color=color)
@@ -92,17 +102,22 @@ class EventController:
         pass
 
     def update_event_name(self, new_name ):
-        print(f"[EventController][update_event_name] | name {new_name}")
-        for event in self.selected_events:
-            event.name = new_name
-            self.model.loaded_stack.layers[event.parent_layer_name].objects[event.frame_num].name = new_name
+        log.debug("[EventController][update_event_name] | name %s", new_name)
+        for event in self.selection:
+            self.model.loaded_stack.layers[event.parent_layer_name].set_name(event.frame_num, new_name)
+        self.refresh_selected_layers()
 
     def update_event_color(self, color):
-        print(f"[EventController][update_event_color] | color: {color}")
-        for event in self.selected_events:
+        log.debug("[EventController][update_event_color] | color: %s", color)
+        for event in self.selection:
             event_model_item = self.model.loaded_stack.layers[event.parent_layer_name].objects[event.frame_num]
             event_model_item.set_color(color)
-        pass
+        self.refresh_selected_layers()
+
+    def refresh_selected_layers(self):
+        # Each layer is redrawn once however many of its events were edited
+        for layer_name in self.selection.layer_names():
+            self.model.loaded_stack.layers[layer_name].refresh_plot_data_item()
 
     def update_event_layer(self): #TODO update_event_layer
         # print("update_event_layer")
@@ -112,8 +127,8 @@ class EventController:
         pass
 
     def change_event_layer(self): 
-        if not self.selected_events:
-            print("[EventController][change_event_layer]| No events selected.")
+        if not self.selection:
+            log.warning("[EventController][change_event_layer]| No events selected.")
             return
         
         layer_names = [layer_item.layer_name for layer_key, layer_item in self.model.loaded_stack.layers.items()]
@@ -123,13 +138,16 @@ class EventController:
             selected_layer_items = self.layer_selection_popup.layer_list_widget.selectedItems()
             if selected_layer_items:
                 self.selected_layer_name = selected_layer_items[0].text()
-                print(f"[EventController][change_event_layer][on_layer_selected] | Selected layer: {self.selected_layer_name}")
+                log.debug("[EventController][change_event_layer][on_layer_selected] | Selected layer: %s", self.selected_layer_name)
 
         def on_accept():
-            print(f"[EventController][change_event_layer][on_accept] | Moving selected events to layer index {self.selected_layer_name}")
-            for event in self.selected_events:
+            log.debug("[EventController][change_event_layer][on_accept] | Moving selected events to layer index %s", self.selected_layer_name)
+            for event in self.selection:
                 original_layer_name = event.parent_layer_name
-                self.model.loaded_stack.change_event_layer(original_layer_name, self.selected_layer_name, event.frame_num)
+                self.model.loaded_stack.change_event_layer(
+                    original_layer_name, self.selected_layer_name, event.frame_num, self.collision_policy
+                )
+            self.selection.forget()  # The moved events are drawn by a different layer item now
             self.layer_selection_popup.close()
 
         self.layer_selection_popup.layer_list_widget.itemSelectionChanged.connect(on_layer_selected)
@@ -139,116 +157,143 @@ class EventController:
 
 
     def nudge_event_minus(self, increment=-1):
-        print(f"[EventController][nudge_event_minus] | nudge events minus")
-        for event in self.selected_events:
-            self.model.loaded_stack.layers[event.parent_layer_name].nudge_event(event.frame_num, increment)
+        log.debug("[EventController][nudge_event_minus] | nudge events minus")
+        self.shift_selected_events(increment)
 
     def nudge_event_plus(self, increment=1):
-        print(f"[EventController][nudge_event_plus] | nudge events plus")
-        for event in self.selected_events:
-            self.model.loaded_stack.layers[event.parent_layer_name].nudge_event(event.frame_num, increment)
+        log.debug("[EventController][nudge_event_plus] | nudge events plus")
+        self.shift_selected_events(increment)
+
+    def shift_selected_events(self, amount):
+        # Shifts the whole selection at once, so events nudged into each other's frames don't depend on the loop order
+        events = list(self.selection)
+        frames_by_layer = {}
+        for event in events:
+            frames_by_layer.setdefault(event.parent_layer_name, []).append(event.frame_num)
+        moved_frames = self.model.loaded_stack.move_events(frames_by_layer, amount, self.collision_policy)
+        if moved_frames is None:
+            return False
+        # A "merge" drops moved events that landed on an unselected event, they would otherwise stay selected as that event
+        kept_frames = {layer_name: set(frames.tolist()) for layer_name, frames in moved_frames.items()}
+        self.selection.forget(
+            [event for event in events if event.frame_num + amount not in kept_frames[event.parent_layer_name]]
+        )
+        events = [event for event in events if event.frame_num + amount in kept_frames[event.parent_layer_name]]
+        for event in events:
+            event.frame_num += amount
+        self.selection.rekey()
+        self.highlight_events(events)
+        return True
 
     def delete_selected_events(self):
-        for event in self.selected_events:
+        for event in self.selection:
             self.model.loaded_stack.delete_event(event.parent_layer_name, event.frame_num)
-            self.layer_widget.remove_item(event)
+        self.selection.forget()
 
     def add_new_event_to_plot(self, layer_name, frame_number):
-        # This function adds an event to the plot
-        print(f"[EventController][add_new_event_to_plot] | layer '{layer_name}' adding event at frame '{frame_number}'")
-        self.model.loaded_stack.layers[layer_name].objects[frame_number].generate_layer_plot_item()
-        plot_data_item = (self.model.loaded_stack.layers[layer_name].objects[frame_number].plot_data_item)
-        self.main_controller.action.stack.connect_event_signal(plot_data_item)
-        self.layer_plot.addItem(plot_data_item)
+        # The layer's plot item redraws itself when the model changes, it only has to be on the plot
+        log.debug("[EventController][add_new_event_to_plot] | layer '%s' adding event at frame '%s'", layer_name, frame_number)
+        for plot_data_item in self.model.loaded_stack.layers[layer_name].get_plot_layer_data():
+            self.add_event_to_plot(plot_data_item)
 
     def add_event_list_to_plot(self, layer_name, frame_number_list):
-        for frame_number in frame_number_list:
-            self.add_new_event_to_plot(layer_name, frame_number)
+        # Every event of a layer is drawn by the same plot item, so it only has to be put on the plot once
+        log.debug("[EventController][add_event_list_to_plot] | layer '%s' adding %s events", layer_name, len(frame_number_list))
+        for plot_data_item in self.model.loaded_stack.layers[layer_name].get_plot_layer_data():
+            self.add_event_to_plot(plot_data_item)
 
     def add_event_to_plot(self, event):
         self.main_controller.action.stack.connect_event_signal(event)
-        self.layer_plot.addItem(event)
+        if event.scene() is None:
+            self.layer_plot.addItem(event)
 
     def add_plot_layer_data(self, plot_layer_data):
         if plot_layer_data:
             for event in plot_layer_data:
                 self.add_event_to_plot(event)
-                print(f"[EventController][add_plot_layer_data] | Adding plot data item: {event}")
+                log.debug("[EventController][add_plot_layer_data] | Adding plot data item: %s", event)
         else:
-            print("[EventController][add_plot_layer_data] | Warning: There are no items in the event group.")
+            log.warning("[EventController][add_plot_layer_data] | Warning: There are no items in the event group.")
 
     def start_drag(self):
-        self.initial_positions = {event: event.frame_num for event in self.selected_events}
+        # The selected events of each layer are previewed by one item that is moved as a whole during the drag
+        self.drag_offset = 0
+        self.drag_plot_items = {event.plot_item for event in self.selection}
+        for plot_item in self.drag_plot_items:
+            plot_item.start_drag_preview()
 
     def drag_selected_events(self, pos_delta):
-        # Ensure initial positions are captured before calling this method
-        for event in self.selected_events:
-            initial_pos_x = self.initial_positions[event]
-            new_pos_x = initial_pos_x + pos_delta.x()
-            event.set_x_position(new_pos_x)
+        # Ensure start_drag is called before this method
+        self.drag_offset = pos_delta.x()
+        for plot_item in self.drag_plot_items:
+            plot_item.move_drag_preview(self.drag_offset)
 
     def end_drag(self): # Call this method when the drag operation ends
-        self.update_event_model(self.selected_events)
-        self.initial_positions.clear()
-
-    def update_event_model(self, events):
-        for event in events:
-            data = event.getData()
-            current_frame = event.frame_num
-            layer_name = event.parent_layer_name
-            new_frame_x = int(data[0][0])
-            # new_frame_y = int(data[1][0])
-            print(f"[EventController][update_event_model] | Moving frame: {current_frame} ---> {new_frame_x}")
-            self.model.loaded_stack.move_event(layer_name, current_frame, new_frame_x)  # new_frame_y=layer index | current_frame=current index | new_frame_x =new index
-            event.frame_num = new_frame_x
+        for plot_item in self.drag_plot_items:
+            plot_item.end_drag_preview()
+        self.drag_plot_items = set()
+        self.update_event_model(list(self.selection), int(round(self.drag_offset)))
+
+    def update_event_model(self, events, offset):
+        # Moves every dragged event in one model update per layer, the drag is undone if the collision policy rejects it
+        if offset == 0:
+            return
+        log.debug("[EventController][update_event_model] | Moving %s events by %s frames", len(events), offset)
+        self.shift_selected_events(offset)
 
     def handle_position_change(self, current_frame, event):
         new_frame_x = int(event.x())
         layer_name = event.parent_layer_name
-        print(f"[EventController][handle_pos_change] | start position: {current_frame} | new x position: {new_frame_x}")
+        log.debug("[EventController][handle_pos_change] | start position: %s | new x position: %s", current_frame, new_frame_x)
         self.model.loaded_stack.move_event(layer_name, current_frame, new_frame_x)  # new_frame_y=layer index | current_frame=current index | new_frame_x =new index
 
     def clear_selection(self):
-        for selected_event in self.selected_events:
-            selected_event.unselect() 
+        self.selection.clear()
 
     def select_event(self, event):
-        self.clear_selection()
-        self.selected_events = []
-        if event is not None:
-            self.selected_events.append(event)
-            event.select()
-            layer_key = event.parent_layer_name
-            print(f"[EventController][select_event] | Selected event:\n-->layer '{layer_key}'\n-->frame number '{event.frame_num}'")
-            event_item = self.model.loaded_stack.layers[layer_key].get_event(event.frame_num)
-            self.view.main_window.event_properties_widget.update(event_item)
+        if event is None:
+            self.selection.clear()
+            return
+        log.debug("[EventController][select_event] | Selected event:\n-->layer '%s'\n-->frame number '%s'", event.parent_layer_name, event.frame_num)
+        self.selection.replace([event])
 
     def add_event_to_selection(self, event):
-        if event not in self.selected_events:
-            self.selected_events.append(event)
-            event.select()
-            layer_key = event.parent_layer_name
-            print(f"[EventController][add_event_to_selection] | Added event to selection:\n-->layer '{layer_key}'\n-->frame number '{event.frame_num}'")
-            event_item = self.model.loaded_stack.layers[layer_key].get_event(event.frame_num)
-            self.view.main_window.event_properties_widget.update(event_item)
+        if self.selection.add([event]):
+            log.debug("[EventController][add_event_to_selection] | Added event to selection:\n-->layer '%s'\n-->frame number '%s'", event.parent_layer_name, event.frame_num)
 
     def select_roi_events(self, events):
+        added = self.selection.add(events)
+        log.debug("[EventController][select_roi_events] | Added %s events to selection", len(added))
+
+    def on_selection_changed(self, added, removed):
+        # One pen update per layer and one properties panel update for the whole change
+        self.highlight_events(removed, selected=False)
+        self.highlight_events(added)
+        last_event = self.selection.last()
+        if last_event is not None:
+            event_item = self.model.loaded_stack.layers[last_event.parent_layer_name].get_event(last_event.frame_num)
+            self.view.main_window.event_properties_widget.update(event_item)
+
+    def highlight_events(self, events, selected=True):
+        frames_by_plot_item = {}
         for event in events:
-            self.add_event_to_selection(event)
+            frames_by_plot_item.setdefault(event.plot_item, []).append(event.frame_num)
+        for plot_item, frames in frames_by_plot_item.items():
+            plot_item.select_frames(frames, selected)
 
     def edit_event(self, layer_name, frame_number): # This function edits an event
-        print(f"[EventController][edit_event] | Editing event \n layer '{layer_name}'")
+        log.debug("[EventController][edit_event] | Editing event \n layer '%s'", layer_name)
         model_object = self.model.loaded_stack.get_event_data(layer_name, frame_number)
         self.editor = EventEditorWidget(model_object)
-        self.editor.changes_saved.connect(self.main_controller.layer_controller.refresh_plot_data_item)
         self.editor.exec_()
+        self.model.loaded_stack.layers[layer_name].refresh_plot_data_item()
 
     def clear_plot_events(self):
+        self.selection.forget()  # The selected events belong to the plot items being removed
         if self.model.loaded_stack:
             for layer_name, layer in self.model.loaded_stack.layers.items():
-                # print(f"[EventController][clear_all_events] | iterating thru layer '{layer_name}'")
-                for event_number, event in layer.objects.items():
-                    print(f"[EventController][clear_plot_events] | Clearing layer '{layer_name}' event '{event.frame_number}'")
-                    self.layer_widget.remove_item(event.plot_data_item)
-            pass
+                if layer.plot_data_item is not None:
+                    log.debug("[EventController][clear_plot_events] | Clearing layer '%s'", layer_name)
+                    self.layer_widget.remove_item(layer.plot_data_item)
+            self.model.loaded_stack.release_plot_data_items()  # Only the stack on screen keeps its plot items
 
@@ -3,6 +3,10 @@ import json
 from analyze import filter
 from view.window.FilterAudioWindow import FilterAudioWindow
 from .SongDataPreviewController import SongDataPreviewController
+from Profiler import profiled
+from LogManager import get_logger
+
+log = get_logger("analysis")
 class FilterAudioController:
     def __init__(self, main_controller):
         self.model = main_controller.model
@@ -14,7 +18,7 @@ class FilterAudioController:
 
     def connect_signals(self):
         self.filter_audio_window.filter_list_widget.itemSelectionChanged.connect(self.display_filter_properties)
-        self.filter_audio_window.apply_filter_to_song.clicked.connect(self.apply_filter_to_audio)
+        self.filter_audio_window.apply_filter_to_song.clicked.connect(lambda: self.apply_filter_to_audio())
         self.filter_audio_window.preview_filtered_data.clicked.connect(self.preview_filtered_data)
 
     def display_filter_properties(self):
@@ -28,6 +32,7 @@ class FilterAudioController:
             self.filter_audio_window.filter_cutoff_frequency_label.setText(f"Cutoff Frequency: {properties.get('cutoff_frequency', '')}") # Update more labels as needed
             self.filter_audio_window.process_audio_with_filter(properties)
 
+    @profiled("FilterAudioController.apply_filter_to_audio")
     def apply_filter_to_audio(self):
         selected_item = self.filter_audio_window.filter_list_widget.currentItem()
         if selected_item:
@@ -37,7 +42,7 @@ class FilterAudioController:
                 properties = json.load(file)
             filter_type = properties.get("filter_type", "")
             cutoff_frequency = properties.get("cutoff_frequency", "")
-            filtered_data = filter.apply_filter(filter_type,cutoff_frequency, self.model.loaded_song.song_data, self.model.loaded_song.sample_rate) # function to add filtered data to song
+            filtered_data = filter.apply_filter(filter_type,cutoff_frequency, *self.model.loaded_song.get_song_data()) # function to add filtered data to song
             self.model.add_filtered_data(filter_name, filtered_data)
             self.filter_audio_window.update_song_filtered_data(self.model.loaded_song.filter) # function to refresh the list of filters on song
 
@@ -47,7 +52,7 @@ class FilterAudioController:
         )
 
     def preview_filtered_data(self):
-        print(f"previewing filtered data")
+        log.debug("previewing filtered data")
         selected_item = (
             self.filter_audio_window.song_filtered_data_list_widget.currentItem()
         )
@@ -0,0 +1,80 @@
+"""
+Module: InstrumentationController
+
+This module defines the InstrumentationController class, which turns the playback instrumentation on and off from the
+View menu and keeps the instrumentation dock up to date while it is shown.
+
+Arguments:
+    main_controller (object): A reference to the main controller, used to reach the view and the plots to watch.
+
+Returns:
+    None. The controller records into the shared Instrumentation instance and updates the dock.
+
+Nothing is recorded and no timer runs until the dock is turned on, so the instrumentation costs nothing in a normal session.
+"""
+
+from PyQt5.QtCore import QTimer
+
+import constants
+from Instrumentation import instrumentation
+from view import DialogWindow
+from LogManager import get_logger
+
+log = get_logger("ui")
+
+INSTRUMENTATION_REFRESH_MS = 500  # How often the dock's table is updated
+
+
+class InstrumentationController:
+    def __init__(self, main_controller):
+        self.main_controller = main_controller
+        self.view = main_controller.view
+        self.instrumentation_widget = self.view.main_window.instrumentation_widget
+        self.refresh_timer = QTimer()
+        self.refresh_timer.setInterval(INSTRUMENTATION_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.watch_plots()
+        self.connect_signals()
+
+    def watch_plots(self):
+        stage_widget = self.view.main_window.stage_widget
+        instrumentation.watch_repaints(stage_widget.stack.layer_widget.layer_plot, "layer_plot_repaint_ms")
+        instrumentation.watch_repaints(stage_widget.song_overview.song_plot, "song_plot_repaint_ms")
+
+    def connect_signals(self):
+        self.view.main_menu.view_menu.instrumentation_action.toggled.connect(self.set_enabled)
+        self.instrumentation_widget.visibilityChanged.connect(self.on_visibility_changed)
+        self.instrumentation_widget.reset_button.clicked.connect(self.reset)
+        self.instrumentation_widget.export_button.clicked.connect(self.export_csv)
+
+    def set_enabled(self, enabled):
+        if enabled:
+            instrumentation.enable()
+            self.refresh_timer.start()
+            self.instrumentation_widget.show()
+            self.refresh()
+        else:
+            instrumentation.disable()
+            self.refresh_timer.stop()
+            self.instrumentation_widget.hide()
+        log.info("[InstrumentationController][set_enabled] | Instrumentation %s", "enabled" if enabled else "disabled")
+
+    def on_visibility_changed(self, visible):
+        # Closing the dock with its close button turns the instrumentation off as well
+        if not visible and not self.instrumentation_widget.isHidden():
+            return  # Only tabbed away behind another dock
+        self.view.main_menu.view_menu.instrumentation_action.setChecked(visible)
+
+    def refresh(self):
+        self.instrumentation_widget.update_stats(instrumentation.stats(), constants.INSTRUMENTATION_WINDOW_SECONDS)
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def export_csv(self):
+        path = DialogWindow.save_file("Export Instrumentation", "instrumentation.csv", "CSV Files (*.csv)")
+        if not path:
+            return
+        row_qty = instrumentation.export_csv(path)
+        log.info("[InstrumentationController][export_csv] | Wrote %s samples to %s", row_qty, path)
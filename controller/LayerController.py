@@ -16,6 +16,10 @@ from PyQt5.QtCore import Qt, QTimer
 from view import DialogWindow
 from view.LayerPlotItem import LayerPlotItem
 from constants import LAYER_HEIGHT
+from Profiler import profiled
+from LogManager import get_logger
+
+log = get_logger("stack")
 
 
 class LayerController:
@@ -39,6 +43,7 @@ class LayerController:
         self.view.main_window.stage_widget.layer_control.btnRemove.clicked.connect(self.remove_layer)
         self.view.main_window.stage_widget.layer_control.btnAdd.clicked.connect(self.add_layer)
 
+    @profiled("LayerController.refresh")
     def refresh(self):
         self.refresh_layers()
 
@@ -48,8 +53,10 @@ class LayerController:
         self.reset_x_axis_max_length()
 
     def reset_x_axis_max_length(self):
-        x_axis = self.model.loaded_song.x_axis
-        self.layer_widget.set_plot_x_max(x_axis[-1])
+        self.set_x_axis_max_length(self.model.loaded_song.time_axis.last_frame)
+
+    def set_x_axis_max_length(self, x_max):
+        self.layer_widget.set_plot_x_max(x_max)
 
     def reset_y_axis_ticks(self):
         ticks = self.generate_ticks()           
@@ -61,7 +68,7 @@ class LayerController:
             self.add_plot_layer(layer_name)
 
     def add_plot_layer(self, layer_name):
-        print(f"[LayerController][add_plot_layer] | name: {layer_name}")
+        log.debug("[LayerController][add_plot_layer] | name: %s", layer_name)
         self.load_plot_layer_data(layer_name)
         self.reset_y_axis_ticks()
         self.update_layer_plot_height()
@@ -92,6 +99,8 @@ class LayerController:
         # Remove a layer from the stack
         layer_name = DialogWindow.input_text("Enter Layer Name", "Layer Name")
         stack = self.model.stack.objects[self.model.stack.loaded_stack]
+        if layer_name in stack.layers and stack.layers[layer_name].plot_data_item is not None:
+            self.layer_widget.remove_item(stack.layers[layer_name].plot_data_item)
         stack.remove_layer_from_model(layer_name)
         self.refresh()
 
@@ -133,7 +142,7 @@ class LayerController:
         new_frame_y = int(event.y())
         layer_name = event.parent_layer_name
         self.model.loaded_stack.move_event(layer_name, current_frame, new_frame_x)
-        print(f"[LayerController][handle_pos_change] | start position: {current_frame} | new x position: {new_frame_x}")
+        log.debug("[LayerController][handle_pos_change] | start position: %s | new x position: %s", current_frame, new_frame_x)
 
 
     def handle_right_click(self, layer_name, frame_num):
@@ -32,6 +32,7 @@ from .PlayheadController import PlayheadController
 from .FilterEditorController import FilterEditorController
 from .FilterAudioController import FilterAudioController
 from .PluginWindowController import PluginWindowController
+from .InstrumentationController import InstrumentationController
 from click.ActionEngine import Action
 
 
@@ -55,6 +56,7 @@ class MainController:
         self.filter_editor_controller = FilterEditorController()
         self.filter_audio_controller = FilterAudioController(self)
         self.plugin_window_controller = PluginWindowController(self)
+        self.instrumentation_controller = InstrumentationController(self)
         self.action = Action(self)
 
     def initialize_app(self):
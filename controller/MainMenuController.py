@@ -12,6 +12,10 @@ None. This module is used to control the main menu of the application and does n
 """
 
 from PyQt5.QtWidgets import QApplication
+from Profiler import profiler
+from LogManager import get_logger
+
+log = get_logger("ui")
 
 
 class MainMenuController:
@@ -36,17 +40,28 @@ class MainMenuController:
         )
         self.connect_action(
             self.view.main_menu.file_menu.save_action,
-            self.main_controller.project_controller.save,
+            lambda: self.main_controller.project_controller.save(),  # Keeps triggered's checked flag away from the profiled save
         )
         self.connect_action(
             self.view.main_menu.file_menu.load_action,
             self.main_controller.project_controller.reload_project,
         )
+        self.connect_action(
+            self.view.main_menu.file_menu.import_songs_action,
+            self.main_controller.song_controller.import_songs,
+        )
+        self.connect_action(
+            self.view.main_menu.file_menu.import_song_folder_action,
+            self.main_controller.song_controller.import_song_folder,
+        )
 
     def setup_view_menu_connections(self):
         self.connect_action(
             self.view.main_menu.view_menu.plugin_action, self.open_plugins_window
         )
+        profiling_action = self.view.main_menu.view_menu.profiling_action
+        profiling_action.setChecked(profiler.enabled)  # STAGEZERO_PROFILE can turn profiling on at startup
+        profiling_action.toggled.connect(profiler.set_enabled)
 
     def setup_filter_menu_connections(self):
         self.connect_action(
@@ -62,24 +77,24 @@ class MainMenuController:
 
     # Methods to open different windows remain unchanged
     def open_tools_window(self):
-        print(f"Opening tools window")
+        log.debug("Opening tools window")
         self.view.tools_window.open()
 
     def open_graphs_window(self):
-        print(f"Opening graphs window")
+        log.debug("Opening graphs window")
         self.view.graphs_window.open()
 
     def open_plugins_window(self):
-        print(f"Opening plugins window")
+        log.debug("Opening plugins window")
         self.view.plugins_window.open()
 
     def open_filter_editor(self):
-        print(f"Opening filter editor")
+        log.debug("Opening filter editor")
         self.main_controller.filter_editor_controller.open()
 
     def open_filter_audio(self):
-        print(f"Opening filter audio")
+        log.debug("Opening filter audio")
         self.main_controller.filter_audio_controller.open()
 
     def open_main_window(self):
-        print(f"Opening main window")
+        log.debug("Opening main window")
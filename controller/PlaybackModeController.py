@@ -1,4 +1,3 @@
-
 """
 Module: PlaybackModeController
 
@@ -14,6 +13,11 @@ Returns:
     None. This module is used for controlling the playback modes and does not return any value.
 """
 
+from LogManager import get_logger
+
+log = get_logger("playback")
+
+
 class PlaybackModeController:
     def __init__(self, main_controller):
         self.main_controller = main_controller  # Main controller reference
@@ -51,13 +55,13 @@ class PlaybackModeController:
             self.record_mode()
 
     def play_mode(self):
-        print(f"Play Mode Selected")
+        log.debug("Play Mode Selected")
         pass
 
     def edit_mode(self):
-        print(f"Edit Mode Selected")
+        log.debug("Edit Mode Selected")
         pass
 
     def record_mode(self):
-        print(f"Record Mode Selected")
+        log.debug("Record Mode Selected")
         pass
@@ -1,4 +1,8 @@
 from PyQt5.QtCore import QObject, pyqtSignal
+from Instrumentation import instrumentation
+from LogManager import get_logger
+
+log = get_logger("playback")
 
 class PlayheadController:
     sigPlayheadPosChange = pyqtSignal(int)
@@ -22,11 +26,11 @@ class PlayheadController:
         rounded_playhead_position = int(playhead.value())
         self.update_playhead_location(rounded_playhead_position)
         self.main_controller.audio_playback_controller.goto(rounded_playhead_position)
-        print(f"[PlayheadController][on_pos_change] | Position changed to '{rounded_playhead_position}")
+        log.debug("[PlayheadController][on_pos_change] | Position changed to '%s", rounded_playhead_position)
 
     def update_playhead_location(self, location):
         self.model.song.playhead.setPos(location)
         self.model.stack.playhead.setPos(location)
-        pass
+        instrumentation.mark_applied(location)
 
 
@@ -1,4 +1,7 @@
 import os
+from LogManager import get_logger
+
+log = get_logger("ui")
 
 # TODO: menu to toggle plugins on/off in the launch window
 class PluginWindowController:
@@ -17,9 +20,9 @@ class PluginWindowController:
         selected_items = self.view.plugin_list.selectedItems()
         if selected_items:
             plugin_name = selected_items[0].text()
-            print(f"Selected plugin: {plugin_name}")
+            log.debug("Selected plugin: %s", plugin_name)
         else:
-            print("No plugin selected.")
+            log.warning("No plugin selected.")
 
     def refresh_plugins(self):
         self.view.plugin_list.clear() # Clear the current list
@@ -39,8 +42,8 @@ class PluginWindowController:
         selected_items = self.view.plugin_list.selectedItems() # Get the selected plugin
         if selected_items:
             plugin_name = selected_items[0].text().replace(".py", "")
-            print(f"Opening plugin: {plugin_name}")
+            log.info("Opening plugin: %s", plugin_name)
             self.model.plugin.plugins[plugin_name].open()
             # TODO: Implement the logic to open the selected plugin
         else:
-            print("No plugin selected.")
+            log.warning("No plugin selected.")
@@ -15,6 +15,10 @@ Returns:
 from view import DialogWindow
 from PopupManager import PopupManager
 import os
+from Profiler import profiled
+from LogManager import get_logger
+
+log = get_logger("project")
 
 class ProjectController:
     def __init__(self, main_controller):
@@ -25,12 +29,13 @@ class ProjectController:
 
     def connect_signals(self):
         self.view.launch_window.new_project_button.clicked.connect(self.new_project)  # Connecting the new_project_button click signal to the new_project method
-        self.view.launch_window.load_project_button.clicked.connect(self.load_project)  # Connecting the load_project_button click signal to the load_project method
+        self.view.launch_window.load_project_button.clicked.connect(lambda: self.load_project())  # Connecting the load_project_button click signal to the load_project method
 
     def new_project(self):
         self.model.project_name = "Untitled"  # Setting the project name in the model
         self.main_controller.open_main_window()
 
+    @profiled("ProjectController.load_project")
     def load_project(self):
         path = DialogWindow.open_file("Open Location", "saves/")
         if os.path.exists(path):
@@ -38,7 +43,9 @@ class ProjectController:
         else:
             return
         self.model.load(path)
-        print(f"[ProjectController][load_project] | Project Loaded from {path}")
+        log.info("[ProjectController][load_project] | Project Loaded from %s", path)
+        summary = self.model.song.summary()
+        log.info("[ProjectController][load_project] | %s songs, %s frames, %.1f seconds", summary['song_qty'], summary['frame_qty'], summary['length_ms'] / 1000)
         self.view.open_main_window()
         self.view.close_launch_window()
 
@@ -46,11 +53,13 @@ class ProjectController:
         self.main_controller.song_overview_controller.refresh()  # Load the song data into the song overview plot
         self.main_controller.layer_controller.refresh()  # initialize the layer widget
         self.main_controller.song_select_controller.refresh()  # Update the song select widget dropdown items
+        self.main_controller.song_controller.prefetch_next_song()
 
     def save_as(self):
         self.model.save_path = DialogWindow.save_file("Save Location")
         self.model.save()
 
+    @profiled("ProjectController.save")
     def save(self):
         if self.model.save_path is not None:
             self.model.save()
@@ -66,5 +75,6 @@ class ProjectController:
         self.main_controller.song_overview_controller.refresh()
         self.main_controller.audio_playback_controller.refresh()
         self.main_controller.song_select_controller.refresh()  # Update the song select widget dropdown items
+        self.main_controller.song_controller.prefetch_next_song()
 
-        print(f"Project Loaded from {path}")
+        log.info("Project Loaded from %s", path)
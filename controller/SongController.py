@@ -10,16 +10,30 @@ Arguments:
 Returns:
     None. This class does not return anything but modifies the model and view components through its methods.
 
-The SongController class has methods to add and load songs. When a song is added, it opens a dialog window for the user to select a song file and enter a song name. 
+The SongController class has methods to add, batch import and load songs. When a song is added, it opens a dialog window for the user to select a song file and enter a song name. 
 The song object is then built and added to the model. If no song is currently loaded, it loads the newly added song. Otherwise, it updates the song select dropdown menu.
 
+A batch import takes a multi-file selection or a folder and lists every song with a readable header, along with its stack, 
+straight away. The files are decoded on a process pool through SongImportThread while a progress dialog lets the user cancel.
+Long recordings are streamed block by block through SongStreamThread instead, and the song overview fills in as blocks arrive.
+
 When a song is loaded, it updates the loaded song and stack in the model, sets the stack frame quantity, updates the song overview plot, reloads the layer plot, 
 loads the audio into the playback controller, resets the audio playback, and reloads the song select dropdown menu.
 """
 
 from view import DialogWindow
+import os
 import re
 from PopupManager import PopupManager
+from .SongImportThread import SongImportThread
+from .SongStreamThread import SongStreamThread
+from audio import probe_audio
+from Profiler import profiled
+from LogManager import get_logger
+
+log = get_logger("song")
+
+AUDIO_FILE_EXTENSIONS = (".mp3", ".wav")
 
 
 class SongController:
@@ -27,12 +41,16 @@ class SongController:
         self.main_controller = main_controller  # Main controller reference
         self.model = main_controller.model  # Model reference
         self.view = main_controller.view  # View reference
+        self.import_thread = None
+        self.import_progress_dialog = None
+        self.pending_imports = set()  # Names of the batch import's songs whose decode hasn't finished
+        self.stream_threads = {}  # song name -> SongStreamThread
 
     def initialize(self):
         self.main_controller.audio_playback_controller.load_song(self.model.loaded_song)  # Load the song into audio playback
 
     def print(self, function_type, string):
-        print(f"[CONTROLLER][{function_type}] | {string}")
+        log.info("[CONTROLLER][%s] | %s", function_type, string)
 
     def add_song(self):
         file_path = DialogWindow.open_file("Select Song", "", "Audio Files (*.mp3 *.wav);;All Files (*)")
@@ -46,6 +64,9 @@ class SongController:
                 "Invalid song name. Please use only letters, numbers, spaces, hyphens, and underscores.",
             )
             return
+        if self.model.song.is_long_recording(file_path):
+            self.stream_song(file_path, song_name)
+            return
         self.model.song.add_new_song(file_path, song_name)
         self.main_controller.stack_controller.create_stack(song_name)
 
@@ -54,17 +75,192 @@ class SongController:
         else:
             self.main_controller.song_select_controller.refresh()
 
+    def stream_song(self, file_path, song_name):
+        song_object = self.model.song.build_streaming_song_object(file_path, song_name)
+        self.model.song.add_song_object_to_model(song_object)
+        self.main_controller.stack_controller.create_stack(song_name)
+
+        stream_thread = SongStreamThread(song_object)
+        stream_thread.block_processed.connect(song_object.waveform_plot_item.set_summary_data)
+        stream_thread.stream_finished.connect(song_object.finish_streaming)  # Queued, emitted before finished
+        stream_thread.finished.connect(lambda: self.on_stream_finished(song_name))
+        self.stream_threads[song_name] = stream_thread
+
+        if self.model.song.loaded_song == None:
+            self.load_song(song_name)
+        else:
+            self.main_controller.song_select_controller.refresh()
+        stream_thread.start()
+
+    def show_streaming_song(self, song_name):
+        # Shows the overview of a song that is still streaming, audio and layers are refreshed once it has finished
+        self.main_controller.song_overview_controller.clear_plot_waveforms()
+        self.main_controller.event_controller.clear_plot_events()
+        self.model.song.loaded_song = song_name
+        self.model.stack.loaded_stack = song_name
+        self.main_controller.song_overview_controller.show_streaming_song()
+        self.main_controller.layer_controller.set_x_axis_max_length(self.model.loaded_song.frame_qty)
+        self.main_controller.song_select_controller.refresh()
+
+    def on_stream_finished(self, song_name):
+        stream_thread = self.stream_threads.pop(song_name)
+        song_object = self.model.song.objects[song_name]
+        if stream_thread.error:
+            # Fall back to decoding the whole file, librosa.load can read formats the block reader can't
+            log.warning("[SongController][on_stream_finished] | Could not stream '%s', decoding it instead: %s", song_name, stream_thread.error)
+            song_object.streaming = False
+            song_object.native_rate = False  # Decoded songs follow the project's ingest policy again
+            song_object.build_data(song_name, song_object.path)
+        # Otherwise stream_finished has already handed the results to finish_streaming
+        self.main_controller.stack_controller.set_stack_frame_qty(song_name)  # Frame qty is exact now
+        if self.model.song.loaded_song == song_name:
+            self.load_song(song_name)
+
+    def import_songs(self):
+        file_paths = DialogWindow.open_files("Select Songs", "", "Audio Files (*.mp3 *.wav);;All Files (*)")
+        self.batch_import(file_paths)
+
+    def import_song_folder(self):
+        directory_path = DialogWindow.open_directory("Select Song Folder", "")
+        if not directory_path:
+            return
+        file_paths = [
+            os.path.join(directory_path, file_name)
+            for file_name in sorted(os.listdir(directory_path))
+            if file_name.lower().endswith(AUDIO_FILE_EXTENSIONS)
+        ]
+        self.batch_import(file_paths)
+
+    def batch_import(self, file_paths):
+        if not file_paths:
+            PopupManager.show_error("Error", "No audio files selected.")
+            return
+        if self.import_thread is not None and self.import_thread.isRunning():
+            PopupManager.show_error("Error", "An import is already running.")
+            return
+
+        songs = []
+        taken_names = set(self.model.song.objects)
+        for file_path in file_paths:
+            song_name = self.song_name_from_path(file_path, taken_names)
+            taken_names.add(song_name)
+            songs.append((song_name, file_path))
+            self.add_song_stub(file_path, song_name)
+        self.main_controller.song_select_controller.refresh()
+        self.pending_imports = {song_name for song_name, file_path in songs}
+
+        self.import_progress_dialog = DialogWindow.progress("Importing Songs", f"Decoding {len(songs)} songs...", len(songs))
+        self.import_thread = SongImportThread(songs, self.model.song.ingest_policy)
+        self.import_thread.song_decoded.connect(self.on_song_decoded)
+        self.import_thread.song_failed.connect(self.on_song_import_failed)
+        self.import_thread.progress.connect(self.on_import_progress)
+        self.import_thread.finished.connect(self.on_import_finished)
+        self.import_progress_dialog.canceled.connect(self.import_thread.cancel)
+        self.import_thread.start()
+
+    def song_name_from_path(self, file_path, taken_names):
+        # Song names follow the same rules as add_song, duplicates get a numbered suffix
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        base_name = re.sub("[^a-zA-Z0-9_ -]", "_", base_name) or "song"
+        song_name = base_name
+        counter = 2
+        while song_name in taken_names:
+            song_name = f"{base_name} {counter}"
+            counter += 1
+        return song_name
+
+    def add_song_stub(self, file_path, song_name):
+        # Songs with a readable header are listed, with their stack, before their decode has finished
+        try:
+            info = probe_audio(file_path, decode_fallback=False)
+        except Exception as e:
+            log.warning("[SongController][add_song_stub] | Could not probe '%s': %s", file_path, e)
+            return
+        if info is None:
+            return  # Added once the worker has decoded it instead
+        self.model.song.add_song_object_to_model(self.model.song.build_stub_song_object(file_path, song_name, info))
+        self.main_controller.stack_controller.create_stack(song_name)
+
+    def on_song_decoded(self, song_name, file_path):
+        # Decoded audio is already in the cache, so building the song object here is a cache hit
+        self.pending_imports.discard(song_name)
+        if song_name not in self.model.song.objects:
+            self.model.song.add_new_song(file_path, song_name)
+            self.main_controller.stack_controller.create_stack(song_name)
+        if self.model.song.loaded_song == None:
+            self.load_song(song_name)
+        else:
+            self.main_controller.song_select_controller.refresh()
+
+    def on_song_import_failed(self, song_name, error):
+        log.warning("[SongController][on_song_import_failed] | Could not import '%s': %s", song_name, error)
+        self.pending_imports.discard(song_name)
+        self.remove_imported_songs([song_name])
+
+    def on_import_progress(self, finished_qty, total_qty, song_name):
+        self.import_progress_dialog.setLabelText(f"Imported '{song_name}' ({finished_qty}/{total_qty})")
+        self.import_progress_dialog.setValue(finished_qty)
+
+    def on_import_finished(self):
+        self.import_progress_dialog.close()
+        self.import_thread = None
+        # After a cancel the songs that never got decoded are still stubs, they are not kept in the project
+        # A stub that was selected in the meantime has been decoded by load_song and stays
+        unfinished = [
+            song_name for song_name in self.pending_imports
+            if song_name in self.model.song.objects and not self.model.song.objects[song_name].materialized
+        ]
+        self.pending_imports = set()
+        if unfinished:
+            log.info("[SongController][on_import_finished] | Removing %s songs that were not imported", len(unfinished))
+            self.remove_imported_songs(unfinished)
+
+    def remove_imported_songs(self, song_names):
+        # Removes songs and their stacks, the loaded song is unloaded first and the first remaining song is loaded instead
+        unloaded = False
+        for song_name in song_names:
+            if song_name not in self.model.song.objects:
+                continue
+            if self.model.song.loaded_song == song_name:
+                self.unload_song()
+                unloaded = True
+            self.model.song.remove_song(song_name)
+            self.model.stack.remove_stack(song_name)
+        if unloaded and self.model.song.objects:
+            self.load_song(next(iter(self.model.song.objects)))
+        else:
+            self.main_controller.song_select_controller.refresh()
+
+    def unload_song(self):
+        self.main_controller.audio_playback_controller.stop()
+        self.main_controller.song_overview_controller.clear_plot_waveforms()
+        self.main_controller.event_controller.clear_plot_events()
+        self.model.song.loaded_song = None
+        self.model.stack.loaded_stack = None
+
+    @profiled("SongController.load_song")
     def load_song(self, song_name):
-        print(f"[SongController][load_plot]| song_name: {song_name}")
-        print(f"loading song {song_name}".center(100,"*"))
+        log.debug("[SongController][load_plot]| song_name: %s", song_name)
+        log.info("[SongController][load_song] | Loading song '%s'", song_name)
+        if self.model.song.objects[song_name].streaming:
+            self.show_streaming_song(song_name)
+            return
         self.main_controller.song_overview_controller.clear_plot_waveforms() # Clear existing data
         self.main_controller.event_controller.clear_plot_events()
+        self.model.song.materialize(song_name) # Decode the song the first time it is selected
+        self.main_controller.stack_controller.set_stack_frame_qty(song_name) # The decode may have corrected the header length
         self.model.song.loaded_song = song_name # Switch loaded song to new selected song
         self.model.stack.loaded_stack = song_name # Switch loaded stack to new selected song
         self.main_controller.song_overview_controller.refresh()
         self.main_controller.layer_controller.refresh()
         self.main_controller.audio_playback_controller.refresh()
         self.main_controller.song_select_controller.refresh()
+        self.prefetch_next_song()
+
+    def prefetch_next_song(self):
+        next_song_name = self.model.song.get_next_song_name(self.model.song.loaded_song)
+        if next_song_name:
+            self.model.song.prefetch(next_song_name)
 
     def add_filter_to_loaded_song(self, filter_type, filtered_data, sample_rate):
         self.model.loaded_song.add_filtered_data(filter_type, filtered_data, sample_rate)
@@ -11,8 +11,8 @@ class SongDataPreviewController:
         # self.resampled_song_data = resample(
         #     self.song_data, orig_sr=self.sample_rate, target_sr=2000
         # )
-        self.song_axis = song_object.x_axis
-        self.song_data_preview_window.open(self.song_data, self.song_axis)
+        self.song_axis, preview_data = song_object.time_axis.decimate(self.song_data)  # Only the drawn points are dense
+        self.song_data_preview_window.open(preview_data, self.song_axis)
 
         self.audio_playback_engine = AudioPlaybackEngine()
         self.audio_playback_engine.load_song(song_object)
@@ -0,0 +1,68 @@
+"""
+Module: SongImportThread
+
+This module decodes a batch of song files on a process pool without blocking the GUI. The SongImportThread class is a
+QThread that hands every file to a ProcessPoolExecutor and emits a signal as each one finishes, so the caller can
+register songs while the rest of the batch is still decoding.
+
+Arguments:
+    songs (list): A list of (song_name, file_path) tuples to import.
+    ingest_policy (IngestPolicy): The sample rates and resampler the songs are cached at.
+
+Returns:
+    None
+
+The workers write the decoded audio to the audio cache and only send the file path back, the song item itself is built
+on the GUI thread from the cache once song_decoded is received. Calling cancel stops any decode that has not started yet.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PyQt5.QtCore import (
+    pyqtSignal,
+    QThread,
+)
+from audio import audio_cache, decode_to_cache
+from LogManager import get_logger
+
+log = get_logger("song")
+
+
+class SongImportThread(QThread):
+    song_decoded = pyqtSignal(str, str)  # song name, file path
+    song_failed = pyqtSignal(str, str)  # song name, error message
+    progress = pyqtSignal(int, int, str)  # finished qty, total qty, song name
+
+    def __init__(self, songs, ingest_policy):
+        super().__init__()
+        self.songs = songs
+        self.ingest_policy = ingest_policy
+        self.cancelled = False
+        self.executor = None
+
+    def run(self):
+        finished_qty = 0
+        total_qty = len(self.songs)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as self.executor:
+            futures = {
+                self.executor.submit(decode_to_cache, file_path, audio_cache.directory, self.ingest_policy): song_name
+                for song_name, file_path in self.songs
+            }
+            for future in as_completed(futures):
+                if self.cancelled:
+                    log.info("[SongImportThread][run] | Import cancelled")
+                    return
+                song_name = futures[future]
+                try:
+                    file_path = future.result()
+                    self.song_decoded.emit(song_name, file_path)
+                except Exception as e:
+                    self.song_failed.emit(song_name, str(e))
+                finished_qty += 1
+                self.progress.emit(finished_qty, total_qty, song_name)
+
+    def cancel(self):
+        # Decodes that are already running finish, everything still queued is dropped
+        self.cancelled = True
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -17,6 +17,9 @@ This includes generating ticks for the song, initializing the playhead, painting
 
 import math
 import numpy as np
+from LogManager import get_logger
+
+log = get_logger("plot")
 
 class SongOverviewController:
     def __init__(self, main_controller):
@@ -27,17 +30,22 @@ class SongOverviewController:
     def calculate_frame_quantity(self, length_ms, fps):
         # Calculate the frame quantity and round up to the nearest whole frame
         frame_qty = math.ceil((length_ms / 1000) * fps)
-        print(f"# of frames for {(length_ms / 1000)}seconds @ {fps}fps is {frame_qty}")
+        log.debug("# of frames for %sseconds @ %sfps is %s", length_ms / 1000, fps, frame_qty)
         return frame_qty
 
     def create_frames_array(self, frame_qty):  # create tick array
-        print(f"Creating {frame_qty} frame array")
+        log.debug("Creating %s frame array", frame_qty)
         return np.arange(frame_qty)
 
     def refresh(self):
-        x_axis = self.model.loaded_song.x_axis
+        time_axis = self.model.loaded_song.time_axis
         waveform_plot_item = self.model.loaded_song.waveform_plot_item
-        self.song_overview_widget.reload_plot(x_axis, waveform_plot_item)
+        self.song_overview_widget.reload_plot(time_axis, waveform_plot_item)
+
+    def show_streaming_song(self):
+        # The waveform item of a streaming song is filled in block by block, its length comes from the file header
+        self.song_overview_widget.add_waveform_data(self.model.loaded_song.waveform_plot_item)
+        self.song_overview_widget.set_plot_x_max(self.model.loaded_song.frame_qty)
         
     def clear_plot_waveforms(self):
         if self.model.loaded_song:
@@ -50,6 +58,6 @@ class SongOverviewController:
 
     def remove_lines(self, type):
         for line in self.model.loaded_song.lines:
-            print(f"[SongOverviewController][remove_lines] (type:{type}| line type: {line.type}")
+            log.debug("[SongOverviewController][remove_lines] (type:%s| line type: %s", type, line.type)
             if line.type == type:
                 self.song_overview_widget.song_plot.removeItem(line)
\ No newline at end of file
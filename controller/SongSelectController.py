@@ -16,6 +16,12 @@ Arguments:
 Returns:
     None
 """
+
+from LogManager import get_logger
+
+log = get_logger("song")
+
+
 class SongSelectController:
     def __init__(self, main_controller):
         self.main_controller = main_controller  # Assigning main controller reference
@@ -55,5 +61,5 @@ class SongSelectController:
         if selected_song == self.model.loaded_song.name:
             return
         else:
-            print(f"[SongSelectController][on_song_selected] | Selected song: {selected_song} index: {index}")  # Printing the selected song and index
+            log.debug("[SongSelectController][on_song_selected] | Selected song: %s index: %s", selected_song, index)  # Printing the selected song and index
             self.main_controller.song_controller.load_song(selected_song)  # Loading the selected song with the song_controller
@@ -0,0 +1,46 @@
+"""
+Module: SongStreamThread
+
+This module streams a long recording into a SongItem without blocking the GUI. The SongStreamThread class is a QThread
+that runs SongItem.stream_data and emits the waveform summary decoded so far after every block, so the song overview can
+fill in while the rest of the file is still being decoded.
+
+Arguments:
+    song_object (SongItem): A song item set up with SongItem.begin_streaming.
+
+Returns:
+    None
+
+The block_processed signal carries the x positions (in frames), mins and maxs of the summary so far. stream_finished
+carries what stream_data returned (length, frame quantity, onset envelope, peaks and cache key), so they are set on the
+song by a slot on the GUI thread rather than from the worker. stream_failed is emitted with the error message if the
+file can't be streamed, the message is also kept in the error attribute.
+"""
+
+from PyQt5.QtCore import (
+    pyqtSignal,
+    QThread,
+)
+
+
+class SongStreamThread(QThread):
+    block_processed = pyqtSignal(object, object, object)  # x frames, mins, maxs
+    stream_finished = pyqtSignal(object)  # The dict returned by SongItem.stream_data
+    stream_failed = pyqtSignal(str)
+
+    def __init__(self, song_object):
+        super().__init__()
+        self.song_object = song_object
+        self.error = None
+
+    def run(self):
+        try:
+            stream_result = self.song_object.stream_data(on_block=self.emit_summary)
+        except Exception as e:
+            self.error = str(e)
+            self.stream_failed.emit(self.error)
+            return
+        self.stream_finished.emit(stream_result)
+
+    def emit_summary(self):
+        self.block_processed.emit(*self.song_object.waveform_summary.summary())
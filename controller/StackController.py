@@ -11,6 +11,12 @@ Returns:
 
 The StackController class is initialized with a reference to the main controller. It uses this reference to access the model and view components of the application. The class provides methods to create a new stack, change the selected stack, get the currently loaded stack, and set the number of frames for a stack. These methods manipulate the stack state in the model and update the view accordingly.
 """
+
+from LogManager import get_logger
+
+log = get_logger("stack")
+
+
 class StackController:
     def __init__(self, main_controller):
         # Initialize with references to main controller, model, and view
@@ -20,7 +26,7 @@ class StackController:
 
     def create_stack(self, stack_name):
         # Create a new stack with the given name
-        print(f"Creating stack {stack_name}")
+        log.debug("Creating stack %s", stack_name)
         self.model.stack.create_stack(stack_name)
         self.set_stack_frame_qty(stack_name)
 
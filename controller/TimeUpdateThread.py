@@ -21,6 +21,10 @@ from PyQt5.QtCore import (
     QThread,
 )
 import constants
+from Instrumentation import instrumentation
+from LogManager import get_logger
+
+log = get_logger("playback")
 
 
 class TimeUpdateThread(QThread):
@@ -52,6 +56,7 @@ class TimeUpdateThread(QThread):
                     time.perf_counter() - self.start_time
                 )
                 frame_number = int(adjusted_time * constants.PROJECT_FPS)
+                instrumentation.mark_emit(frame_number)
                 self.time_updated.emit(frame_number)
             time.sleep(self.time_per_frame_seconds)
 
@@ -59,7 +64,7 @@ class TimeUpdateThread(QThread):
         # This function starts the clock
         with self.condition:
             if self.state == self.STOPPED:
-                print(f"[TimeUpdateThread][start_clock] | Starting clock")
+                log.debug("[TimeUpdateThread][start_clock] | Starting clock")
                 self.start_time = time.perf_counter()
                 self.state = self.RUNNING
                 self.condition.notify_all()  # Wakes up all threads waiting on this condition
@@ -69,7 +74,7 @@ class TimeUpdateThread(QThread):
         # This function pauses the clock
         with self.condition:
             if self.state == self.RUNNING:
-                print(f"[TimeUpdateThread][pause_clock] | Pausing clock")
+                log.debug("[TimeUpdateThread][pause_clock] | Pausing clock")
                 self.paused_time = time.perf_counter()
                 current_time = time.perf_counter()
                 self.elapsed_time += (
@@ -80,7 +85,7 @@ class TimeUpdateThread(QThread):
     def resume_clock(self): # This function resumes the clock
         with self.condition: 
             if self.state == self.PAUSED:  # get the elapsed time
-                print(f"[TimeUpdateThread][resume_clock] | Resuming clock")
+                log.debug("[TimeUpdateThread][resume_clock] | Resuming clock")
                 self.start_time = time.perf_counter()
                 self.state = self.RUNNING
                 self.condition.notify_all()
@@ -142,4 +147,5 @@ class TimeUpdateThread(QThread):
             self.condition.notify_all()
             
             # Emit the time_updated signal with the new frame number
+            instrumentation.mark_emit(frame_number)
             self.time_updated.emit(frame_number)
@@ -13,3 +13,5 @@ from .TimeUpdateThread import *
 from .FilterAudioController import *
 from .SongDataPreviewController import *
 from .AudioPlaybackEngine import *
+from .SongImportThread import *
+from .SongStreamThread import *
@@ -19,11 +19,15 @@ the song and stack data respectively.
 import pickle
 from .song.SongModel import SongModel
 from .stack.StackModel import StackModel
+from .stack.SelectionModel import SelectionModel
 from .plugin import PluginModel
 import os
 from PopupManager import PopupManager
 import json
 import types
+from LogManager import get_logger
+
+log = get_logger("project")
 
 
 class MainModel:
@@ -32,6 +36,7 @@ class MainModel:
         self.save_path = None
         self.song = SongModel()  # The song model
         self.stack = StackModel()  # The stack model
+        self.selection = SelectionModel()  # The events selected on the stack plot
         self.plugin = PluginModel()
 
     def get_loaded_stack(self):
@@ -44,7 +49,7 @@ class MainModel:
         if self.song.loaded_song:
             return self.song.objects[self.song.loaded_song]
         else:
-            print(f"ERROR: No song loaded yet")  # Error message if no song is loaded
+            log.error("ERROR: No song loaded yet")  # Error message if no song is loaded
 
     @property
     def loaded_stack(self):
@@ -57,7 +62,7 @@ class MainModel:
         try:
             return self.song.objects[song_name]
         except KeyError:
-            print(f"ERROR: Song '{song_name}' not found")
+            log.error("ERROR: Song '%s' not found", song_name)
             return None
 
     def add_filtered_data(self, filter_name, filtered_data):
@@ -68,7 +73,7 @@ class MainModel:
         for song_name, song in self.song.objects.items():
             serialized_songs[song_name] = song.to_dict()
         
-        print(f"serialized songs: {serialized_songs}")
+        log.debug("serialized songs: %s", serialized_songs)
         return serialized_songs
 
     def serialize_stacks(self):
@@ -76,13 +81,9 @@ class MainModel:
         for stack_name, stack in self.stack.objects.items():
             serialized_layers = {}
             for layer_key, layer_item in stack.layers.items():
-                serialized_events = {}
-                for event_key, event in layer_item.objects.items():
-                    # Serialize each event, excluding the plot_layer_item
-                    serialized_events[event_key] = event.to_dict()
                 serialized_layers[layer_key] = {
                     "frame_qty": stack.frame_qty,
-                    "events": serialized_events,
+                    "events": layer_item.serialize(),  # Excludes the plot_data_item
                 }
             serialized_stacks[stack_name] = {
                 "loaded_stack": stack_name == self.loaded_stack,
@@ -91,12 +92,13 @@ class MainModel:
         return serialized_stacks
 
     def save(self):
-        print(f"saving loaded stack {self.stack.loaded_stack} type {type(self.loaded_stack)}")
+        log.debug("saving loaded stack %s type %s", self.stack.loaded_stack, type(self.loaded_stack))
         
         model_data = {
             "song_model": {
                 "objects": self.serialize_songs(),
                 "loaded_song": self.song.loaded_song,
+                "ingest_policy": self.song.ingest_policy.to_dict(),
             },
             "stack_model": {
                 "objects": self.serialize_stacks(),
@@ -107,7 +109,7 @@ class MainModel:
             },
         }
 
-        print(self.serialize_stacks())
+        log.debug("[MainModel][save] | stacks: %s", model_data["stack_model"]["objects"])
 
         if self.save_path:
             with open(self.save_path, "wb") as file:
@@ -120,17 +122,19 @@ class MainModel:
     def load(self, path):
         # Check if the file is empty
         if os.path.getsize(path) == 0:
-            print(f"ERROR: The file {path} is empty.")
+            log.error("ERROR: The file %s is empty.", path)
             return
 
         with open(path, "rb") as file:
             data_loaded = pickle.load(file)
+        self.song.ingest_policy.deserialize(data_loaded["song_model"].get("ingest_policy", {}))
         self.song.deserialize_songs(data_loaded["song_model"]["objects"])
         self.song.loaded_song = data_loaded["song_model"]["loaded_song"]
+        self.song.materialize(self.song.loaded_song)  # Only the loaded song is decoded up front
         # self.stack.objects = data_loaded["stack_model"]["objects"]
         self.stack.set_loaded_stack(data_loaded["stack_model"]["loaded_stack"])
         self.stack.deserialize_stack(data_loaded["stack_model"]["objects"])
 
         # self.stack.set_loaded_stack(data_loaded["stack_model"]["loaded_stack"])
         self.save_path = data_loaded["main_model"]["save_path"]
-        self.stack.generate_plot_data_items()
+        # Plot items are built when a stack is shown, see EventModel.get_plot_layer_data
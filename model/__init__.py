@@ -6,3 +6,4 @@ from .MainModel import *
 from .song.SongItem import *
 from .song.SongModel import *
 from .stack.StackModel import *
+from .stack.SelectionModel import *
@@ -3,6 +3,9 @@ import os
 from PluginInterface import PluginInterface
 import sys
 import inspect  # Add this import at the top of your file
+from LogManager import get_logger
+
+log = get_logger("plugin")
 
 class PluginModel:
     def __init__(self):
@@ -15,7 +18,7 @@ class PluginModel:
 
         for plugin in self.plugins.values():
             plugin.load(main_controller)
-            print(f"loading plugin")
+            log.info("loading plugin")
 
     def reload_plugins(self):
         self.unload_plugins()
@@ -64,4 +67,4 @@ class PluginLoader:
                                     self.plugins[item] = attribute()
                                     
                     except Exception as e:
-                        print(f"Failed to load plugin {item}: {e}")
+                        log.error("Failed to load plugin %s: %s", item, e)
@@ -1,3 +1,6 @@
+from LogManager import get_logger
+
+log = get_logger("analysis")
 class OnsetPoolModel:
     def __init__(self):
         self.items = {}
@@ -23,7 +26,7 @@ class OnsetPoolModel:
                 pool_number = 1
         if name is None:
             name = "onset_" + str(pool_number)
-            print(f"initializing with default name {name}")
+            log.debug("initializing with default name %s", name)
         key = str(pool_number)
         self.items[key] = onset_pool_item(
             name, onset_data, parent_song, parent_filter_name
@@ -1,24 +1,53 @@
+import threading
 import librosa
 import constants
-import numpy as np
 from ..pool.PoolModel import PoolModel
+from .TimeAxis import TimeAxis
 from view.WaveformPlotItem import WaveformPlotItem
 from view.LineItem import LineItem
+from audio import audio_cache, IngestPolicy, PeakPyramid, probe_audio
+from audio.AudioStream import (
+    AudioStream,
+    DurationConsumer,
+    WaveformSummaryConsumer,
+    OnsetFeatureConsumer,
+    CacheWriterConsumer,
+)
+from LogManager import get_logger
+
+log = get_logger("song")
 
 class SongItem:
     # Song Item Attributes
-    def __init__(self):
+    def __init__(self, ingest_policy=None):
         self.name = None
         self.path = None
-        self.song_data = None
+        self.song_data = None  # Read-only memmap into the audio cache
+        self.cache_key = None
+        self.cache_sample_rate = None  # The ingest sample rate cache_key belongs to
+        self.ingest_policy = ingest_policy if ingest_policy is not None else IngestPolicy()  # Shared with the SongModel
+        self.native_rate = False  # True for streamed songs, which are cached at the file's native sample rate
         self.sample_rate = None
+        self.native_sample_rate = None
+        self.channels = None
         self.length_ms = None
         self.frame_qty = None
-        self.x_axis = None
+        self.time_axis = None  # Maps sample indexes to frames without storing a position per sample
+        self.peak_pyramid = None  # Min/max peaks at several resolutions, the waveform draws from these
         self.waveform_plot_item = None
         self.pool = PoolModel()
         self.filter = {}
         self.lines = []
+        self.materialized = False  # False while the item is a stub holding only name/path/length_ms/frame_qty
+        self.data_lock = threading.Lock()  # Guards load_data against a background prefetch of the same song
+        self.streaming = False  # True while a long recording is still being decoded block by block
+        self.waveform_summary = None
+        self.onset_envelope = None
+
+    @property
+    def ingest_sample_rate(self):
+        # Derived from the project's ingest policy so a policy change reaches every song, None keeps the native rate
+        return None if self.native_rate else self.ingest_policy.analysis_sample_rate
 
     def set_name(self, name):
         self.name = name
@@ -27,29 +56,71 @@ class SongItem:
         self.path = path
 
     def load_song_data(self, path):
-        self.song_data, self.sample_rate = librosa.load(path) 
+        res_type = self.ingest_policy.resample_type
+        self.song_data, self.sample_rate = audio_cache.load(path, self.ingest_sample_rate, res_type=res_type)
+        self.cache_key = audio_cache.key(path, self.ingest_sample_rate, res_type=res_type)
+        self.cache_sample_rate = self.ingest_sample_rate
+
+    def probe(self, path, info=None):
+        # Reads length, channels and native sample rate from the file header, no decode needed
+        if info is None:
+            info = probe_audio(path)
+        self.length_ms = info.length_ms
+        self.native_sample_rate = info.sample_rate
+        self.channels = info.channels
 
     def set_length_ms(self, song_data, sample_rate):
         duration_sec = librosa.get_duration(y=song_data, sr=sample_rate)  # Get the duration of the song in seconds
         adjusted_duration_sec = duration_sec * 1000
         self.length_ms = adjusted_duration_sec
 
+    def correct_length_ms(self, sample_qty, sample_rate):
+        # Headers can be off (VBR mp3s without a length tag), the decoded sample count has the final say
+        header_frame_qty = self.frame_qty
+        self.length_ms = sample_qty / sample_rate * 1000
+        self.set_frame_qty(self.length_ms)
+        if header_frame_qty is not None and header_frame_qty != self.frame_qty:
+            log.info("[SongItem][correct_length_ms] | Header of '%s' was off, %s -> %s frames", self.name, header_frame_qty, self.frame_qty)
+
     def set_frame_qty(self, length_ms):
         self.frame_qty = round(length_ms / 1000 * constants.PROJECT_FPS)  # Calculate the quantity of frames
 
-    def generate_x_axis(self, song_data, sample_rate):
-        # Generate x axis items for the song
-        samples_per_frame = sample_rate / constants.PROJECT_FPS
-        self.x_axis = np.arange(len(song_data)) / samples_per_frame
+    def generate_time_axis(self, song_data, sample_rate):
+        self.time_axis = TimeAxis(sample_rate, len(song_data))
+
+    def generate_peak_pyramid(self, song_data, sample_rate):
+        self.peak_pyramid = PeakPyramid.from_samples(song_data, sample_rate)
+        audio_cache.write_peaks(self.cache_key, self.peak_pyramid, self.path)
+
+    def load_cached_peaks(self):
+        # Reads the peaks sidecar saved the last time this song was decoded, returns False if it is missing or stale
+        # Called with data_lock held, the prefetch thread and materialize both end up here
+        if self.cache_key is None:
+            return False
+        peak_pyramid = audio_cache.read_peaks(self.cache_key, self.path)
+        if peak_pyramid is None:
+            return False
+        self.peak_pyramid = peak_pyramid
+        if self.time_axis is None:
+            self.sample_rate = peak_pyramid.sample_rate
+            self.time_axis = TimeAxis(peak_pyramid.sample_rate, peak_pyramid.sample_qty)
+        return True
     
-    def build_data(self, song_name, path):
+    def build_stub(self, song_name, path, info=None):
+        # A song item that knows its length from the header only, song data is loaded by materialize
         self.set_name(song_name)
         self.set_path(path)
+        self.probe(path, info)
+        self.set_frame_qty(self.length_ms)
+
+    def build_data(self, song_name, path):
+        self.build_stub(song_name, path)
         self.load_song_data(path)  # Load the song data and sample rate
-        self.set_length_ms(self.song_data, self.sample_rate)  # Calculate the length of the song in milliseconds
-        self.set_frame_qty(self.length_ms)  # Calculate the quantity of frames
-        self.generate_x_axis(self.song_data, self.sample_rate)
-        self.generate_waveform_plot_item(self.x_axis, self.song_data)
+        self.correct_length_ms(len(self.song_data), self.sample_rate)
+        self.generate_time_axis(self.song_data, self.sample_rate)
+        self.generate_peak_pyramid(self.song_data, self.sample_rate)
+        self.generate_waveform_plot_item(self.peak_pyramid)
+        self.materialized = True
 
     def to_dict(self):
         return {
@@ -57,6 +128,11 @@ class SongItem:
             "path": self.path,
             "length_ms": self.length_ms,
             "frame_qty": self.frame_qty,
+            "native_sample_rate": self.native_sample_rate,
+            "channels": self.channels,
+            "native_rate": self.native_rate,
+            "cache_sample_rate": self.cache_sample_rate,  # The ingest rate cache_key was made for
+            "cache_key": self.cache_key,  # Finds the peaks sidecar on the next open without hashing the file
             # Exclude waveform_plot_item from serialization
         }
 
@@ -65,21 +141,116 @@ class SongItem:
         self.path = data.get("path")
         self.length_ms = data.get("length_ms", 0)
         self.frame_qty = data.get("frame_qty", 0)
-        print(f"name: {self.name}, path: {self.path}, ")
-        # Reload song data based on path
-        self.load_song_data(self.path)
-        self.generate_x_axis(self.song_data, self.sample_rate)
-        self.generate_waveform_plot_item(self.x_axis, self.song_data)
+        self.native_sample_rate = data.get("native_sample_rate")
+        self.channels = data.get("channels")
+        # Projects saved before native_rate existed stored a None ingest rate for streamed songs
+        cache_sample_rate = data.get("cache_sample_rate", data.get("ingest_sample_rate", self.ingest_policy.analysis_sample_rate))
+        self.native_rate = data.get("native_rate", cache_sample_rate is None)
+        if cache_sample_rate == self.ingest_sample_rate:
+            self.cache_key = data.get("cache_key")
+            self.cache_sample_rate = cache_sample_rate
+        # Otherwise the project's ingest policy has changed since the save, the song is cached again at the new rate on materialize
+        log.debug("name: %s, path: %s, ", self.name, self.path)
+        # Song data is not loaded here, the item stays a stub until materialize is called
+
+    def load_data(self):
+        # Loads the song data, time axis and peaks, safe to call from a background thread
+        with self.data_lock:
+            if self.song_data is None:
+                self.load_song_data(self.path)
+                self.generate_time_axis(self.song_data, self.sample_rate)
+            if self.peak_pyramid is None and not self.load_cached_peaks():
+                self.generate_peak_pyramid(self.song_data, self.sample_rate)  # Only when the sidecar is missing or stale
+
+    def get_song_data(self):
+        # Song data is loaded lazily when the overview was drawn from the peaks sidecar
+        self.load_data()
+        return self.song_data, self.sample_rate
+
+    def materialize(self):
+        # Turns a stub into a full song item, the waveform plot item has to be built on the GUI thread
+        if self.materialized:
+            return
+        log.info("[SongItem][materialize] | Materializing song '%s'", self.name)
+        with self.data_lock:
+            has_peaks = self.peak_pyramid is not None or self.load_cached_peaks()
+        if not has_peaks:
+            self.load_data()
+        # Song data stays on disk until something asks for it when the peaks came from the sidecar
+        self.correct_length_ms(self.peak_pyramid.sample_qty, self.peak_pyramid.sample_rate)
+        self.generate_waveform_plot_item(self.peak_pyramid)
+        self.materialized = True
     
-    def generate_waveform_plot_item(self, x_axis, song_data):
-        print(f"[SongItem][generate_waveform_plot_item] | Generating waveform plot item")
+    def begin_streaming(self, song_name, path):
+        # Sets up a long recording to be streamed, length comes from the file header until the stream has finished
+        self.set_name(song_name)
+        self.set_path(path)
+        self.native_rate = True  # Streamed songs are cached at their native sample rate
+        self.streaming = True
+        self.probe(path)
+        self.set_frame_qty(self.length_ms)
+        self.waveform_summary = WaveformSummaryConsumer()
         self.waveform_plot_item = WaveformPlotItem()
-        self.waveform_plot_item.set_waveform_data(x_axis, song_data)
+
+    def stream_data(self, on_block=None):
+        # Decodes the song block by block, runs on a background thread
+        # The GUI thread reads the song while it streams, so the results are returned for finish_streaming to set
+        duration = DurationConsumer()
+        onset = OnsetFeatureConsumer()
+        writer = CacheWriterConsumer(self.path)
+        AudioStream(self.path).run([duration, self.waveform_summary, onset, writer], on_block)
+        # Build the peaks on top of the streamed summary so the whole file isn't read a second time
+        _, mins, maxs = self.waveform_summary.summary()
+        peak_pyramid = PeakPyramid.from_peaks(
+            mins, maxs, self.waveform_summary.bucket_size, duration.sample_rate, duration.sample_qty
+        )
+        audio_cache.write_peaks(writer.key, peak_pyramid, self.path)
+        return {
+            "length_ms": duration.length_ms,
+            "frame_qty": duration.frame_qty,
+            "onset_envelope": onset.onset_envelope,
+            "peak_pyramid": peak_pyramid,
+            "cache_key": writer.key,
+        }
+
+    def finish_streaming(self, stream_result):
+        # Called on the GUI thread with what stream_data returned, the decoded audio is now a cache hit
+        self.length_ms = stream_result["length_ms"]
+        self.frame_qty = stream_result["frame_qty"]
+        self.onset_envelope = stream_result["onset_envelope"]
+        self.peak_pyramid = stream_result["peak_pyramid"]
+        self.cache_key = stream_result["cache_key"]
+        self.cache_sample_rate = None  # Streamed audio is cached at its native rate
+        self.load_data()
+        self.waveform_plot_item.set_peak_pyramid(self.peak_pyramid)
+        self.streaming = False
+        self.materialized = True
+
+    def generate_waveform_plot_item(self, peak_pyramid):
+        log.debug("[SongItem][generate_waveform_plot_item] | Generating waveform plot item")
+        self.waveform_plot_item = WaveformPlotItem()
+        self.waveform_plot_item.set_peak_pyramid(peak_pyramid)
 
     def get_original_song_data(self, path):
-        song_data, sample_rate = librosa.load(path)
+        song_data, sample_rate = audio_cache.load(path, self.ingest_sample_rate, res_type=self.ingest_policy.resample_type)
         return song_data, sample_rate
 
+    def get_playback_path(self):
+        # Streamed songs are kept at their native rate, the source file is played as is
+        if self.ingest_sample_rate is None:
+            return self.path
+        if self.cache_key is None:
+            self.cache_key = audio_cache.key(self.path, self.ingest_sample_rate, res_type=self.ingest_policy.resample_type)
+            self.cache_sample_rate = self.ingest_sample_rate
+        # cache_key was either checked against the source file by the peaks sidecar or hashed from it, so it is current
+        return audio_cache.playback_path(
+            self.path, self.cache_key, self.ingest_policy.playback_sample_rate, self.ingest_policy.resample_type
+        )
+
+    def get_filter_playback_path(self, filter_name):
+        filter_item = self.filter[filter_name]
+        return audio_cache.wav_path(filter_item.cache_key, filter_item.filtered_data, self.sample_rate)
+
     def add_line(self, frame_number, color=None, type=None):
         line = LineItem()
         line.set_frame_number(frame_number)
@@ -92,8 +263,11 @@ class SongItem:
         pass
 
     def add_filtered_data(self, filter_name, filtered_data):
-        self.filter[filter_name] = FilterItem(filtered_data)
-        print(f"Adding FilterItem {filter_name} ")
+        # Back the filtered data with the cache as well so it is paged in only when previewed or played
+        filter_key = audio_cache.derived_key(self.cache_key, f"filter|{filter_name}")
+        filtered_data = audio_cache.store_array(filter_key, filtered_data)
+        self.filter[filter_name] = FilterItem(filtered_data, filter_key)
+        log.debug("Adding FilterItem %s ", filter_name)
 
     @property
     def filtered_song_data(self, filter_type):
@@ -102,5 +276,6 @@ class SongItem:
 
 
 class FilterItem:
-    def __init__(self, filtered_data):
+    def __init__(self, filtered_data, cache_key=None):
         self.filtered_data = filtered_data
+        self.cache_key = cache_key
@@ -10,6 +10,7 @@ Arguments:
 
 Returns: 
     build_song_object: Returns a SongItem object.
+    summary: Returns the length and format of every song, read from the file headers rather than decoded data.
     add_song_object_to_model: No return value. Adds the SongItem object to the dictionary of song objects.
 
 The SongModel class is initialized with a class type of "MODEL", an empty dictionary to store song objects, and a None value for the loaded song.
@@ -17,8 +18,14 @@ The build_song_object method takes a file path and song name, creates a SongItem
 The add_song_object_to_model method takes a SongItem object and adds it to the dictionary of song objects, using the song name as the key.
 """
 
+import threading
+import constants
 from .SongItem import SongItem
+from audio import IngestPolicy, probe_audio
 from pyqtgraph import InfiniteLine, mkPen  # For customizing plots
+from LogManager import get_logger
+
+log = get_logger("song")
 
 class SongModel:
     # Manage Song Item Instances
@@ -26,27 +33,90 @@ class SongModel:
         self.objects = {}  # Dictionary to store song objects
         self.loaded_song = None  # The loaded song
         self.playhead = InfiniteLine(angle=90, movable=True, pen=mkPen(color="w", width=2))
+        self.prefetch_thread = None
+        self.ingest_policy = IngestPolicy()  # Project wide sample rates and resampler, shared by every song item
 
     def deserialize_songs(self, song_data):
+        # Songs come back as stubs, only the songs that get displayed are materialized
         for song_name, song in song_data.items():
-            self.objects[song_name] = SongItem()
+            self.objects[song_name] = SongItem(self.ingest_policy)
             self.objects[song_name].deserialize(song)
 
+    def materialize(self, song_name):
+        if song_name in self.objects:
+            self.objects[song_name].materialize()
+
+    def prefetch(self, song_name):
+        # Warm a song's data on a background thread so selecting it later doesn't wait on the decode
+        if song_name not in self.objects or self.objects[song_name].materialized:
+            return
+        log.debug("[SongModel][prefetch] | Prefetching song '%s'", song_name)
+        self.prefetch_thread = threading.Thread(target=self.objects[song_name].load_data, daemon=True)
+        self.prefetch_thread.start()
+
+    def get_next_song_name(self, song_name):
+        # Returns the song after song_name in set list order, wrapping around to the first song
+        song_names = list(self.objects.keys())
+        if song_name not in song_names or len(song_names) < 2:
+            return None
+        return song_names[(song_names.index(song_name) + 1) % len(song_names)]
+
     # Method to take a file path and name and ingest the rest of the song item data
-    @staticmethod
-    def build_song_object(file_path, song_name):
-        song_object = SongItem()  # Create a song object
+    def build_song_object(self, file_path, song_name):
+        song_object = SongItem(self.ingest_policy)  # Create a song object
         song_object.build_data(song_name, file_path)
 
         return song_object
     
+    def build_stub_song_object(self, file_path, song_name, info=None):
+        song_object = SongItem(self.ingest_policy)  # Create a song object from the file header, decoded on first selection
+        song_object.build_stub(song_name, file_path, info)
+        return song_object
+
+    def build_streaming_song_object(self, file_path, song_name):
+        song_object = SongItem(self.ingest_policy)  # Create a song object that is filled in by SongItem.stream_data
+        song_object.begin_streaming(song_name, file_path)
+        return song_object
+
+    @staticmethod
+    def is_long_recording(file_path):
+        # Long recordings are streamed block by block rather than decoded into one array
+        try:
+            return probe_audio(file_path).duration_sec > constants.STREAMING_THRESHOLD_SECONDS
+        except Exception as e:
+            log.warning("[SongModel][is_long_recording] | Could not read duration of '%s': %s", file_path, e)
+            return False
+
     def add_new_song(self, file_path, song_name):
         song_object = self.build_song_object(file_path, song_name)
         self.add_song_object_to_model(song_object)
 
+    def remove_song(self, song_name):
+        self.objects.pop(song_name, None)
+        if self.loaded_song == song_name:
+            self.loaded_song = None
+
+    def summary(self):
+        # Length and format of every song in the project, none of it needs a decode
+        songs = {
+            song_name: {
+                "length_ms": song.length_ms,
+                "frame_qty": song.frame_qty,
+                "native_sample_rate": song.native_sample_rate,
+                "channels": song.channels,
+            }
+            for song_name, song in self.objects.items()
+        }
+        return {
+            "song_qty": len(songs),
+            "length_ms": sum(song["length_ms"] or 0 for song in songs.values()),
+            "frame_qty": sum(song["frame_qty"] or 0 for song in songs.values()),
+            "songs": songs,
+        }
+
     # Method to add song object to song dict
     def add_song_object_to_model(self, song_object):
         self.objects[song_object.name] = (
             song_object  # Add the song object to the dictionary
         )
-        print(f"Added song '{song_object.name}' to model")
+        log.info("Added song '%s' to model", song_object.name)
@@ -0,0 +1,66 @@
+"""
+Module: TimeAxis
+
+This module defines the TimeAxis class, a lightweight stand in for a per sample array of frame positions. The mapping
+from a sample index to a project frame is linear, so it is described by the sample rate, the project FPS and the number
+of samples, and positions are worked out only when they are asked for.
+
+Arguments:
+    sample_rate (int): The sample rate of the song data the axis describes.
+    sample_qty (int): The number of samples in the song data.
+    fps (int): The project frame rate, defaults to constants.PROJECT_FPS.
+
+Returns:
+    frame_at: Returns the frame position of a sample index, or of an array of them.
+    sample_at: Returns the sample index closest to a frame position.
+    decimate: Returns (x, y) arrays holding only the points that are actually drawn.
+
+Indexing and len behave like the old dense x axis array, so time_axis[-1] is still the frame position of the last sample.
+"""
+
+import numpy as np
+
+import constants
+
+
+class TimeAxis:
+    def __init__(self, sample_rate, sample_qty, fps=constants.PROJECT_FPS):
+        self.sample_rate = sample_rate
+        self.sample_qty = sample_qty
+        self.fps = fps
+        self.samples_per_frame = sample_rate / fps
+
+    def __len__(self):
+        return self.sample_qty
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.frame_at(np.arange(*index.indices(self.sample_qty)))  # Only the sliced range is made dense
+        if index < 0:
+            index += self.sample_qty
+        if not 0 <= index < self.sample_qty:
+            raise IndexError(f"Sample index {index} is out of range for an axis of {self.sample_qty} samples")
+        return self.frame_at(index)
+
+    @property
+    def last_frame(self):
+        return self.frame_at(max(self.sample_qty - 1, 0))
+
+    def frame_at(self, sample_index):
+        return sample_index / self.samples_per_frame
+
+    def sample_at(self, frame):
+        return int(min(max(round(frame * self.samples_per_frame), 0), max(self.sample_qty - 1, 0)))
+
+    def decimate(self, song_data, resolution=constants.SONG_PLOT_RESOLUTION):
+        # Linearly interpolates song_data at evenly spaced positions, resolution is the percent of samples kept
+        point_qty = int(len(song_data) * resolution / 100)
+        if point_qty < 2 or self.sample_qty < 2:
+            return np.zeros(0), np.zeros(0)
+        sample_positions = np.linspace(0, self.sample_qty - 1, point_qty)
+        lower = np.floor(sample_positions).astype(np.int64)
+        upper = np.minimum(lower + 1, self.sample_qty - 1)
+        weight = sample_positions - lower
+        song_data = np.asarray(song_data)
+        y = song_data[lower] * (1 - weight) + song_data[upper] * weight
+        return self.frame_at(sample_positions), y
@@ -1,2 +1,3 @@
 from .SongItem import *
 from .SongModel import *
+from .TimeAxis import *
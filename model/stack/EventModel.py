@@ -1,87 +1,405 @@
 """
 Module: EventModel
 
-This module defines the EventModel class which represents an event in the application.
-Each event has a name and an associated dictionary of event objects, and a plot data item.
+This module defines the EventModel class which represents a layer of events in the application.
+The events of a layer are stored column by column in numpy arrays rather than as one Python object per event:
+    - frames: The frame number of every event, kept sorted.
+    - color_ids: An index into colors, the layer's interned list of RGB tuples.
+    - name_ids: An index into names, the layer's interned list of event names.
+    - attributes: Optional per event columns, keyed by attribute name, created the first time an attribute is set.
 
 Arguments:
-    - name: The name of the event
+    - name: The name of the layer
 
 Returns:
-    - An instance of EventModel with the given name, an empty dictionary for storing event objects, and a None value for plot data item.
+    - An instance of EventModel with empty columns, a read-only objects mapping and a None value for plot data item.
 
-The EventModel class provides a method to add event items to its dictionary of objects. Each event item is an instance of the EventItem class.
+objects maps frame numbers to EventItem handles so existing code can keep looking events up by frame, while whole layer
+operations (shift, shift_events, move_events, recolor, delete_range, serialize) work on the columns directly.
+Because frames is always sorted it doubles as the layer's time index: frames_in_range, next_event_frame and
+previous_event_frame are binary searches, so they stay O(log n) however many events the layer holds.
+All events of a layer are drawn by one LayerPlotItem, which is redrawn from the columns by refresh_plot_data_item after every edit.
 """
 
-from .EventItem import EventItem
-from pprint import pprint
+from collections.abc import Mapping
+
+import numpy as np
+
+from .EventItem import EventItem, parse_color
+from view.LayerPlotItem import LayerPlotItem
+from LogManager import get_logger
+
+log = get_logger("event")
+
+DEFAULT_EVENT_NAME = "Default"
+DEFAULT_EVENT_COLOR = (255, 255, 255)
 
 
 class EventModel:
     def __init__(self):
-        self.objects = {}  # Dictionary to store event objects
+        self.frames = np.zeros(0, dtype=np.int64)  # Sorted frame numbers, one entry per event
+        self.color_ids = np.zeros(0, dtype=np.int32)  # Index into self.colors
+        self.name_ids = np.zeros(0, dtype=np.int32)  # Index into self.names
+        self.colors = []  # Interned RGB tuples
+        self.names = []  # Interned event names
+        self.color_lookup = {}  # RGB tuple -> color id
+        self.name_lookup = {}  # Name -> name id
+        self.attributes = {}  # Attribute name -> object array lined up with frames
+        self.objects = EventObjects(self)  # Frame number -> EventItem, read only
         self.layer_name = None
         self.layer_number = None
+        self.plot_data_item = None  # One LayerPlotItem draws every event of the layer
+
+    def intern_color(self, color):
+        if color not in self.color_lookup:
+            self.color_lookup[color] = len(self.colors)
+            self.colors.append(color)
+        return self.color_lookup[color]
+
+    def intern_name(self, name):
+        if name not in self.name_lookup:
+            self.name_lookup[name] = len(self.names)
+            self.names.append(name)
+        return self.name_lookup[name]
+
+    def index_of(self, frame_number):
+        index = int(np.searchsorted(self.frames, frame_number))
+        if index < len(self.frames) and self.frames[index] == frame_number:
+            return index
+        return None
+
+    def require_index(self, frame_number):
+        # index_of for the per event accessors, indexing a column with None would broadcast over every row of the layer
+        index = self.index_of(frame_number)
+        if index is None:
+            raise KeyError(frame_number)
+        return index
+
+    def range_indexes(self, start_frame, end_frame):
+        # Index range of the events with start_frame <= frame < end_frame
+        start, end = np.searchsorted(self.frames, [start_frame, end_frame])
+        return int(start), int(end)
+
+    def frames_in_range(self, start_frame, end_frame):
+        start, end = self.range_indexes(start_frame, end_frame)
+        return self.frames[start:end]
+
+    def next_event_frame(self, frame_number):
+        # Frame of the first event after frame_number, or None
+        index = int(np.searchsorted(self.frames, frame_number, side="right"))
+        return int(self.frames[index]) if index < len(self.frames) else None
+
+    def previous_event_frame(self, frame_number):
+        # Frame of the last event before frame_number, or None
+        index = int(np.searchsorted(self.frames, frame_number, side="left")) - 1
+        return int(self.frames[index]) if index >= 0 else None
 
     def get_event(self, frame_number):
         if frame_number in self.objects:
             return self.objects[frame_number]
         else:
-            print(f"[EventModel][get_event] | could not locate event at frame '{frame_number}'")
-        
+            log.warning("[EventModel][get_event] | could not locate event at frame '%s'", frame_number)
+
+    def get_name(self, frame_number):
+        return self.names[self.name_ids[self.require_index(frame_number)]]
+
+    def set_name(self, frame_number, name):
+        index = self.require_index(frame_number)  # Before interning, so a missing frame leaves the names untouched
+        self.name_ids[index] = self.intern_name(name)
+
+    def get_color(self, frame_number):
+        return self.colors[self.color_ids[self.require_index(frame_number)]]
+
+    def set_color(self, frame_number, color):
+        index = self.require_index(frame_number)
+        self.color_ids[index] = self.intern_color(color)
+
+    def get_attribute(self, frame_number, attribute_name, default=None):
+        index = self.require_index(frame_number)
+        if attribute_name not in self.attributes:
+            return default
+        return self.attributes[attribute_name][index]
+
+    def set_attribute(self, frame_number, attribute_name, value):
+        index = self.require_index(frame_number)
+        if attribute_name not in self.attributes:
+            self.attributes[attribute_name] = np.full(len(self.frames), None, dtype=object)
+        self.attributes[attribute_name][index] = value
+
     def nudge_event(self, original_frame, amount):
-        event = self.objects[original_frame]
-        new_frame = original_frame + amount
-        self.delete(original_frame)
-        self.add(new_frame)
-        event.frame_number = new_frame
-        event.plot_data_item.frame_num = new_frame
-        event.plot_data_item.nudge_x_position(amount)
-        self.objects[new_frame] = event
-        
+        self.move_event(original_frame, original_frame + amount)
+
+    def shift_events(self, frames, amount, collision="reject"):
+        # Shifts the events on frames by amount in one update, see move_events for the collision policies
+        frames = np.asarray(frames, dtype=np.int64)
+        return self.move_events(frames, frames + amount, collision)
+
+    def shift_range(self, start_frame, end_frame, amount, collision="reject"):
+        # Shifts every event with start_frame <= frame < end_frame by amount
+        return self.shift_events(self.frames_in_range(start_frame, end_frame), amount, collision)
+
+    def move_event(self, original_frame, new_frame):
+        # Moves an event to a new frame, an event already on the new frame is replaced
+        if new_frame < 0:
+            log.warning("[EventModel][move_event] | Frame %s is before the start of the song, move rejected", new_frame)
+            return
+        index = self.index_of(original_frame)
+        if index is None:
+            log.warning("[EventModel][move_event] | No event found at frame '%s'", original_frame)
+            return
+        color_id = self.color_ids[index]
+        name_id = self.name_ids[index]
+        attributes = {attribute_name: column[index] for attribute_name, column in self.attributes.items()}
+        self.remove_rows([index])
+        target_index = self.index_of(new_frame)
+        if target_index is None:
+            target_index = self.insert_row(new_frame, color_id, name_id)
+        else:
+            self.color_ids[target_index] = color_id
+            self.name_ids[target_index] = name_id
+        for attribute_name, value in attributes.items():
+            self.attributes[attribute_name][target_index] = value
+        self.refresh_plot_data_item()
+
+    def move_collisions(self, frames, new_frames):
+        # Mask over new_frames of the moves that land on an event that isn't moving, or on another moved event
+        frames = np.asarray(frames, dtype=np.int64)
+        new_frames = np.asarray(new_frames, dtype=np.int64)
+        staying_frames = self.frames[~np.isin(self.frames, frames)]
+        collisions = np.isin(new_frames, staying_frames)
+        unique_frames, counts = np.unique(new_frames, return_counts=True)
+        collisions |= np.isin(new_frames, unique_frames[counts > 1])
+        return collisions
+
+    def move_events(self, frames, new_frames, collision="reject"):
+        # Moves the events on frames to new_frames in one update, collision decides what happens to moves that land on
+        # an occupied frame: "reject" cancels the whole move, "merge" keeps the event already there and drops the moved
+        # one, "overwrite" replaces the event already there. Returns the frames the moved events ended up on, or None
+        # A move before frame 0 cancels the whole move under every policy
+        frames = np.asarray(frames, dtype=np.int64)
+        new_frames = np.asarray(new_frames, dtype=np.int64)
+        indexes = np.searchsorted(self.frames, frames)
+        found = indexes < len(self.frames)
+        found[found] = self.frames[indexes[found]] == frames[found]
+        indexes, new_frames = indexes[found], new_frames[found]
+        if (new_frames < 0).any():
+            log.warning("[EventModel][move_events] | %s events would move before the start of the song, move rejected", int((new_frames < 0).sum()))
+            return None
+        collisions = self.move_collisions(self.frames[indexes], new_frames)
+        if collisions.any() and collision == "reject":
+            log.warning("[EventModel][move_events] | %s events would land on occupied frames, move rejected", int(collisions.sum()))
+            return None
+
+        moving = np.zeros(len(self.frames), dtype=bool)
+        moving[indexes] = True
+        if collision == "overwrite":
+            moving |= np.isin(self.frames, new_frames)  # Events under the moved ones are dropped with them
+            _, keep = np.unique(new_frames[::-1], return_index=True)  # Of moved events sharing a frame the last one wins
+            keep = len(new_frames) - 1 - keep
+        else:
+            # Moved events sharing a frame merge into the first of them, and into an event already on that frame
+            _, first = np.unique(new_frames, return_index=True)
+            keep = first[~np.isin(new_frames[first], self.frames[~moving])]
+
+        staying = ~moving
+        order_frames = np.concatenate((self.frames[staying], new_frames[keep]))
+        order = np.argsort(order_frames, kind="stable")
+        self.frames = order_frames[order]
+        self.color_ids = np.concatenate((self.color_ids[staying], self.color_ids[indexes][keep]))[order]
+        self.name_ids = np.concatenate((self.name_ids[staying], self.name_ids[indexes][keep]))[order]
+        for attribute_name, column in self.attributes.items():
+            self.attributes[attribute_name] = np.concatenate((column[staying], column[indexes][keep]))[order]
+        self.refresh_plot_data_item()
+        return new_frames[keep]
+
     def set_layer_name(self, layer_name):
         self.layer_name = layer_name
+        if self.plot_data_item is not None:
+            self.plot_data_item.set_layer(self.layer_name, self.layer_number)
 
     def set_layer_number(self, number):
-        print(f"[EventModel][set_layer_number] | Setting layer number to {number}")
+        log.debug("[EventModel][set_layer_number] | Setting layer number to %s", number)
         self.layer_number = number
+        if self.plot_data_item is not None:
+            self.plot_data_item.set_layer(self.layer_name, self.layer_number)
+            self.refresh_plot_data_item()
 
     def delete(self, frame_number):
-        if frame_number in self.objects:
-            del self.objects[frame_number]
-            print(f"[EventModel][delete] | Frame number {frame_number} deleted from event objects.")
+        index = self.index_of(frame_number)
+        if index is not None:
+            self.remove_rows([index])
+            self.refresh_plot_data_item()
+            log.debug("[EventModel][delete] | Frame number %s deleted from event objects.", frame_number)
         else:
-            print(f"[EventModel][delete] | No event object found for frame number {frame_number}. for delete")
+            log.warning("[EventModel][delete] | No event object found for frame number %s. for delete", frame_number)
 
     def add(self, frame_number, color=None, name=None, type="event"):
         if type=="event":
-            if frame_number in self.objects and not None:
-                print(f"[EventModel][add] | Data already exists for frame number '{frame_number}', frame not added")
+            if not isinstance(frame_number, (int, np.integer)):
+                raise ValueError(f"Frame number must be an integer, not {frame_number.__class__}, ")
+            if frame_number in self.objects:
+                log.debug("[EventModel][add] | Data already exists for frame number '%s', frame not added", frame_number)
                 return
-            event = EventItem()
-            event.set_parent_layer_name(self.layer_name)
-            event.set_parent_layer_number(self.layer_number)
-            event.set_frame_number(frame_number)
-            if color:
-                event.set_color(color)
-            if name:
-                event.set_name(name)
-
-            self.objects[frame_number] = event  # Add an event item to the dictionary
-            print(f"[EventModel][add] | Adding EventItem instance at frame '{frame_number}'")
-
-    def update_data(self, frame_number, data):
-        if frame_number not in self.objects:
-            print(f"no frame exists at frame: {frame_number}")
+            color_id = self.intern_color(parse_color(color) if color else DEFAULT_EVENT_COLOR)
+            name_id = self.intern_name(name if name else DEFAULT_EVENT_NAME)
+            self.insert_row(int(frame_number), color_id, name_id)
+            self.refresh_plot_data_item()
+            log.debug("[EventModel][add] | Adding event at frame '%s'", frame_number)
+
+    def add_events(self, frames, colors=None, names=None):
+        # Adds many events at once, colors and names are either one value for every event or one per frame
+        # Frames that already hold an event, or repeat within frames, are skipped the same way add skips them
+        frames = np.asarray(frames, dtype=np.int64)
+        requested_qty = len(frames)
+        color_ids = self.intern_column(colors, len(frames), self.intern_color, parse_color, DEFAULT_EVENT_COLOR)
+        name_ids = self.intern_column(names, len(frames), self.intern_name, lambda name: name, DEFAULT_EVENT_NAME)
+        frames, first = np.unique(frames, return_index=True)  # Sorted, first occurrence of each frame wins
+        color_ids = color_ids[first]
+        name_ids = name_ids[first]
+        new = ~np.isin(frames, self.frames, assume_unique=True)
+        frames, color_ids, name_ids = frames[new], color_ids[new], name_ids[new]
+        if len(frames):
+            positions = np.searchsorted(self.frames, frames)
+            self.frames = np.insert(self.frames, positions, frames)
+            self.color_ids = np.insert(self.color_ids, positions, color_ids)
+            self.name_ids = np.insert(self.name_ids, positions, name_ids)
+            for attribute_name, column in self.attributes.items():
+                self.attributes[attribute_name] = np.insert(column, positions, None)
+            self.refresh_plot_data_item()
+        log.debug("[EventModel][add_events] | Added %s events, skipped %s", len(frames), requested_qty - len(frames))
+        return frames
+
+    def intern_column(self, values, qty, intern, convert, default):
+        # Turns one value or a sequence of values into an id column, interning each distinct value once
+        if values is None or isinstance(values, (str, tuple)):
+            value_id = intern(convert(values) if values else default)
+            return np.full(qty, value_id, dtype=np.int32)
+        ids = {}
+        for value in values:
+            if value not in ids:
+                ids[value] = intern(convert(value) if value else default)
+        return np.array([ids[value] for value in values], dtype=np.int32)
+
+    def insert_row(self, frame_number, color_id, name_id):
+        index = int(np.searchsorted(self.frames, frame_number))
+        self.frames = np.insert(self.frames, index, frame_number)
+        self.color_ids = np.insert(self.color_ids, index, color_id)
+        self.name_ids = np.insert(self.name_ids, index, name_id)
+        for attribute_name, column in self.attributes.items():
+            self.attributes[attribute_name] = np.insert(column, index, None)
+        return index
+
+    def remove_rows(self, indexes):
+        self.frames = np.delete(self.frames, indexes)
+        self.color_ids = np.delete(self.color_ids, indexes)
+        self.name_ids = np.delete(self.name_ids, indexes)
+        for attribute_name, column in self.attributes.items():
+            self.attributes[attribute_name] = np.delete(column, indexes)
+
+    def keep_rows(self, mask):
+        self.frames = self.frames[mask]
+        self.color_ids = self.color_ids[mask]
+        self.name_ids = self.name_ids[mask]
+        for attribute_name, column in self.attributes.items():
+            self.attributes[attribute_name] = column[mask]
+
+    def shift(self, amount):
+        # Every event keeps its order, so the frames stay sorted
+        if len(self.frames) and self.frames[0] + amount < 0:
+            log.warning("[EventModel][shift] | Shifting by %s would move events before the start of the song, shift rejected", amount)
             return
-        self.objects[frame_number] = data
-        self.objects[frame_number].frame_number = frame_number
-        print(f"attempting to update frame {frame_number} data")
+        self.frames = self.frames + amount
+        self.refresh_plot_data_item()
+
+    def recolor(self, color):
+        self.color_ids[:] = self.intern_color(parse_color(color))
+        self.refresh_plot_data_item()
+
+    def delete_range(self, start_frame, end_frame):
+        # Deletes every event with start_frame <= frame < end_frame
+        start, end = self.range_indexes(start_frame, end_frame)
+        self.remove_rows(np.arange(start, end))
+        self.refresh_plot_data_item()
+
+    def serialize(self):
+        color_strings = [str(color) for color in self.colors]
+        serialized_events = {
+            frame_number: {
+                "frame_number": frame_number,
+                "parent_layer_name": self.layer_name,
+                "parent_layer_number": self.layer_number,
+                "name": self.names[name_id],
+                "color": color_strings[color_id],
+            }
+            for frame_number, color_id, name_id in zip(
+                self.frames.tolist(), self.color_ids.tolist(), self.name_ids.tolist()
+            )
+        }
+        # Only the attributes an event actually has are written, events without any have no "attributes" entry
+        for attribute_name, column in self.attributes.items():
+            for frame_number, value in zip(self.frames.tolist(), column.tolist()):
+                if value is not None:
+                    serialized_events[frame_number].setdefault("attributes", {})[attribute_name] = value
+        return serialized_events
+
+    def deserialize(self, serialized_events):
+        # Rebuilds the columns in one pass instead of inserting the events one at a time
+        events = sorted(serialized_events.values(), key=lambda event_info: event_info["frame_number"])
+        frames = np.array([event_info["frame_number"] for event_info in events], dtype=np.int64)
+        keep = np.ones(len(frames), dtype=bool)
+        keep[1:] = frames[1:] != frames[:-1]  # One event per frame, the same as add
+        self.frames = frames[keep]
+        self.color_ids = np.array(
+            [self.intern_color(parse_color(event_info.get("color", "(100, 100, 100)"))) for event_info in events],
+            dtype=np.int32,
+        )[keep]
+        self.name_ids = np.array(
+            [self.intern_name(event_info.get("name")) for event_info in events], dtype=np.int32
+        )[keep]
+        self.attributes = {}
+        for event_index, event_info in enumerate(events):
+            for attribute_name, value in event_info.get("attributes", {}).items():  # Older projects have no attributes
+                if attribute_name not in self.attributes:
+                    self.attributes[attribute_name] = np.full(len(events), None, dtype=object)
+                self.attributes[attribute_name][event_index] = value
+        for attribute_name, column in self.attributes.items():
+            self.attributes[attribute_name] = column[keep]
+        self.refresh_plot_data_item()
 
     def generate_plot_layer_data_items(self):
-        for event_key, event in self.objects.items():
-            event.generate_layer_plot_item()
+        self.plot_data_item = LayerPlotItem(self.layer_name, self.layer_number)
+        self.refresh_plot_data_item()
+
+    def refresh_plot_data_item(self):
+        # Redraws the whole layer from the columns in one setData call
+        if self.plot_data_item is None:
+            return
+        self.plot_data_item.set_events(self.frames, self.color_ids, self.colors, self.name_ids, self.names)
+
+    def release_plot_data_item(self):
+        self.plot_data_item = None
 
     def get_plot_layer_data(self):
-        plot_layer_objects = [event.plot_data_item for event in self.objects.values()]
-        return plot_layer_objects
+        # The plot item is built the first time the layer is shown
+        if self.plot_data_item is None:
+            self.generate_plot_layer_data_items()
+        return [self.plot_data_item]
+
+
+class EventObjects(Mapping):
+    # Read only frame number -> EventItem view over an EventModel's columns
+    def __init__(self, layer):
+        self.layer = layer
+
+    def __getitem__(self, frame_number):
+        self.layer.require_index(frame_number)
+        return EventItem(self.layer, frame_number)
+
+    def __contains__(self, frame_number):
+        return self.layer.index_of(frame_number) is not None
+
+    def __iter__(self):
+        return iter(self.layer.frames.tolist())
+
+    def __len__(self):
+        return len(self.layer.frames)
@@ -11,13 +11,23 @@ Arguments:
 Returns:
     get_layer_index: Returns the index of a layer given its name. If no layer with the given name exists, it returns None.
     get_layer_qty: Returns the quantity of layers currently managed by the LayerModel.
+    events_in_range: Returns a dict of layer name -> sorted frames of the events inside [start_frame, end_frame).
+    events_in_region: Returns the same as events_in_range, limited to a band of layer numbers.
+    change_event_layer: Moves an event onto another layer under the same collision policies, returning False if "reject" kept it where it was.
+    move_events / shift_range: Shift events on several layers by the same amount, returning a dict of layer name -> frames the moved events ended up on, or None if the shift was cancelled.
+    next_event / previous_event: Return the (layer_name, frame) of the nearest event after / before a frame on any layer, or None.
     create_layer: Returns nothing. It creates a new layer with the given name and adds it to the list of layers.
-    set_event_data: Returns nothing. It sets the event data for a layer given its name and a list of objects.
+    set_event_data: Returns nothing. It replaces the events of a layer given its name and a dict of serialized events.
 
 The LayerModel class provides methods for creating new layers, getting the index of a layer given its name, getting the quantity of layers, and setting event data for a layer. It maintains a list of layers, where each layer is an instance of the EventModel class.
 """
 
+import numpy as np
+
 from .EventModel import EventModel
+from LogManager import get_logger
+
+log = get_logger("stack")
 
 
 class LayerModel:
@@ -27,16 +37,16 @@ class LayerModel:
         self.frame_qty = None  # The quantity of frames
 
     def add_event_to_layer(self, layer_name, frame_number, event_name=None, event_color=None):
-        self.layers[layer_name].add(frame_number)
-        self.layers[layer_name].objects[frame_number].generate_layer_plot_item()
-        if event_name:
-            self.layers[layer_name].objects[frame_number].set_name(event_name)
-        if event_color:
-            self.layers[layer_name].objects[frame_number].set_color(event_color)
-
-    def generate_plot_data_items(self):
+        self.layers[layer_name].add(frame_number, color=event_color, name=event_name)
+
+    def add_events_to_layer(self, layer_name, frames, event_names=None, event_colors=None):
+        # Bulk version of add_event_to_layer, returns the frames that were actually added
+        return self.layers[layer_name].add_events(frames, colors=event_colors, names=event_names)
+
+    def release_plot_data_items(self):
+        # Drops the layers' plot items once the stack is off screen, they are built again the next time it is shown
         for layer_key, layer_item in self.layers.items():
-            layer_item.generate_plot_layer_data_items()
+            layer_item.release_plot_data_item()
 
     def get_layer_qty(self):
         return len(self.layers)  # Returns the quantity of layers
@@ -52,9 +62,9 @@ class LayerModel:
         # Add a layer item to the layers dict
         if layer_name not in self.layers:
             self.layers[layer_name] = layer # Append the layer to the list
-            print(f"[LayerModel][add_layer_to_model] | Added Layer Object {layer_name}")  # Print a message
+            log.debug("[LayerModel][add_layer_to_model] | Added Layer Object %s", layer_name)  # Print a message
         else:
-            print(f"[LayerModel][add_layer_to_model] | error layer with that name already exists")
+            log.warning("[LayerModel][add_layer_to_model] | error layer with that name already exists")
     
     def get_next_free_layer_number(self):
         used_numbers = [self.layers[layer].layer_number for layer in self.layers]
@@ -62,12 +72,12 @@ class LayerModel:
         while next_free_number in used_numbers:
             next_free_number += 1
         
-        print(f"[LayerModel][get_next_free_layer_number] | Next open number: {next_free_number}")
+        log.debug("[LayerModel][get_next_free_layer_number] | Next open number: %s", next_free_number)
         return next_free_number
     
-    # Sets the layers objects to object_data arg
+    # Replaces the layers events with the serialized events in object_data
     def set_event_data(self, layer_name, object_data):
-        self.layers[layer_name].objects = object_data  # Set the event data for the layer
+        self.layers[layer_name].deserialize(object_data)  # Set the event data for the layer
 
     def remove_layer_from_model(self, layer_name):
         del self.layers[layer_name]  # Delete the layer
@@ -79,34 +89,103 @@ class LayerModel:
         self.frame_qty = qty  # Set the quantity of frames
 
     def delete_event(self, layer_name, event_key):
-        del self.layers[layer_name].objects[event_key]
-        print(f"Deleted event {event_key}")
+        self.layers[layer_name].delete(event_key)
+        log.debug("Deleted event %s", event_key)
+
+    def events_in_range(self, start_frame, end_frame):
+        # Frames of the events with start_frame <= frame < end_frame, per layer, layers without events in range are left out
+        events = {}
+        for layer_name, layer in self.layers.items():
+            frames = layer.frames_in_range(start_frame, end_frame)
+            if len(frames):
+                events[layer_name] = frames
+        return events
+
+    def events_in_region(self, start_frame, end_frame, first_layer_number, last_layer_number):
+        # events_in_range limited to the layers numbered first_layer_number..last_layer_number, used by rubber band selection
+        events = {}
+        for layer_name, layer in self.layers.items():
+            if not first_layer_number <= layer.layer_number <= last_layer_number:
+                continue
+            frames = layer.frames_in_range(start_frame, end_frame)
+            if len(frames):
+                events[layer_name] = frames
+        return events
+
+    def next_event(self, frame_number):
+        # (layer_name, frame) of the first event after frame_number on any layer, or None
+        nearest = None
+        for layer_name, layer in self.layers.items():
+            frame = layer.next_event_frame(frame_number)
+            if frame is not None and (nearest is None or frame < nearest[1]):
+                nearest = (layer_name, frame)
+        return nearest
+
+    def previous_event(self, frame_number):
+        # (layer_name, frame) of the last event before frame_number on any layer, or None
+        nearest = None
+        for layer_name, layer in self.layers.items():
+            frame = layer.previous_event_frame(frame_number)
+            if frame is not None and (nearest is None or frame > nearest[1]):
+                nearest = (layer_name, frame)
+        return nearest
 
     def get_event_data(self, layer_name, frame):
         return self.layers[layer_name].objects[frame]
 
     def move_event(self, layer_name, original_frame, new_frame):
-        print(
-            f"updating event layer: {layer_name}\n...{   original_frame} ----> {new_frame}"
-        )
-        data = self.get_event_data(layer_name, original_frame)
-        self.layers[layer_name].add(new_frame)
-        self.layers[layer_name].update_data(new_frame, data)
-
-        self.delete_event(layer_name, original_frame)
-
-    def change_event_layer(self, original_layer, new_layer, frame_number):
+        log.debug("updating event layer: %s\n...%s ----> %s", layer_name, original_frame, new_frame)
+        self.layers[layer_name].move_event(original_frame, new_frame)
+
+    def move_events(self, frames_by_layer, offset, collision="reject"):
+        # Moves events on several layers by the same offset, nothing moves if any event would end up before frame 0 or,
+        # with "reject", if any layer has a collision. The frames a "merge" or "overwrite" dropped are missing from the result
+        frames_by_layer = {
+            layer_name: np.asarray(frames, dtype=np.int64) for layer_name, frames in frames_by_layer.items()
+        }
+        for layer_name, frames in frames_by_layer.items():
+            if (frames + offset < 0).any():
+                log.warning("[LayerModel][move_events] | Events on layer '%s' would move before the start of the song, move rejected", layer_name)
+                return None
+            if collision == "reject" and self.layers[layer_name].move_collisions(frames, frames + offset).any():
+                log.warning("[LayerModel][move_events] | Events on layer '%s' would land on occupied frames, move rejected", layer_name)
+                return None
+        return {
+            layer_name: self.layers[layer_name].shift_events(frames, offset, collision)
+            for layer_name, frames in frames_by_layer.items()
+        }
+
+    def shift_range(self, start_frame, end_frame, amount, layer_names=None, collision="reject"):
+        # Shifts every event with start_frame <= frame < end_frame by amount, on layer_names or on every layer
+        if layer_names is None:
+            layer_names = list(self.layers)
+        frames_by_layer = {
+            layer_name: self.layers[layer_name].frames_in_range(start_frame, end_frame) for layer_name in layer_names
+        }
+        return self.move_events(frames_by_layer, amount, collision)
+
+    def change_event_layer(self, original_layer, new_layer, frame_number, collision="reject"):
+        # Moves an event onto another layer, collision decides what happens if new_layer already has an event on the frame,
+        # the same as move_events: "reject" keeps both events where they are, "merge" keeps the event already there and
+        # drops the moved one, "overwrite" replaces it. Returns False if the move was rejected
         if original_layer == new_layer:
-            print(f"passing for frame {frame_number}")
-            pass
-        else:
-            event = self.layers[original_layer].objects[frame_number] #get the event object
-            self.layers[new_layer].add(frame_number)    # adding new frame on new layer
-            event.parent_layer_name = self.layers[new_layer].layer_name
-            event.parent_layer_number = self.layers[new_layer].layer_number
-            event.plot_data_item.parent_layer_name = self.layers[new_layer].layer_name
-            event.plot_data_item.parent_layer_number = self.layers[new_layer].layer_number
-            event.plot_data_item.set_y_position(self.layers[new_layer].layer_number)
-            self.layers[new_layer].objects[frame_number] = event # add data to new frame 
-            self.layers[original_layer].delete(frame_number) # delete frame data from original layer
-        # print(f"changing event {frame_number} from layer {original_layer} to layer {new_layer} \n event parent layer {event.parent_layer} parent layer index: {event.parent_layer_index},\n plotdataitem name {event.plot_data_item.layer_name}, layer_index {event.plot_data_item.layer_index}")
\ No newline at end of file
+            log.debug("passing for frame %s", frame_number)
+            return True
+        source = self.layers[original_layer]
+        target = self.layers[new_layer]
+        if frame_number in target.objects:
+            if collision == "reject":
+                log.warning("[LayerModel][change_event_layer] | Layer '%s' already has an event at frame %s, move rejected", new_layer, frame_number)
+                return False
+            if collision == "merge":
+                source.delete(frame_number)
+                return True
+            target.delete(frame_number)
+        # copy the event's name, color and attributes onto the new layer before deleting it from the original layer
+        target.add(frame_number, color=source.get_color(frame_number), name=source.get_name(frame_number))
+        for attribute_name in source.attributes:
+            value = source.get_attribute(frame_number, attribute_name)
+            if value is not None:
+                target.set_attribute(frame_number, attribute_name, value)
+        source.delete(frame_number)
+        return True
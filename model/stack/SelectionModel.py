@@ -0,0 +1,91 @@
+"""
+Module: SelectionModel
+
+This module defines the SelectionModel class which holds the events selected on the stack plot.
+
+Arguments:
+    None
+
+Returns:
+    - An instance of SelectionModel with an empty selection.
+
+Selected events are kept in a dict keyed by (layer name, frame number), in the order they were selected, so membership
+checks are O(1) however many events are selected. Every change is made in batches: add, remove, replace and clear
+update the selection and emit sigSelectionChanged once with the events that were added and the events that were
+removed, which lets the listeners update pens and the properties panel once per batch instead of once per event.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class SelectionModel(QObject):
+    sigSelectionChanged = pyqtSignal(object, object)  # added events, removed events
+
+    def __init__(self):
+        super().__init__()
+        self.events = {}  # (layer name, frame number) -> selected event
+
+    def __contains__(self, event):
+        return event.key() in self.events
+
+    def __iter__(self):
+        return iter(list(self.events.values()))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __bool__(self):
+        return bool(self.events)
+
+    def last(self):
+        # The most recently selected event, or None
+        return next(reversed(self.events.values()), None)
+
+    def layer_names(self):
+        return {layer_name for layer_name, frame_number in self.events}
+
+    def add(self, events):
+        added = []
+        for event in events:
+            if event.key() not in self.events:
+                self.events[event.key()] = event
+                added.append(event)
+        if added:
+            self.sigSelectionChanged.emit(added, [])
+        return added
+
+    def remove(self, events):
+        removed = []
+        for event in events:
+            removed_event = self.events.pop(event.key(), None)
+            if removed_event is not None:
+                removed.append(removed_event)
+        if removed:
+            self.sigSelectionChanged.emit([], removed)
+        return removed
+
+    def replace(self, events):
+        # Swaps the whole selection for events in one change
+        new_events = {}
+        for event in events:
+            new_events.setdefault(event.key(), event)
+        removed = [event for key, event in self.events.items() if key not in new_events]
+        added = [event for key, event in new_events.items() if key not in self.events]
+        self.events = new_events
+        if added or removed:
+            self.sigSelectionChanged.emit(added, removed)
+
+    def clear(self):
+        self.replace([])
+
+    def forget(self, events=None):
+        # Drops events, or the whole selection, without emitting, for when their plot items or model rows are gone
+        if events is None:
+            self.events = {}
+            return
+        for event in events:
+            self.events.pop(event.key(), None)
+
+    def rekey(self):
+        # Call after the frame_num of selected events has been changed in place, e.g. by a nudge or a drag
+        self.events = {event.key(): event for event in self.events.values()}
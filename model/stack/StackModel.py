@@ -16,6 +16,9 @@ get_loaded_stack - This method returns the currently loaded stack.
 from .LayerModel import LayerModel
 from pyqtgraph import InfiniteLine, mkPen  # For customizing plots
 from view.PlayheadItem import PlayheadItem
+from LogManager import get_logger
+
+log = get_logger("stack")
 
 class StackModel:
     def __init__(self):
@@ -29,41 +32,34 @@ class StackModel:
     def create_stack(self, stack_name):
         self.objects[stack_name] = LayerModel()  # Create a new layer model and add it to the dictionary
 
+    def remove_stack(self, stack_name):
+        self.objects.pop(stack_name, None)
+        if self.loaded_stack == stack_name:
+            self.loaded_stack = None
+
     def get_layer_items(self, layer_name):
         return self.objects[layer_name].event.items
 
     def set_loaded_stack(self, name):
-        print(f"[StackModel][set_loaded_stack] | Set loaded stack to '{name}'")
+        log.debug("[StackModel][set_loaded_stack] | Set loaded stack to '%s'", name)
         self.loaded_stack = name
 
     def load_data_from_dict(self, stack_data):
         for stack in stack_data:
             name = stack
-            print(f"[StackModel][load_data_from_dict] | load_data_from_dict | layer: {name}")
+            log.debug("[StackModel][load_data_from_dict] | load_data_from_dict | layer: %s", name)
             self.create_stack(name)
 
-    def generate_plot_data_items(self):
-        for stack_key, stack_item in self.objects.items():
-            stack_item.generate_plot_data_items()
-
     def deserialize_stack(self, serialized_stacks):
-        print(f"[StackModel][deserialize_stack] | *Begin deserializing stacks*")
+        log.debug("[StackModel][deserialize_stack] | *Begin deserializing stacks*")
         self.objects.clear()  # Clear existing data
         for stack_name, stack_info in serialized_stacks.items():
-            print(f"    deserializing stack: {stack_name}")
+            log.debug("    deserializing stack: %s", stack_name)
             stack = LayerModel()  # Assuming LayerModel is used to represent each stack
             stack.frame_qty = stack_info.get("frame_qty", 0)
             for layer_name, layer_info in stack_info["layers"].items():
-                print(f"[StackModel][deserialize_stack] | deserializing layer '{layer_name}'")
+                log.debug("[StackModel][deserialize_stack] | deserializing layer '%s'", layer_name)
                 stack.create_layer(layer_name)
-                for event_key, event_info in layer_info["events"].items():
-                    print(f"[StackModel][deserialize_stack] | deserializing event '{event_key}', '{event_info}'")
-                    stack.layers[layer_name].add(event_info["frame_number"])
-                    event = stack.layers[layer_name].objects[
-                        event_info["frame_number"]
-                    ]
-                    event.deserialize(
-                        event_info
-                    )  # Assuming EventItem has a deserialize method
+                stack.layers[layer_name].deserialize(layer_info["events"])  # Builds the layer's event columns in one pass
             self.objects[stack_name] = stack
         # Set the loaded stack if needed
@@ -3,3 +3,4 @@ from .EventItem import *
 from .EventModel import *
 from .LayerModel import *
 from .StackModel import *
+from .SelectionModel import *
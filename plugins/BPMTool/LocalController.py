@@ -1,5 +1,9 @@
 import tools
 from view.LayerSelectPopup import open_layer_selection_popup
+from Profiler import profiled
+from LogManager import get_logger
+
+log = get_logger("plugin")
 
 class LocalController:
     def __init__(self, local_view, main_controller):
@@ -13,7 +17,7 @@ class LocalController:
         self.init_connections()
 
     def init_connections(self):
-        self.local_view.count_button.clicked.connect(self.estimate_bpm)
+        self.local_view.count_button.clicked.connect(lambda: self.estimate_bpm())
         self.local_view.add_to_layer_signal.connect(self.add_events_to_layer)
         self.local_view.add_to_song_signal.connect(self.add_lines_to_song)
         self.local_view.remove_from_song_signal.connect(self.remove_lines_from_song)
@@ -22,6 +26,7 @@ class LocalController:
         self.local_view.open()
         self.estimate_bpm()
 
+    @profiled("BPMTool.estimate_bpm")
     def estimate_bpm(self):
         song_object = self.model.loaded_song
         tempo, self.beats = tools.estimate_bpm(song_object)
@@ -39,7 +44,7 @@ class LocalController:
     # add the events to a new layer functionality
     def add_events_to_layer(self, color, type):
         if self.beats is not None:
-            print(f"Add Events to layer selected")
+            log.debug("Add Events to layer selected")
             layer_names = []
             for layer_name, layer in self.model.loaded_stack.layers.items():
                 layer_names.append(layer_name)
@@ -49,7 +54,7 @@ class LocalController:
             self.layer_selection_popup.show()
 
         else:
-            print(f"Beat list is None")
+            log.warning("Beat list is None")
 
     def add_lines_to_song(self, color, type):
         for frame_number in self.beats:
@@ -64,13 +69,12 @@ class LocalController:
         selected_items = self.layer_selection_popup.layer_list_widget.selectedItems()
         if selected_items:
             self.selected_layer_name = selected_items[0].text()
-            print(f"Layer {self.selected_layer_name} selected")
+            log.debug("Layer %s selected", self.selected_layer_name)
 
     def on_add_to_layer_button_clicked(self, color, type):
         if self.selected_layer_name is None:
-            print(f"ERROR: Please select a valid layer")
+            log.error("ERROR: Please select a valid layer")
             return
-        for frame_number in self.beats:
-            self.main_controller.event_controller.add(self.selected_layer_name, frame_number, color=color )
+        self.main_controller.event_controller.add_events(self.selected_layer_name, self.beats, colors=color)
         
         self.layer_selection_popup.close()
@@ -1,6 +1,9 @@
 from PluginInterface import PluginInterface
 from .LocalController import LocalController
 from .LocalWindow import LocalWindow
+from LogManager import get_logger
+
+log = get_logger("plugin")
 
 """
     All of the plugins outward facing methods should be built out here as this is the top layer of the local plugin
@@ -21,12 +24,12 @@ class BPMTool(PluginInterface):
     def load(self, main_controller):
         self.local_controller = LocalController(LocalWindow(), main_controller)
         self.main_controller = main_controller
-        print(f"TestPlugin Loaded")
+        log.info("TestPlugin Loaded")
 
     def unload(self):
         self.local_controller = None
         self.main_controller = None
 
     def open(self):
-        print(f"Opening {PLUGIN_NAME}'s main window")
+        log.debug("Opening %s's main window", PLUGIN_NAME)
         self.local_controller.open()
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from model import EventModel
+
+
+def build_layer(frames):
+    layer = EventModel()
+    layer.set_layer_name("Layer 0")
+    layer.set_layer_number(0)
+    layer.add_events(frames)
+    return layer
+
+
+def test_move_events_reject_keeps_every_event_on_collision():
+    layer = build_layer([1, 2, 5])
+    layer.set_color(1, (255, 0, 0))
+    assert layer.move_events([1], [2], "reject") is None
+    assert layer.frames.tolist() == [1, 2, 5]
+    assert layer.get_color(1) == (255, 0, 0)
+
+
+def test_move_events_merge_keeps_the_event_already_there():
+    layer = build_layer([1, 2, 5])
+    layer.set_color(1, (255, 0, 0))
+    assert layer.move_events([1], [2], "merge").tolist() == []
+    assert layer.frames.tolist() == [2, 5]
+    assert layer.get_color(2) == (255, 255, 255)
+
+
+def test_move_events_overwrite_replaces_the_event_already_there():
+    layer = build_layer([1, 2, 5])
+    layer.set_color(1, (255, 0, 0))
+    assert layer.move_events([1], [2], "overwrite").tolist() == [2]
+    assert layer.frames.tolist() == [2, 5]
+    assert layer.get_color(2) == (255, 0, 0)
+
+
+@pytest.mark.parametrize("collision", ["reject", "merge", "overwrite"])
+def test_move_events_without_collision_moves_every_event(collision):
+    layer = build_layer([1, 2, 5])
+    layer.set_attribute(2, "bpm", 120)
+    assert layer.move_events([1, 2], [3, 4], collision).tolist() == [3, 4]
+    assert layer.frames.tolist() == [3, 4, 5]
+    assert layer.get_attribute(4, "bpm") == 120
+
+
+@pytest.mark.parametrize("collision", ["reject", "merge", "overwrite"])
+def test_move_events_before_frame_zero_is_rejected(collision):
+    layer = build_layer([0, 3])
+    assert layer.move_events([0, 3], [-1, 2], collision) is None
+    assert layer.frames.tolist() == [0, 3]
+
+
+def test_serialize_round_trip_keeps_attributes():
+    layer = build_layer([1, 2, 3])
+    layer.set_name(1, "kick")
+    layer.set_color(2, (10, 20, 30))
+    layer.set_attribute(2, "bpm", 120)
+    layer.set_attribute(3, "tag", "drop")
+
+    loaded = EventModel()
+    loaded.deserialize(layer.serialize())
+
+    assert loaded.frames.tolist() == [1, 2, 3]
+    assert loaded.get_name(1) == "kick"
+    assert loaded.get_color(2) == (10, 20, 30)
+    assert [loaded.get_attribute(frame, "bpm") for frame in (1, 2, 3)] == [None, 120, None]
+    assert [loaded.get_attribute(frame, "tag") for frame in (1, 2, 3)] == [None, None, "drop"]
+
+
+def test_deserialize_events_saved_without_attributes():
+    loaded = EventModel()
+    loaded.deserialize({4: {"frame_number": 4, "name": "Default", "color": "(1, 2, 3)"}})
+    assert loaded.frames.tolist() == [4]
+    assert loaded.attributes == {}
+    assert loaded.get_attribute(4, "bpm") is None
+
+
+def test_accessors_raise_key_error_on_a_stale_frame():
+    layer = build_layer([1, 2])
+    event = layer.objects[2]
+    layer.delete(2)
+    with pytest.raises(KeyError):
+        layer.require_index(2)
+    with pytest.raises(KeyError):
+        event.color
+    with pytest.raises(KeyError):
+        layer.set_name(2, "stale")
+    with pytest.raises(KeyError):
+        layer.objects[2]
+    assert "stale" not in layer.names
+    assert np.array_equal(layer.name_ids, [layer.name_lookup["Default"]])
@@ -0,0 +1,87 @@
+import pytest
+
+from model import LayerModel
+from model.stack.SelectionModel import SelectionModel
+
+
+def build_stack(frames_by_layer):
+    stack = LayerModel()
+    for layer_name, frames in frames_by_layer.items():
+        stack.create_layer(layer_name)
+        stack.add_events_to_layer(layer_name, frames)
+    return stack
+
+
+def test_change_event_layer_reject_keeps_the_source_event():
+    stack = build_stack({"A": [1, 2], "B": [2]})
+    assert stack.change_event_layer("A", "B", 2, "reject") is False
+    assert stack.layers["A"].frames.tolist() == [1, 2]
+    assert stack.layers["B"].frames.tolist() == [2]
+
+
+def test_change_event_layer_overwrite_replaces_the_target_event():
+    stack = build_stack({"A": [1, 2], "B": [2]})
+    stack.layers["A"].set_color(2, (255, 0, 0))
+    stack.layers["A"].set_attribute(2, "bpm", 120)
+    assert stack.change_event_layer("A", "B", 2, "overwrite") is True
+    assert stack.layers["A"].frames.tolist() == [1]
+    assert stack.layers["B"].frames.tolist() == [2]
+    assert stack.layers["B"].get_color(2) == (255, 0, 0)
+    assert stack.layers["B"].get_attribute(2, "bpm") == 120
+
+
+def test_change_event_layer_merge_keeps_the_target_event():
+    stack = build_stack({"A": [1, 2], "B": [2]})
+    stack.layers["A"].set_color(2, (255, 0, 0))
+    assert stack.change_event_layer("A", "B", 2, "merge") is True
+    assert stack.layers["A"].frames.tolist() == [1]
+    assert stack.layers["B"].get_color(2) == (255, 255, 255)
+
+
+def test_change_event_layer_onto_a_free_frame():
+    stack = build_stack({"A": [1, 2], "B": [5]})
+    assert stack.change_event_layer("A", "B", 2) is True
+    assert stack.layers["A"].frames.tolist() == [1]
+    assert stack.layers["B"].frames.tolist() == [2, 5]
+
+
+def test_move_events_reject_cancels_every_layer():
+    stack = build_stack({"A": [1, 5], "B": [1, 2]})
+    assert stack.move_events({"A": [1], "B": [1]}, 1, "reject") is None
+    assert stack.layers["A"].frames.tolist() == [1, 5]
+    assert stack.layers["B"].frames.tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("collision", ["reject", "merge", "overwrite"])
+def test_shift_range_before_frame_zero_is_rejected(collision):
+    stack = build_stack({"A": [0, 4], "B": [3]})
+    assert stack.shift_range(0, 10, -1, collision=collision) is None
+    assert stack.layers["A"].frames.tolist() == [0, 4]
+    assert stack.layers["B"].frames.tolist() == [3]
+
+
+def test_move_events_merge_reports_the_dropped_events():
+    stack = build_stack({"A": [1, 2, 6]})
+    moved_frames = stack.move_events({"A": [1, 6]}, 1, "merge")
+    assert moved_frames["A"].tolist() == [7]
+    assert stack.layers["A"].frames.tolist() == [2, 7]
+
+
+class SelectedEvent:
+    def __init__(self, layer_name, frame_num):
+        self.parent_layer_name = layer_name
+        self.frame_num = frame_num
+
+    def key(self):
+        return (self.parent_layer_name, self.frame_num)
+
+
+def test_selection_forget_drops_only_the_given_events():
+    selection = SelectionModel()
+    kept, dropped = SelectedEvent("A", 1), SelectedEvent("A", 2)
+    selection.add([kept, dropped])
+    emitted = []
+    selection.sigSelectionChanged.connect(lambda added, removed: emitted.append((added, removed)))
+    selection.forget([dropped])
+    assert list(selection) == [kept]
+    assert emitted == []
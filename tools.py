@@ -4,6 +4,9 @@ from view import DialogWindow
 import numpy as np
 
 from scipy.signal import butter, lfilter
+from LogManager import get_logger
+
+log = get_logger("analysis")
 
 
 def estimate_bpm(song_object):
@@ -12,7 +15,7 @@ def estimate_bpm(song_object):
             # Load the song using the SongModel
             song_name = song_object.name
             song_path = song_object.path
-            song_data, sample_rate = librosa.load(song_path)
+            song_data, sample_rate = song_object.get_original_song_data(song_path)
 
             desired_frame_rate = 30  # for example, 100 frames per second
             hop_length = int(sample_rate / desired_frame_rate)
@@ -22,15 +25,13 @@ def estimate_bpm(song_object):
                 y=song_data, sr=sample_rate, hop_length=hop_length
             )
 
-            print(
-                f"[TOOLS][estimate_bpm] song name: {song_name}, sample rate {sample_rate}, tempo {tempo}"
-            )
+            log.info("[TOOLS][estimate_bpm] song name: %s, sample rate %s, tempo %s", song_name, sample_rate, tempo)
             return tempo, beats
         else:
-            print(f"invalid song_object")
+            log.error("invalid song_object")
             pass
     except Exception as e:
-        print(f"An error occurred while estimating BPM: {e}")
+        log.error("An error occurred while estimating BPM: %s", e)
         return None
 
 
@@ -54,8 +55,7 @@ def detect_onsets(song_object=None, song_data=None, sample_rate=None):
 
 def apply_lo_pass_filter(song_object):
     path = song_object.path
-    song_data, sample_rate = librosa.load(path)
-    sample_rate = song_object.original_sample_rate
+    song_data, sample_rate = song_object.get_original_song_data(path)
     cutoff = 500
 
     # Apply the low pass filter
@@ -73,5 +73,5 @@ def butter_lowpass(cutoff, sample_rate, order=5):
 
 
 def create_frames_array(frame_qty):  # create tick array
-    print(f"Creating {frame_qty} frame array")
+    log.debug("Creating %s frame array", frame_qty)
     return np.arange(frame_qty)
@@ -21,6 +21,9 @@ Returns:
 import math  # For mathematical operations
 import numpy as np  # For array operations
 from pyqtgraph import AxisItem  # For customizing plots
+from LogManager import get_logger
+
+log = get_logger("ui")
 
 
 class CustomAxis(AxisItem):  # Custom axis class
@@ -62,7 +65,7 @@ class CustomAxis(AxisItem):  # Custom axis class
                 ]  # Assigns the layer name from the layers list at the position of the index
                 # Check if the layer name exceeds 10 characters
                 if len(layer_name) > 10:
-                    print(f"WARNING: layer name is more than 10!  ({len(layer_name)})")
+                    log.warning("WARNING: layer name is more than 10!  (%s)", len(layer_name))
                     # Insert a newline character after every 10 characters and center each line
                     layer_name = "\n".join(
                         layer_name[i : i + 10] for i in range(0, len(layer_name), 10)
@@ -0,0 +1,94 @@
+"""
+Module: EventStyleCache
+
+This module defines the EventStyleCache class, the process wide store of the pens, brushes and rendered symbols used to
+draw events, and event_style_cache, the single instance every LayerPlotItem draws from.
+
+Arguments:
+    None
+
+Returns:
+    - get_pen: Returns the shared QPen for an event state ("normal", "selected" or "hover").
+    - get_brush: Returns the shared QBrush for an RGB color.
+    - register: Hands a layer plot item the shared SymbolAtlas, holding one rendered symbol per distinct style.
+    - prune_atlas: Rebuilds the atlas from the styles the registered items still draw, returns True if it did.
+
+Pyqtgraph renders one symbol per distinct (symbol, size, pen, brush) and tells pens and brushes apart by object, so
+handing every layer the same pen and brush objects for the same color and state, and letting them share one atlas,
+keeps the number of rendered symbols at the number of distinct styles however many events, layers and songs there are.
+
+Pyqtgraph's own atlas rebuild, ScatterPlotItem._maybeRebuildAtlas, only knows the styles of the item it runs on and would
+drop every other layer's symbols from a shared atlas. LayerPlotItem replaces it with prune_atlas, which rebuilds from the
+styles of every registered item once the atlas holds more than constants.EVENT_ATLAS_MAX_SYMBOLS. Both hooks are private
+to pyqtgraph and were checked against the version pinned in requirements.txt; if they are missing the atlas is not shared
+and every item keeps pyqtgraph's own atlas and rebuild.
+"""
+
+import weakref
+
+import pyqtgraph
+from pyqtgraph import ScatterPlotItem, mkBrush, mkPen
+from pyqtgraph.graphicsItems.ScatterPlotItem import SymbolAtlas
+from PyQt5.QtGui import QColor
+
+import constants
+from LogManager import get_logger
+
+log = get_logger("plot")
+
+EVENT_STATE_PENS = {
+    "normal": (QColor("white"), 1),
+    "selected": (QColor("orange"), 2),
+    "hover": (QColor("orange"), 1),
+}
+ATLAS_STYLE_OPTIONS = ["symbol", "size", "pen", "brush"]
+SHARED_ATLAS_SUPPORTED = all(hasattr(ScatterPlotItem, name) for name in ("_maybeRebuildAtlas", "_style"))
+
+
+class EventStyleCache:
+    def __init__(self):
+        self.pens = {}  # state -> pen
+        self.brushes = {}  # RGB color -> brush
+        self.atlas = SymbolAtlas()
+        self.items = weakref.WeakSet()  # Plot items drawing from atlas
+        if not SHARED_ATLAS_SUPPORTED:
+            log.warning("[EventStyleCache] | pyqtgraph %s has no atlas rebuild hook, layers keep their own symbol atlas", pyqtgraph.__version__)
+
+    def get_pen(self, state="normal"):
+        if state not in self.pens:
+            color, width = EVENT_STATE_PENS[state]
+            self.pens[state] = mkPen(color, width=width)
+        return self.pens[state]
+
+    def get_brush(self, color):
+        if color not in self.brushes:
+            self.brushes[color] = mkBrush(color)
+        return self.brushes[color]
+
+    def register(self, plot_item):
+        if not SHARED_ATLAS_SUPPORTED:
+            return
+        plot_item.fragmentAtlas = self.atlas  # Every layer reuses the symbols already rendered for its styles
+        self.items.add(plot_item)
+
+    def prune_atlas(self):
+        # Called from the registered items' atlas rebuild hook after their spots have been updated
+        if len(self.atlas) <= constants.EVENT_ATLAS_MAX_SYMBOLS:
+            return False
+        items = list(self.items)
+        styles = []
+        for plot_item in items:
+            styles.extend(zip(*plot_item._style(ATLAS_STYLE_OPTIONS)))
+        symbol_qty = len(self.atlas)
+        self.atlas.rebuild(styles)
+        log.debug("[EventStyleCache][prune_atlas] | Pruned the atlas from %s to %s symbols", symbol_qty, len(self.atlas))
+        # Brushes of colors no layer uses anymore would otherwise be kept for the rest of the session
+        used_brushes = {id(brush) for plot_item in items for brush in plot_item.brush_table}
+        self.brushes = {color: brush for color, brush in self.brushes.items() if id(brush) in used_brushes}
+        for plot_item in items:
+            plot_item.data["sourceRect"] = 0  # The rebuild moved every symbol, they are looked up again
+            plot_item.updateSpots()
+        return True
+
+
+event_style_cache = EventStyleCache()
@@ -1,126 +1,258 @@
-from pyqtgraph import mkPen
-from PyQt5.QtCore import QPointF, pyqtSignal
-from PyQt5.QtGui import QColor
-from PyQt5.QtWidgets import QGraphicsItem
-
-
 """
-Module: ClickablePlotDataItem
+Module: LayerPlotItem
 
-This module defines the ClickablePlotDataItem class, which is a subclass of the PlotDataItem class from pyqtgraph.
-The ClickablePlotDataItem class is designed to handle mouse click events on a plot data item in a PyQt5 application.
+This module defines the LayerPlotItem class, a single ScatterPlotItem that draws every event of one layer from arrays,
+and the EventSpot class, a lightweight handle to one event in it.
 
-Arguments: 
-*args, **kwargs - These are arbitrary argument lists and keyword-argument dictionaries respectively. They are used to allow the passing of any number of arguments and keyword arguments from the function call to the parent constructor.
+Arguments:
+    layer_name (str): The name of the layer the item draws.
+    layer_number (int): The row of the layer in the stack, events are drawn at layer_number + 0.5.
 
-Returns: 
-This module does not return any value. It defines a class that can be instantiated to create objects that handle mouse click events on plot data items.
+Returns:
+    This module does not return any value. It defines the classes used by the stack plot to draw and pick events.
 
-The ClickablePlotDataItem class has a constructor method (__init__) that calls the parent constructor to initialize the object. 
-It also has a method (mouseClickEvent) that handles mouse click events. If the left mouse button is clicked, the event is accepted and a message is printed.
+set_events takes the frame numbers, color ids and name ids of a layer's events along with its color and name tables,
+and redraws the layer in one go. Only the events inside the visible frame range plus a screen width either side are set
+as spot data, the drawn window is looked up in the sorted frames whenever the view range moves past it. While selected
+events are dragged they are drawn by a preview child item that is translated as a whole. Mouse clicks and drags are
+hit tested against the spots, and sigEventClick and sigEventDrag are emitted with an EventSpot for the event under the
+mouse, carrying the same parent_layer_name/frame_num/select/unselect interface the stack actions use.
+EventSpots compare equal when they point at the same event, so they can be kept in selection lists across clicks.
+Pens, brushes and the rendered symbol atlas come from the shared event_style_cache, see EventStyleCache.
 """
 
+import numpy as np
 from pyqtgraph import ScatterPlotItem
-from PyQt5.QtWidgets import QToolTip
+from PyQt5.QtCore import QPointF, pyqtSignal
+from PyQt5.QtWidgets import QGraphicsItem
+
+from .EventStyleCache import event_style_cache
+from .ViewRange import covers_range, padded_frame_range, visible_frame_range
+
+EVENT_PEN = event_style_cache.get_pen("normal")
+SELECTED_EVENT_PEN = event_style_cache.get_pen("selected")
 
 
 class LayerPlotItem(ScatterPlotItem):
     sigEventClick = pyqtSignal(object, object)
     sigEventDrag = pyqtSignal(object, object)
-    
-    sigPositionChanged = pyqtSignal(int, QPointF)  # Signal emitting the new position
-    sigPositionDrag = pyqtSignal(QPointF)
-    sigMouseRightClicked = pyqtSignal(str, int)  # New signal for mouse click events
-    sigEventSelected = pyqtSignal(object)
-    sigAdditionalEventSelected = pyqtSignal(object)
-    sigEventDragStart = pyqtSignal()
-    sigEventDragEnd = pyqtSignal()
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.parent_layer_index = None
-        self.parent_layer_name = None # Not implemented yet
-        self.frame_num = None
-        self.dragPoint = None
-        self.dragOffset = None
-        self.setFlag(
-            QGraphicsItem.ItemIsFocusable, True
-        )  # Allow the item to receive focus
-        self.setFocus()  # Request focus
+
+    def __init__(self, layer_name=None, layer_number=0):
+        super().__init__(
+            symbol="d",
+            pen=EVENT_PEN,
+            hoverable=True,
+            hoverPen=event_style_cache.get_pen("hover"),
+            size=12,
+            tip=self.tooltip_text,
+        )
+        self.parent_layer_name = layer_name
+        self.parent_layer_number = layer_number
+        self.all_frames = np.zeros(0, dtype=np.int64)  # Sorted frame numbers of every event of the layer
+        self.all_color_ids = np.zeros(0, dtype=np.int32)
+        self.all_name_ids = np.zeros(0, dtype=np.int32)
+        self.brush_table = np.empty(0, dtype=object)  # color id -> brush
+        self.name_table = np.empty(0, dtype=object)  # name id -> name
+        self.frames = np.zeros(0, dtype=np.int64)  # Sorted frame numbers of the drawn events, a slice of all_frames
+        self.drag_preview = None  # Copy of the selected spots that is translated as one item while they are dragged
+        self.drawn_start_frame = None  # Frame range that is currently set as spot data, None when nothing is drawn
+        self.drawn_end_frame = None
+        self.selected_frames = set()
+        self.drag_spot = None  # The EventSpot a drag started on, kept until the drag finishes
+        self.actions_connected = False
+        event_style_cache.register(self)
+        self.setFlag(QGraphicsItem.ItemIsFocusable, True)  # Allow the item to receive focus
 
     def __str__(self):
-        spot = self.points()[0]
-        x, y = spot.pos()  # Get the x, y position
-        size = spot.size()  # Get the size of the spot
-        symbol = spot.symbol()  # Get the symbol
-        brush = spot.brush().color().name()  # Get the brush (fill color)
-        pen = spot.pen().color().name()  # Get the pen (outline)
-
-        return f"Pos: (x:{x} y:{y}), Size: {size}, Symbol {symbol}, Brush: {brush}, Pen: {pen} "
-
-    def refresh_tooltip_text(self):
-        tooltip_text = f"Name: {self.name()} | Layer: {self.parent_layer_index} | Frame: {self.parent_layer_index}"
-        self.setToolTip(tooltip_text)
-
-    def set_frame_num(self, frame_num):
-        # print(f"set frame number: {frame_num}")
-        self.frame_num = int(frame_num)
-        self.refresh_tooltip_text()
-
-    def set_layer_number(self, layer_number):
-        self.layer_number = int(layer_number)
-        self.refresh_tooltip_text()
-    
-    def set_layer_name(self, layer_name):
+        return f"LayerPlotItem(layer: {self.parent_layer_name}, events: {len(self.all_frames)}, drawn: {len(self.frames)})"
+
+    def set_layer(self, layer_name, layer_number):
         self.parent_layer_name = layer_name
-        self.refresh_tooltip_text()
+        self.parent_layer_number = layer_number
+
+    def set_events(self, frames, color_ids, colors, name_ids, names):
+        # frames must be sorted, color_ids and name_ids line up with them and index into colors and names
+        self.all_frames = np.asarray(frames, dtype=np.int64)
+        self.all_color_ids = np.asarray(color_ids)
+        self.all_name_ids = np.asarray(name_ids)
+        self.brush_table = np.empty(len(colors), dtype=object)
+        self.brush_table[:] = [event_style_cache.get_brush(color) for color in colors]
+        self.name_table = np.empty(len(names), dtype=object)
+        self.name_table[:] = names
+        selected = np.fromiter(self.selected_frames, dtype=np.int64, count=len(self.selected_frames))
+        self.selected_frames = set(selected[np.isin(selected, self.all_frames)].tolist())
+        self.draw_visible_events(force=True)
+
+    def viewRangeChanged(self):
+        super().viewRangeChanged()
+        self.draw_visible_events()
+
+    def draw_visible_events(self, force=False):
+        # Only the events inside the visible frame range, plus a margin, are set as spot data
+        visible_range = visible_frame_range(self)
+        # Not on a plot yet, draw everything until there is a range to cull to
+        start_frame, end_frame = visible_range if visible_range is not None else (-np.inf, np.inf)
+        if (
+            not force
+            and covers_range(self.drawn_start_frame, self.drawn_end_frame, start_frame, end_frame)
+            and self.drawn_end_frame - self.drawn_start_frame <= 4 * (end_frame - start_frame)
+        ):
+            return  # Still covered by the spots that are already drawn, and not zoomed far into them
+        drawn_start_frame, drawn_end_frame = padded_frame_range(start_frame, end_frame)
+        start, end = np.searchsorted(self.all_frames, [drawn_start_frame, drawn_end_frame])
+        if visible_range is not None:
+            self.drawn_start_frame = drawn_start_frame
+            self.drawn_end_frame = drawn_end_frame
+        self.frames = self.all_frames[start:end]
+        self.setData(
+            x=self.frames,
+            y=np.full(len(self.frames), self.parent_layer_number + 0.5),
+            brush=self.brush_table[self.all_color_ids[start:end]],
+            data=self.name_table[self.all_name_ids[start:end]],
+        )
+        self.apply_selection_pens()
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        # Only the visible events are set as spot data, auto range should still see the whole layer
+        if ax == 0 and len(self.all_frames):
+            return (float(self.all_frames[0]), float(self.all_frames[-1]))
+        return super().dataBounds(ax, frac, orthoRange)
+
+    def tooltip_text(self, x, y, data):
+        return f"Name: {data} | Layer: {self.parent_layer_name} | Frame: {int(x)}"
+
+    def index_of(self, frame_num):
+        index = int(np.searchsorted(self.frames, frame_num))
+        if index < len(self.frames) and self.frames[index] == frame_num:
+            return index
+        return None
+
+    def spot_at(self, pos):
+        # Returns the EventSpot under a position in item coordinates, or None
+        mask = self._maskAt(pos)
+        if not mask.any():
+            return None
+        index = int(np.flatnonzero(mask)[-1])  # Last drawn spot is the one on top
+        return EventSpot(self, int(self.frames[index]))
 
     def mouseClickEvent(self, ev):
-        self.sigEventClick.emit(ev, self)
+        spot = self.spot_at(ev.pos())
+        if spot is None:
+            ev.ignore()
+            return
+        self.sigEventClick.emit(ev, spot)
 
     def mouseDragEvent(self, ev):
-        self.sigEventDrag.emit(ev, self)
+        if ev.isStart():
+            self.drag_spot = self.spot_at(ev.buttonDownPos())
+        if self.drag_spot is None:
+            ev.ignore()
+            return
+        self.sigEventDrag.emit(ev, self.drag_spot)
+        if ev.isFinish():
+            self.drag_spot = None
 
-    def select(self, selected=True):
-        """Mark this item as selected and change the border color."""
+    def select_frame(self, frame_num, selected=True):
         if selected:
-            self.setPen(
-                mkPen(QColor("orange"), width=2)
-            )  # Change border color to orange
-            print(f"selected event")
-            print(self.frame_num)
+            self.selected_frames.add(frame_num)
+        else:
+            self.selected_frames.discard(frame_num)
+        index = self.index_of(frame_num)
+        if index is not None:
+            self.set_spot_pens([index], SELECTED_EVENT_PEN if selected else EVENT_PEN)
+
+    def select_frames(self, frame_nums, selected=True):
+        # Batch version of select_frame, the spot pens are updated once for the whole batch
+        if selected:
+            self.selected_frames.update(frame_nums)
+        else:
+            self.selected_frames.difference_update(frame_nums)
+        indexes = [self.index_of(frame_num) for frame_num in frame_nums]
+        self.set_spot_pens([index for index in indexes if index is not None], SELECTED_EVENT_PEN if selected else EVENT_PEN)
+
+    def apply_selection_pens(self):
+        indexes = [self.index_of(frame_num) for frame_num in self.selected_frames]
+        self.set_spot_pens([index for index in indexes if index is not None], SELECTED_EVENT_PEN)
+
+    def _maybeRebuildAtlas(self, threshold=4, minlen=1000):
+        # The atlas is shared with every other layer, rebuilding it from this layer's styles would drop theirs
+        if self.fragmentAtlas is event_style_cache.atlas:
+            event_style_cache.prune_atlas()
+        else:
+            super()._maybeRebuildAtlas(threshold, minlen)
+
+    def set_spot_pens(self, indexes, pen):
+        # Changes the pen of a few spots without rebuilding the pen of every other spot in the layer
+        if len(indexes) == 0:
+            return
+        for index in indexes:
+            self.data["pen"][index] = pen
+        self.data["sourceRect"][indexes] = 0
+        self.updateSpots()
+
+    def start_drag_preview(self):
+        # Hides the selected spots and draws a copy of them in a child item, so a drag only has to move that one item
+        indexes = [self.index_of(frame_num) for frame_num in self.selected_frames]
+        indexes = np.array([index for index in indexes if index is not None], dtype=np.int64)
+        self.drag_preview = ScatterPlotItem(
+            x=self.frames[indexes],
+            y=self.data["y"][indexes],
+            brush=list(self.data["brush"][indexes]),
+            pen=SELECTED_EVENT_PEN,
+            symbol="d",
+            size=12,
+        )
+        # The preview keeps an atlas of its own, pyqtgraph's rebuild on a plain ScatterPlotItem would prune the shared one
+        self.drag_preview.setParentItem(self)
+        visible = np.ones(len(self.data), dtype=bool)
+        visible[indexes] = False
+        self.setPointsVisible(visible)
+
+    def move_drag_preview(self, x_offset):
+        if self.drag_preview is not None:
+            self.drag_preview.setPos(x_offset, 0)
+
+    def end_drag_preview(self):
+        if self.drag_preview is None:
+            return
+        if self.drag_preview.scene() is not None:
+            self.drag_preview.scene().removeItem(self.drag_preview)
+        self.drag_preview = None
+        self.setPointsVisible(True)
+
+
+class EventSpot:
+    # Handle to a single event drawn by a LayerPlotItem, identified by its layer and frame
+    def __init__(self, plot_item, frame_num):
+        self.plot_item = plot_item
+        self.parent_layer_name = plot_item.parent_layer_name
+        self.parent_layer_number = plot_item.parent_layer_number
+        self.frame_num = frame_num
+        self.dragPoint = None
+        self.dragOffset = None
+        self.dragStart = None
+
+    def __eq__(self, other):
+        return isinstance(other, EventSpot) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"EventSpot(layer: {self.parent_layer_name}, frame: {self.frame_num})"
+
+    def key(self):
+        return (self.parent_layer_name, self.frame_num)
+
+    def pos(self):
+        return QPointF(self.frame_num, self.parent_layer_number + 0.5)
+
+    def getData(self):
+        pos = self.pos()
+        return [pos.x()], [pos.y()]
+
+    def select(self, selected=True):
+        self.plot_item.select_frame(self.frame_num, selected)
 
     def unselect(self):
-        self.setPen(mkPen(QColor("white"), width=1))
-        print(f"unselected event")
-        print({self.frame_num})
-
-    def set_x_position(self, x_pos):
-        """
-        Set the x position of this object and move the event on the plot.
-        :param pos_delta: The delta to add to the current x position.
-        """
-        if self.points():
-            print(f"set x pos {x_pos}")
-            data = self.getData()
-            data[0][0] = x_pos  # Set the x position equal to x_pos
-            self.setData(*data)
-
-    def nudge_x_position(self, amount):
-        print(f"nudge x pos {amount}")
-        data = self.getData()
-        original_pos = data[0][0] # Set the x position equal to x_pos
-        new_pos = original_pos + amount
-        data[0][0] = new_pos
-        self.setData(*data)
-            
-    def set_y_position(self, y_pos):
-        if self.points():
-            print(f"set y pos {y_pos}")
-            data = self.getData()
-            data[1][0] = y_pos + .5 # Set the y position equal to y_pos
-            self.setData(*data)
-
-    def event(self, event):
-        # print(f"Event type: {event.type()}")
-        return super().event(event)
+        self.plot_item.select_frame(self.frame_num, False)
@@ -0,0 +1,38 @@
+"""
+Module: ViewRange
+
+This module holds the frame range helpers shared by the plot items that only set the part of their data inside the
+visible frame range, plus a margin, as item data: LayerPlotItem culls a layer's events and WaveformPlotItem culls a
+song's peaks this way.
+
+Arguments:
+    item: A pyqtgraph item, its view box gives the visible frame range.
+    start_frame, end_frame: A visible frame range.
+
+Returns:
+    - visible_frame_range: Returns the (start_frame, end_frame) shown by an item's view box, or None if it isn't on a plot.
+    - padded_frame_range: Returns a visible range widened by a screen width either side, clipped to first/last frame.
+    - covers_range: Returns True if a drawn range, which may still be None, covers a visible range.
+
+A screen width either side means small pans are drawn from the data that is already set, and a new range is only
+looked up once the view moves past the drawn one.
+"""
+
+import numpy as np
+
+
+def visible_frame_range(item):
+    view_box = item.getViewBox()
+    if view_box is None:
+        return None
+    (start_frame, end_frame), _ = view_box.viewRange()
+    return start_frame, end_frame
+
+
+def padded_frame_range(start_frame, end_frame, first_frame=-np.inf, last_frame=np.inf):
+    span = end_frame - start_frame
+    return max(start_frame - span, first_frame), min(end_frame + span, last_frame)
+
+
+def covers_range(drawn_start_frame, drawn_end_frame, start_frame, end_frame):
+    return drawn_start_frame is not None and drawn_start_frame <= start_frame and drawn_end_frame >= end_frame
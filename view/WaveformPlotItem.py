@@ -1,33 +1,62 @@
 import numpy as np
 from pyqtgraph import PlotCurveItem
-from constants import SONG_PLOT_RESOLUTION
+
+from .ViewRange import covers_range, padded_frame_range, visible_frame_range
+
+DEFAULT_PIXEL_WIDTH = 2000 # used to pick a pyramid level before the item has been added to a view
 
 class WaveformPlotItem(PlotCurveItem):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-    
-    def set_waveform_data(self, ticks, song_data):
-        adjusted_ticks, adjusted_song_data = self.adjust_resolution(ticks, song_data)
+        self.peak_pyramid = None
+        self.drawn_level = None  # Pyramid level and frame range that is currently set as curve data
+        self.drawn_start_frame = None
+        self.drawn_end_frame = None
+
+    def set_peak_pyramid(self, peak_pyramid):
+        # Draws the song from a PeakPyramid, the level and range are picked again whenever the view range changes
+        self.peak_pyramid = peak_pyramid
+        self.drawn_level = None
+        self.update_visible_peaks(0, peak_pyramid.last_frame, DEFAULT_PIXEL_WIDTH)
+
+    def set_summary_data(self, x_frames, mins, maxs):
+        # Draws a min/max summary as a zig-zag between each bucket's min and max so transients stay visible
         self.setData(
-            x=adjusted_ticks, 
-            y=adjusted_song_data, 
+            x=np.repeat(x_frames, 2),
+            y=np.column_stack((mins, maxs)).ravel(),
             pen=('w'),
             shadowPen=None,
             fillLevel=.50,
             fillOutline=None,
             brush=None,
-            # antialias=
             stepMode=None,
             connect='all',
-            # compositionMode=
-            skipFiniteCheck=False,
-            )  # Size of the area under the curve (if applicable)
-
-    def adjust_resolution(self, ticks, song_data):
-        print(f"[WaveformPlotItem][adjust_resolution] | Adjusting song waveform plot resolution to {SONG_PLOT_RESOLUTION}%")
-        resolution_factor = SONG_PLOT_RESOLUTION / 100
-        adjusted_length = int(len(song_data) * resolution_factor)
-        adjusted_ticks = np.linspace(ticks[0], ticks[-1], adjusted_length)
-        adjusted_song_data = np.interp(adjusted_ticks, ticks, song_data)
-        return adjusted_ticks, adjusted_song_data
+            skipFiniteCheck=True,
+            )
+
+    def viewRangeChanged(self):
+        super().viewRangeChanged()
+        visible_range = visible_frame_range(self)
+        if self.peak_pyramid is None or visible_range is None:
+            return
+        self.update_visible_peaks(*visible_range, int(self.getViewBox().width()) or DEFAULT_PIXEL_WIDTH)
+
+    def update_visible_peaks(self, start_frame, end_frame, pixel_width):
+        level = self.peak_pyramid.level_for(end_frame - start_frame, pixel_width)
+        last_frame = self.peak_pyramid.last_frame
+        if level == self.drawn_level and covers_range(
+            self.drawn_start_frame, self.drawn_end_frame, max(start_frame, 0), min(end_frame, last_frame)
+        ):
+            return  # Still covered by the data that is already drawn
+        fetch_start, fetch_end = padded_frame_range(start_frame, end_frame, 0, last_frame)
+        x_frames, mins, maxs = self.peak_pyramid.select(fetch_start, fetch_end, level)
+        self.drawn_level = level
+        self.drawn_start_frame = fetch_start
+        self.drawn_end_frame = fetch_end
+        self.set_summary_data(x_frames, mins, maxs)
 
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        # Only part of the song is set as curve data, auto range should still see the whole song
+        if ax == 0 and self.peak_pyramid is not None:
+            return (0, self.peak_pyramid.last_frame)
+        return super().dataBounds(ax, frac, orthoRange)
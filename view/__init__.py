@@ -22,4 +22,6 @@ from .LayerSelectPopup import *
 from .window.FilterEditorWindow import *
 from .window.FilterAudioWindow import *
 from .window.SongDataPreviewWindow import *
+from .EventStyleCache import *
+from .ViewRange import *
 from .LayerPlotItem import *
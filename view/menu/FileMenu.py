@@ -10,6 +10,8 @@ class FileMenu:
         self.save_action = QAction("&Save", main_menu)
         self.save_as_action = QAction("&Save as", main_menu)
         self.load_action = QAction("Load", main_menu)
+        self.import_songs_action = QAction("&Import Songs", main_menu)
+        self.import_song_folder_action = QAction("Import Song &Folder", main_menu)
         self.exit_action = QAction("&Exit", main_menu)
 
         self.save_action.setShortcut("Ctrl+S")
@@ -19,3 +21,5 @@ class FileMenu:
         self.file_menu.addAction(self.save_action)
         self.file_menu.addAction(self.exit_action)
         self.file_menu.addAction(self.load_action)
+        self.file_menu.addAction(self.import_songs_action)
+        self.file_menu.addAction(self.import_song_folder_action)
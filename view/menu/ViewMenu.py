@@ -9,3 +9,11 @@ class ViewMenu:
     def create_actions(self, main_menu):
         self.plugin_action = QAction("&Plugin", main_menu)
         self.view_menu.addAction(self.plugin_action)
+
+        self.instrumentation_action = QAction("&Instrumentation", main_menu)
+        self.instrumentation_action.setCheckable(True)
+        self.view_menu.addAction(self.instrumentation_action)
+
+        self.profiling_action = QAction("P&rofiling", main_menu)
+        self.profiling_action.setCheckable(True)
+        self.view_menu.addAction(self.profiling_action)
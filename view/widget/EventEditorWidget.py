@@ -24,6 +24,9 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import pyqtSignal
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QHBoxLayout
+from LogManager import get_logger
+
+log = get_logger("ui")
 
 
 class EventEditorWidget(QDialog):  # Widget for editing events
@@ -73,7 +76,7 @@ class EventEditorWidget(QDialog):  # Widget for editing events
         color = QColorDialog.getColor()
         # If a color was selected (the user didn't cancel the dialog), temporarily store the color
         if color.isValid():
-            print(f"PDI color: {color}, {color.name()}")
+            log.debug("PDI color: %s, %s", color, color.name())
             self.temp_color = color.name()  # Temporarily store the selected color
 
     def save_changes(self):  # Save the changes
@@ -82,5 +85,5 @@ class EventEditorWidget(QDialog):  # Widget for editing events
             try:
                 self.model_object.set_color(self.temp_color)
             except ValueError as e:
-                print(f"Error setting color: {e}")
+                log.error("Error setting color: %s", e)
         self.accept()
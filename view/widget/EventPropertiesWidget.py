@@ -42,10 +42,15 @@ class EventPropertiesWidget(QDockWidget):
     
     def update(self, event_item):
         # Update the line items with the properties of the LayerPlotItem instance
+        # Signals are blocked so showing an event doesn't write its name back onto every selected event
+        for line_item in self.line_items.values():
+            line_item.blockSignals(True)
         self.line_items["Name"].setText(event_item.event_name)
         self.line_items["Color"].setText(str(event_item.color))
         self.line_items["Layer"].setText(event_item.parent_layer_name)
         self.line_items["Frame"].setText(str(event_item.frame_number))
+        for line_item in self.line_items.values():
+            line_item.blockSignals(False)
 
     def open_color_dialog(self, event):  # Open the color dialog
         # Open the color dialog and get the selected color
@@ -0,0 +1,70 @@
+"""
+Module: InstrumentationWidget
+
+This module defines the InstrumentationWidget class, a dock that shows the rolling playback statistics recorded by
+Instrumentation, one row per metric.
+
+Arguments:
+    title (str): The title of the dock.
+    parent (QWidget, optional): The parent widget of the dock.
+
+Returns:
+    - update_stats: Fills the table from the dict returned by Instrumentation.stats.
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDockWidget,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+INSTRUMENTATION_COLUMNS = ("count", "rate", "mean", "p95", "max")
+
+
+class InstrumentationWidget(QDockWidget):
+    def __init__(self, title="Instrumentation", parent=None):
+        super().__init__(title, parent)
+        self.setAllowedAreas(Qt.AllDockWidgetAreas)
+        self.widget = QWidget()
+        self.setWidget(self.widget)
+        self.initialize()
+
+    def initialize(self):
+        self.main_layout = QVBoxLayout(self.widget)
+        self.window_label = QLabel()
+        self.main_layout.addWidget(self.window_label)
+
+        self.table = QTableWidget(0, len(INSTRUMENTATION_COLUMNS))
+        self.table.setHorizontalHeaderLabels(["count", "per s", "mean ms", "p95 ms", "max ms"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.main_layout.addWidget(self.table)
+
+        self.button_layout = QHBoxLayout()
+        self.reset_button = QPushButton("Reset")
+        self.export_button = QPushButton("Export CSV")
+        self.button_layout.addWidget(self.reset_button)
+        self.button_layout.addWidget(self.export_button)
+        self.main_layout.addLayout(self.button_layout)
+
+    def update_stats(self, stats, window_seconds):
+        self.window_label.setText(f"Last {window_seconds} seconds")
+        self.table.setRowCount(len(stats))
+        self.table.setVerticalHeaderLabels(list(stats))
+        for row, metric_stats in enumerate(stats.values()):
+            for column, key in enumerate(INSTRUMENTATION_COLUMNS):
+                value = metric_stats[key]
+                if value is None:
+                    text = "-"
+                elif key == "count":
+                    text = str(value)
+                else:
+                    text = f"{value:.1f}"
+                self.table.setItem(row, column, QTableWidgetItem(text))
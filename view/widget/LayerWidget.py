@@ -27,6 +27,9 @@ from PyQt5.QtCore import pyqtSignal
 import math  # For mathematical operations
 import numpy as np  # For array operations
 from pyqtgraph import AxisItem  # For customizing plots
+from LogManager import get_logger
+
+log = get_logger("plot")
 
 class LayerWidget(QWidget):  # Widget for a layer
 
@@ -56,11 +59,11 @@ class LayerWidget(QWidget):  # Widget for a layer
     def remove_items(self, items):
         for item in items:
             self.layer_plot.removeItem(item)
-            print(f"[LayerWidget][remove_items] | Removed plot item: {item}")
+            log.debug("[LayerWidget][remove_items] | Removed plot item: %s", item)
 
     def remove_item(self, item):
         self.layer_plot.removeItem(item)
-        print(f"[LayerWidget][remove_item] | Removed plot item: {item}")
+        log.debug("[LayerWidget][remove_item] | Removed plot item: %s", item)
 
     def update_layer_names(self, layer_names):  # Update the layer names
         self.y_axis.setLayers(layer_names)  # Set the layers for the custom axis
@@ -72,13 +75,13 @@ class LayerWidget(QWidget):  # Widget for a layer
         self.playhead.setPos(0)
 
     def add_playhead(self, playhead):  # Initialize the vertical line
-        print(f"adding playhead to layer plot")
+        log.debug("adding playhead to layer plot")
         self.layer_plot.addItem(playhead)  # Add the line to the plot widget
 
     def remove_group(self, plot_data_group):
         for plot_data_item in plot_data_group:
             self.layer_plot.removeItem(plot_data_item)
-            print(f"removing plot data item: {plot_data_item}")
+            log.debug("removing plot data item: %s", plot_data_item)
 
     def connectCustomViewBoxSignal(self, signal, slot):
         if signal == "sigItemsSelected":
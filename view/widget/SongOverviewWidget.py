@@ -21,6 +21,9 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,  # Box layout with a vertical direction
 )
 from PyQt5.QtCore import pyqtSignal
+from LogManager import get_logger
+
+log = get_logger("plot")
 
 Y_AXIS_OFFSET = 100
 
@@ -48,15 +51,15 @@ class SongOverviewWidget(QWidget):  # Widget for displaying song overview
         self.song_plot.autoRange(padding=0)
 
     def add_waveform_data(self, waveform_item):
-        print(f"[SongOverviewWidget][add_waveform_data] | {waveform_item}")
+        log.debug("[SongOverviewWidget][add_waveform_data] | %s", waveform_item)
         self.song_plot.addItem(waveform_item)
 
     def remove_waveform_data(self, waveform_item):
-        print(f"[SongOverviewWidget][remove_waveform_data] | {waveform_item}")
+        log.debug("[SongOverviewWidget][remove_waveform_data] | %s", waveform_item)
         self.song_plot.removeItem(waveform_item)
 
     def add_playhead(self, playhead):
-        print(f"[SongOverviewWidget][add_playhead] | {playhead}")
+        log.debug("[SongOverviewWidget][add_playhead] | %s", playhead)
         self.song_plot.addItem(playhead)  # Add the line to the song plot
 
     def emit_playhead_position(self):
@@ -71,9 +74,9 @@ class SongOverviewWidget(QWidget):  # Widget for displaying song overview
         line.setPos(frame_number)  # Set the position of the line at specific tick number
         self.song_plot.addItem(line)
 
-    def reload_plot(self, x_ticks, waveform_plot_item):
+    def reload_plot(self, time_axis, waveform_plot_item):
         self.song_plot.addItem(waveform_plot_item)
-        self.set_plot_x_max(x_ticks[-1])
+        self.set_plot_x_max(time_axis.last_frame)
         
 class SongPlotItem(PlotWidget):
     def __init__(self, parent=None, **kwargs):
@@ -13,16 +13,21 @@ Arguments:
 
 Returns: 
     - open_file: Returns a string representing the path of the file selected by the user.
+    - open_files: Returns a list of strings representing the paths of the files selected by the user.
+    - open_directory: Returns a string representing the path of the folder selected by the user.
     - save_file: Returns a string representing the path of the file to be saved as selected by the user.
     - input_text: Returns a string representing the text input by the user.
     - error: No return value. Displays an error message to the user.
+    - progress: Returns a QProgressDialog with a cancel button for long running operations.
 """
 
 from PyQt5.QtWidgets import (
     QFileDialog,  # Dialog for users to select files or directories
     QInputDialog,  # Dialog for user input
     QMessageBox,  # Modal dialog for informing the user or for asking the user a question and receiving an answer
+    QProgressDialog,  # Dialog showing the progress of a long operation
 )
+from PyQt5.QtCore import Qt
 
 
 class DialogWindow:
@@ -38,6 +43,29 @@ class DialogWindow:
         )
         return file_path  # Return the file path
 
+    # Prompt user to select one or more files to open
+    def open_files(title, dir=None, filter=None):
+        options = QFileDialog.Options()  # Define the options for the file dialog
+        file_paths, _ = QFileDialog.getOpenFileNames(  # Get the open file names
+            None,
+            title,
+            dir,
+            filter,
+            options=options,
+        )
+        return file_paths  # Return the file paths
+
+    # Prompt user to select a folder
+    def open_directory(title, dir=None):
+        options = QFileDialog.Options()  # Define the options for the file dialog
+        directory_path = QFileDialog.getExistingDirectory(  # Get the folder path
+            None,
+            title,
+            dir,
+            options=options,
+        )
+        return directory_path  # Return the folder path
+
     # Prompt user to select file save name/path
     def save_file(title, dir=None, filter=None):
         options = QFileDialog.Options()  # Define the options for the file dialog
@@ -65,3 +93,11 @@ class DialogWindow:
         msg.setInformativeText(message)  # Set the informative text to the message
         msg.setWindowTitle("Error")  # Set the window title to "Error"
         msg.exec_()  # Execute the message box
+
+    def progress(title, label, maximum):
+        dialog = QProgressDialog(label, "Cancel", 0, maximum)  # Create a progress dialog with a cancel button
+        dialog.setWindowTitle(title)  # Set the window title
+        dialog.setWindowModality(Qt.WindowModal)  # Block the main window while the dialog is open
+        dialog.setMinimumDuration(0)  # Show the dialog straight away
+        dialog.setValue(0)
+        return dialog  # Return the dialog
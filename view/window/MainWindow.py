@@ -28,6 +28,7 @@ from ..widget.StageWidget import StageWidget
 from ..widget.EventPropertiesWidget import EventPropertiesWidget
 from ..widget.EventActionWidget import EventActionWidget
 from ..widget.EventToolsWidget import EventToolsWidget
+from ..widget.InstrumentationWidget import InstrumentationWidget
 
 
 class MainWindow(QMainWindow):  # Class for the main window
@@ -57,3 +58,8 @@ class MainWindow(QMainWindow):  # Class for the main window
         self.addDockWidget(Qt.RightDockWidgetArea, self.event_properties_widget)  # Dock the SidebarWidget to the right side
         self.addDockWidget(Qt.RightDockWidgetArea, self.event_action_widget)
         # self.addDockWidget(Qt.RightDockWidgetArea, self.event_tools_widget)  # Dock the SidebarWidget to the right side
+
+        # Playback instrumentation, hidden until it is turned on from the View menu
+        self.instrumentation_widget = InstrumentationWidget("Instrumentation", self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.instrumentation_widget)
+        self.instrumentation_widget.hide()
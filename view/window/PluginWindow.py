@@ -6,6 +6,9 @@ from PyQt5.QtWidgets import (
     QLabel,
     QListWidget,
 )
+from LogManager import get_logger
+
+log = get_logger("ui")
 
 
 class PluginWindow(QWidget):
@@ -38,11 +41,11 @@ class PluginWindow(QWidget):
 
     def refresh_plugins(self):
         # TODO: Implement the method to refresh the list of plugins
-        print("Refreshing plugins...")
+        log.debug("Refreshing plugins...")
 
     def open_plugin(self):
         # TODO: Implement the method to open the selected plugin
-        print("Opening plugin...")
+        log.debug("Opening plugin...")
 
     def open(self):
         self.show()